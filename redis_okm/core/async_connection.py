@@ -0,0 +1,1000 @@
+import asyncio
+import weakref
+import redis
+import redis.asyncio
+import fakeredis.aioredis
+from typing import Any, AsyncIterator, Callable, Literal
+
+from ..core import _model
+from .configure import Settings
+from .getter import Getter
+from .cache import RecordCache
+from .connection import RedisConnect, _ADD_SCRIPT, _SAVE_SCRIPT, _caches
+from .foreign_key import LazyForeignKey
+from ..exceptions.connection_exceptions import *
+
+
+# pools de conexão assíncronos, separados por event loop (conexões do redis.asyncio pertencem ao loop que as criou)
+_async_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict] = weakref.WeakKeyDictionary()
+
+
+class AsyncRedisConnect:
+    """
+    Conecta e manipula operações com Redis sem bloquear o event loop (asyncio)
+
+    A serialização, a verificação de integridade e as validações são as mesmas de RedisConnect
+    """
+    @staticmethod
+    async def _connect(model: _model=None, use_model: bool=True, **kwargs) -> redis.asyncio.Redis:
+        settings, db, is_testing = RedisConnect._get_connection_info(model, use_model, **kwargs)
+        try:
+            return await AsyncRedisConnect._get_handler(settings, db, is_testing)
+        except RedisConnectConnectionFailedException as e:
+            if use_model:
+                raise RedisConnectConnectionFailedException(f"{getattr(model, "__name__", type(model).__name__)}: {e}") from None
+            raise
+
+
+    @staticmethod
+    async def _get_handler(settings: Settings, db: int, testing: bool) -> redis.asyncio.Redis:
+        pools = _async_pools.setdefault(asyncio.get_running_loop(), {})
+        key = RedisConnect._get_pool_key(settings, db, testing)
+        handler = pools.get(key)
+        if handler is not None:
+            return handler
+
+        for stale in RedisConnect._get_stale_keys(pools, key):
+            stale_handler = pools.pop(stale)
+            await stale_handler.aclose()
+            await stale_handler.connection_pool.disconnect()
+
+        retry = settings.retry_on_timeout
+        tries = int(retry[1]) if isinstance(retry, list) else 1
+        for attempts in range(tries):
+            try:
+                connection = settings.redis_info
+                connection.update({"db": db})
+                if testing:
+                    handler = fakeredis.aioredis.FakeRedis(**connection)
+                else:
+                    max_connections = connection.pop("max_connections")
+                    pool = redis.asyncio.BlockingConnectionPool(
+                        max_connections=int(max_connections) if max_connections else 10,
+                        timeout=settings.blocking_timeout,
+                        **connection
+                    )
+                    handler = redis.asyncio.Redis(connection_pool=pool)
+                await handler.ping() # valida a conexão somente ao criar o pool
+                break
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
+                if handler is not None:
+                    await handler.aclose()
+                    handler = None
+                if attempts < tries - 1:
+                    await asyncio.sleep(.5)
+                    continue
+                raise RedisConnectConnectionFailedException(f"Unable to connect to Redis database: {e.__str__()}")
+
+        # outra tarefa pode ter criado o pool enquanto esta aguardava o PING
+        if key in pools:
+            await handler.aclose()
+            return pools[key]
+
+        pools[key] = handler
+        return handler
+
+
+    @staticmethod
+    async def close_pools(settings: Settings=None):
+        """
+        Fecha e descarta os pools de conexão assíncronos do event loop atual
+
+        Params:
+
+            settings (Settings) - quando informado, fecha somente os pools criados a partir desta instância de Settings. Caso None, fecha todos (padrão None)
+
+        Examples:
+
+            await AsyncRedisConnect.close_pools() # fecha todas as conexões assíncronas do event loop
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        pools = _async_pools.get(asyncio.get_running_loop(), {})
+        for key in list(pools.keys()):
+            if settings is None or key[0] == id(settings):
+                handler = pools.pop(key)
+                await handler.aclose()
+                await handler.connection_pool.disconnect()
+
+
+    @staticmethod
+    async def _next_id(model: _model, amount: int=1) -> int:
+        # reserva "amount" posições de forma atômica e retorna a primeira delas
+        redis_handler = await AsyncRedisConnect._connect(model)
+        name = RedisConnect._get_meta_name(model, "autoid")
+        return await redis_handler.incrby(name, amount) - amount
+
+
+    @staticmethod
+    async def add(model: _model, exists_ok: bool=False):
+        """
+        Adiciona um novo registro no banco de dados (veja RedisConnect.add)
+
+        Params:
+
+            model - modelo que usa RedisModel (instanciado)
+
+            exists_ok (bool) - quando True, atualiza o valor do registro, caso exista. Se False, gera um erro caso já exista um registro com aquele ID (padrão False)
+
+        Examples:
+
+            user = UserModel(...)
+
+            await AsyncRedisConnect.add(user)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        await AsyncRedisConnect.add_many([model], exists_ok=exists_ok)
+
+
+    @staticmethod
+    async def add_many(models: list[_model], exists_ok: bool=False, chunk_size: int=None, atomic: bool=False):
+        """
+        Adiciona vários registros no banco de dados de uma só vez, gravando-os em pipelines (veja RedisConnect.add_many)
+
+        Params:
+
+            models (list) - modelos que usam RedisModel (instanciados)
+
+            exists_ok (bool) - quando True, atualiza os registros que já existem. Se False, gera um erro caso algum registro já exista (padrão False)
+
+            chunk_size (int) - quantidade de registros gravados por pipeline. Caso None, usa batch_size de Settings (padrão None)
+
+            atomic (bool) - quando True, cada pipeline é executado dentro de uma transação (MULTI/EXEC) (padrão False)
+
+        Examples:
+
+            await AsyncRedisConnect.add_many([UserModel(...), UserModel(...)])
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        models = list(models)
+        for model in models:
+            if not model.__instancied__:
+                raise RedisConnectionModelInstanceException(f"{model.__name__}: The model must be instantiated to be added to the database!")
+            elif model.__partial__:
+                raise RedisConnectionModelInstanceException(f"{type(model).__name__}: Partial models (obtained with fields) cannot be added to the database!")
+
+        if not models:
+            return
+
+        # reserva os IDs automáticos de cada modelo com uma única operação na sequência
+        set_ids = set()
+        for group in RedisConnect._get_pending(models).values():
+            pos = await AsyncRedisConnect._next_id(group[0], len(group))
+            for i, model in enumerate(group):
+                RedisConnect._set_identify(model, pos + i)
+                set_ids.add(id(model))
+
+        # verifica quais registros já existem (um único registro com ID definido é verificado pelo próprio script de escrita)
+        names = set()
+        existing = await AsyncRedisConnect._exists_many(models) if RedisConnect._check_exists(models, exists_ok, set_ids) else [False] * len(models)
+        for model, exists in zip(models, existing):
+            name = RedisConnect._get_name(model)
+            if (exists or name in names) and not exists_ok:
+                if id(model) not in set_ids:
+                    idname = model.__idname__
+                    raise RedisConnectionAlreadyRegisteredException(f"{type(model).__name__}: This {idname} ({getattr(model, idname)}) already exists in the database!")
+
+                # registros anteriores à sequência podem ocupar os próximos IDs (veja RedisConnect.seed_autoid)
+                while await AsyncRedisConnect.exists(model) or name in names:
+                    RedisConnect._set_identify(model, await AsyncRedisConnect._next_id(model))
+                    name = RedisConnect._get_name(model)
+            names.add(name)
+
+        references = await AsyncRedisConnect._get_references(models)
+        contents = [RedisConnect._prepare(model) for model in models]
+
+        # valores indexados atuais, para remover o registro dos índices antigos
+        indexed = await AsyncRedisConnect._get_indexed_many(models)
+
+        # atualiza as referências das chaves estrangeiras antes de gravar os registros (uma referência sem registro é ignorada ao apagar)
+        await AsyncRedisConnect._set_referenced(references, atomic)
+
+        chunk_size = int(chunk_size or models[0].__settings__.batch_size)
+        for i in range(0, len(contents), chunk_size):
+            groups = {}
+            for (model, name, content, expire), old in zip(contents[i:i+chunk_size], indexed[i:i+chunk_size]):
+                handler = await AsyncRedisConnect._connect(model)
+                groups.setdefault(id(handler), (handler, []))[1].append((model, name, content, expire, old))
+
+            for handler, values in groups.values():
+                cached = [name for model, name, *_ in values if model.__cache__]
+                script = handler.register_script(_ADD_SCRIPT)
+                async with handler.pipeline(transaction=atomic) as pipe:
+                    positions = []
+                    for model, name, content, expire, old in values:
+                        positions.append(len(pipe))
+                        await script(keys=[name], args=RedisConnect._get_add_args(content, expire, exists_ok, model.__version__), client=pipe)
+                        pipe.sadd(RedisConnect._get_meta_name(model, "members"), str(getattr(model, model.__idname__)))
+                        pipe.sadd(RedisConnect._get_tables_name(model.__settings__), str(model.__tablename__))
+                        RedisConnect._set_indexes(pipe, model, getattr(model, model.__idname__), content, old)
+                    if cached:
+                        RedisConnect._publish_invalidation(pipe, values[0][0].__settings__, values[0][0].__db__, cached)
+                    responses = await pipe.execute()
+
+                if cached:
+                    RedisConnect._invalidate(values[0][0].__settings__, values[0][0].__testing__, values[0][0].__db__, cached)
+
+                conflicts = RedisConnect._set_written(values, [responses[pos] for pos in positions])
+                if conflicts:
+                    # o registro foi criado (ou alterado) por outro processo após a verificação: os índices e as referências voltam a refletir o registro gravado
+                    await AsyncRedisConnect._restore_indexes(handler, [value for value, _ in conflicts])
+                    await AsyncRedisConnect._restore_references(handler, [value for value, _ in conflicts])
+                    RedisConnect._raise_conflict(conflicts)
+
+
+    @staticmethod
+    async def _restore_indexes(redis_handler: redis.asyncio.Redis, conflicts: list[tuple]):
+        # desfaz os índices dos registros que não foram gravados (veja RedisConnect._restore_indexes)
+        conflicts = [(model, name, content) for model, name, content, *_ in conflicts if model.__indexes__ or model.__ranges__]
+        if not conflicts:
+            return
+
+        async with redis_handler.pipeline(transaction=False) as pipe:
+            for model, name, _ in conflicts:
+                pipe.hmget(name, model.__indexes__ + model.__ranges__)
+            responses = await pipe.execute()
+
+        async with redis_handler.pipeline(transaction=False) as pipe:
+            for (model, _, content), values in zip(conflicts, responses):
+                current = RedisConnect._get_indexed(model.__indexes__ + model.__ranges__, [RedisConnect._decode(value) for value in values])
+                RedisConnect._set_indexes(pipe, model, getattr(model, model.__idname__), current, content)
+            await pipe.execute()
+
+
+    @staticmethod
+    async def _restore_references(redis_handler: redis.asyncio.Redis, conflicts: list[tuple]):
+        # desfaz as referências dos registros que não foram gravados (veja RedisConnect._restore_references)
+        conflicts = [(model, name) for model, name, *_ in conflicts if model.__foreign_keys__]
+        if not conflicts:
+            return
+
+        async with redis_handler.pipeline(transaction=False) as pipe:
+            for model, name in conflicts:
+                pipe.hmget(name, list(model.__foreign_keys__))
+            responses = await pipe.execute()
+
+        await AsyncRedisConnect._set_referenced(RedisConnect._get_restored(conflicts, responses))
+
+
+    @staticmethod
+    async def save(model: _model, partial: bool=False):
+        """
+        Grava um modelo, adicionando ou atualizando o seu registro (veja RedisConnect.save)
+
+        Params:
+
+            model - modelo que usa RedisModel (instanciado)
+
+            partial (bool) - quando True, grava somente os atributos alterados desde que o registro foi obtido (ou gravado). Caso o registro tenha sido alterado nesse intervalo, os atributos alterados são aplicados sobre o registro atual (padrão False)
+
+        Examples:
+
+            user = await AsyncRedisConnect.get_by_id(UserModel, 0)
+            user.age = 19
+
+            await AsyncRedisConnect.save(user, partial=True)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if not model.__instancied__:
+            raise RedisConnectionModelInstanceException(f"{model.__name__}: The model must be instantiated to be added to the database!")
+
+        update = RedisConnect._get_update(model) if partial else None
+        if update is None:
+            await AsyncRedisConnect.add(model, exists_ok=True)
+            return
+
+        name, content, old, args = update
+        if len(args) > 3:
+            redis_handler = await AsyncRedisConnect._connect(model)
+            if not await redis_handler.register_script(_SAVE_SCRIPT)(keys=[name], args=args):
+                # o registro foi alterado (ou apagado) desde que foi obtido: somente os atributos alterados são aplicados sobre o registro atual
+                values = RedisConnect._get_merged(model, content)
+                current = await AsyncRedisConnect.update(type(model), getattr(model, model.__idname__), lambda current: RedisConnect._set_values(current, values))
+                RedisConnect._refresh(model, current)
+                return
+
+            await AsyncRedisConnect._set_updated(redis_handler, model, getattr(model, model.__idname__), name, content, old, list(model.__changes__))
+            RedisConnect._set_version(model, content)
+            model.__signature__ = None
+
+        model.__changes__ = ()
+
+
+    @staticmethod
+    async def update(model: _model, identify: Any, function: Callable[[_model], Any], retries: int=5) -> _model:
+        """
+        Atualiza um registro com controle de concorrência otimista, repetindo em caso de conflito (veja RedisConnect.update)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            function (Callable) - função que recebe o modelo obtido e altera os seus atributos (pode ser executada mais de uma vez)
+
+            retries (int) - quantidade de novas tentativas em caso de conflito, antes de levantar RedisConnectConflictException (padrão 5)
+
+        Examples:
+
+            def withdraw(account):
+                account.balance -= 10
+
+            account = await AsyncRedisConnect.update(AccountModel, 0, withdraw)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        cls = model if callable(model) else type(model)
+        for _ in range(retries + 1):
+            current = await AsyncRedisConnect.get_by_id(cls, identify)
+            update = RedisConnect._apply_update(cls, identify, current, function)
+            if update is None:
+                return current
+
+            name, content, old, args = update
+            redis_handler = await AsyncRedisConnect._connect(current)
+            if await redis_handler.register_script(_SAVE_SCRIPT)(keys=[name], args=args):
+                await AsyncRedisConnect._set_updated(redis_handler, current, identify, name, content, old, list(current.__changes__))
+                RedisConnect._set_version(current, content)
+                current.__changes__ = ()
+                current.__signature__ = None
+                return current
+
+            # o registro em cache pode ser o registro desatualizado
+            if current.__cache__:
+                RedisConnect._invalidate(current.__settings__, current.__testing__, current.__db__, [name])
+
+        raise RedisConnectConflictException(f"{cls.__name__}: This record ({cls.__idname__}: {identify}) was changed by another client in all {retries + 1} attempts!")
+
+
+    @staticmethod
+    async def _set_updated(redis_handler: redis.asyncio.Redis, model: _model, identify: Any, name: str, content: dict, old: dict, fields: list[str]):
+        # atualiza os índices e o cache de um registro gravado parcialmente
+        cached = [name] if model.__cache__ else []
+        if not cached and not RedisConnect._has_indexed(model, fields):
+            return
+
+        async with redis_handler.pipeline(transaction=False) as pipe:
+            RedisConnect._set_indexes(pipe, model, identify, content, old)
+            if cached:
+                RedisConnect._publish_invalidation(pipe, model.__settings__, model.__db__, cached)
+            await pipe.execute()
+
+        if cached:
+            RedisConnect._invalidate(model.__settings__, model.__testing__, model.__db__, cached)
+
+
+    @staticmethod
+    async def incr(model: _model, identify: Any, field: str, amount: int=1) -> int:
+        """
+        Incrementa um atributo int de um registro de forma atômica, mantendo o hash de integridade válido (veja RedisConnect.incr)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            field (str) - nome do atributo (int) que será incrementado
+
+            amount (int) - valor somado ao atributo, podendo ser negativo (padrão 1)
+
+        Examples:
+
+            stock = await AsyncRedisConnect.incr(ProductModel, 0, "stock", -1)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return await AsyncRedisConnect._incr(model, identify, field, amount, int)
+
+
+    @staticmethod
+    async def incr_float(model: _model, identify: Any, field: str, amount: float=1.0) -> float:
+        """
+        Incrementa um atributo float de um registro de forma atômica, mantendo o hash de integridade válido (veja RedisConnect.incr_float)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            field (str) - nome do atributo (float) que será incrementado
+
+            amount (float) - valor somado ao atributo, podendo ser negativo (padrão 1.0)
+
+        Examples:
+
+            balance = await AsyncRedisConnect.incr_float(AccountModel, 0, "balance", 10.5)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return await AsyncRedisConnect._incr(model, identify, field, amount, float)
+
+
+    @staticmethod
+    async def _incr(model: _model, identify: Any, field: str, amount: int|float, typ: type) -> int|float:
+        model = RedisConnect._get_instance(model if callable(model) else type(model))
+        RedisConnect._check_incr(model, field, amount, typ)
+
+        setattr(model, model.__idname__, identify)
+        name = RedisConnect._get_name(model)
+        redis_handler = await AsyncRedisConnect._connect(model)
+        script = redis_handler.register_script(_SAVE_SCRIPT)
+
+        # o script só grava se o registro não mudou desde a leitura; caso contrário, lê e tenta novamente
+        while True:
+            value, content, old, args = RedisConnect._get_increment(model, identify, field, amount, await redis_handler.hgetall(name))
+            if await script(keys=[name], args=args):
+                break
+
+        await AsyncRedisConnect._set_updated(redis_handler, model, identify, name, content, old, [field])
+        return value
+
+
+    @staticmethod
+    async def _exists_many(models: list[_model]) -> list[bool]:
+        # verifica a existência de vários registros, usando um pipeline por conexão
+        groups = {}
+        for i, model in enumerate(models):
+            handler = await AsyncRedisConnect._connect(model)
+            groups.setdefault(id(handler), (handler, []))[1].append(i)
+
+        response = [False] * len(models)
+        for handler, indexes in groups.values():
+            async with handler.pipeline(transaction=False) as pipe:
+                for i in indexes:
+                    pipe.exists(RedisConnect._get_name(models[i]))
+                for i, exists in zip(indexes, await pipe.execute()):
+                    response[i] = exists == 1
+
+        return response
+
+
+    @staticmethod
+    async def _get_indexed_many(models: list[_model]) -> list[dict]:
+        # obtém os valores atuais dos atributos indexados de cada registro
+        groups = {}
+        for i, model in enumerate(models):
+            if model.__indexes__:
+                handler = await AsyncRedisConnect._connect(model)
+                groups.setdefault(id(handler), (handler, []))[1].append(i)
+
+        response = [{} for _ in models]
+        for handler, indexes in groups.values():
+            async with handler.pipeline(transaction=False) as pipe:
+                for i in indexes:
+                    pipe.hmget(RedisConnect._get_name(models[i]), models[i].__indexes__)
+                for i, values in zip(indexes, await pipe.execute()):
+                    response[i] = RedisConnect._get_indexed(models[i].__indexes__, values)
+
+        return response
+
+
+    @staticmethod
+    async def _get_references(models: list[_model]) -> dict[str, tuple]:
+        # valida as chaves estrangeiras e retorna as referências que serão gravadas (e removidas) em cada registro referenciado
+        targets = RedisConnect._get_fk_targets(models)
+        children = [model for model in models if model.__foreign_keys__]
+
+        groups = {}
+        for fk_name, fk_model in targets.items():
+            handler = await AsyncRedisConnect._connect(fk_model)
+            groups.setdefault(id(handler), (handler, [], []))[1].append(fk_name)
+        for model in children:
+            handler = await AsyncRedisConnect._connect(model)
+            groups.setdefault(id(handler), (handler, [], []))[2].append(model)
+
+        existing = {}
+        previous = {}
+        for handler, fk_names, models_fk in groups.values():
+            async with handler.pipeline(transaction=False) as pipe:
+                for fk_name in fk_names:
+                    pipe.exists(fk_name)
+                for model in models_fk:
+                    pipe.hmget(RedisConnect._get_name(model), list(model.__foreign_keys__))
+                responses = await pipe.execute()
+
+            existing.update(zip(fk_names, responses))
+            previous.update((id(model), values) for model, values in zip(models_fk, responses[len(fk_names):]))
+
+        return RedisConnect._set_references(models, existing, previous)
+
+
+    @staticmethod
+    async def _set_referenced(references: dict[str, tuple], atomic: bool=False):
+        # grava (HSET) e remove (HDEL) as referências, com um pipeline por conexão
+        groups = {}
+        for refs_name, (fk_model, fields) in references.items():
+            handler = await AsyncRedisConnect._connect(fk_model)
+            groups.setdefault(id(handler), (handler, []))[1].append((refs_name, fields))
+
+        for handler, values in groups.values():
+            async with handler.pipeline(transaction=atomic) as pipe:
+                for refs_name, fields in values:
+                    RedisConnect._queue_referenced(pipe, refs_name, fields)
+                await pipe.execute()
+
+
+    @staticmethod
+    async def exists(model: _model, identify: Any=None) -> bool:
+        """
+        Verifica se um modelo já existe no banco de dados (veja RedisConnect.exists)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro que será verificado. Caso o modelo esteja instanciado, não é obrigatório (padrão None)
+
+        Examples:
+
+            exists = await AsyncRedisConnect.exists(UserModel, identify=0) # retorna True ou False
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if not model.__instancied__ and identify is None:
+            raise RedisConnectNoIdentifierException(f"{model.__name__}: Use an instance of the model or provide an identifier.")
+
+        if model.__instancied__ and identify is None:
+            identify = getattr(model, model.__idname__)
+
+        if callable(model):
+            model = model(instance=False, identify=identify)
+
+        name = RedisConnect._get_name(model)
+        cache = await AsyncRedisConnect._get_cache(model)
+        if cache is not None and cache.get(name) is not None:
+            return True
+
+        redis_handler = await AsyncRedisConnect._connect(model)
+        return await redis_handler.exists(name) == 1
+
+
+    @staticmethod
+    async def get(model: _model, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> Getter:
+        """
+        Obtém os registros de um modelo (veja RedisConnect.get)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            fields (list) - obtém somente estes atributos (HMGET), retornando modelos parciais, sem verificação de integridade (padrão None)
+
+        Examples:
+
+            users = await AsyncRedisConnect.get(UserModel) # retorna Getter
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return Getter([new_model async for new_model in AsyncRedisConnect.iter(model, on_corrupt=on_corrupt, fields=fields, _set_fk=_set_fk)])
+
+
+    @staticmethod
+    def iter(model: _model, batch_size: int=None, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> AsyncIterator[_model]:
+        """
+        Percorre os registros de um modelo sob demanda com "async for", mantendo em memória somente um lote por vez
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            batch_size (int) - quantidade de registros obtidos por pipeline. Caso None, usa batch_size de Settings (padrão None)
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            fields (list) - obtém somente estes atributos (HMGET), retornando modelos parciais, sem verificação de integridade (padrão None)
+
+        Examples:
+
+            async for user in AsyncRedisConnect.iter(UserModel, batch_size=1000):
+                await export(user)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if callable(model):
+            model = RedisConnect._get_instance(model)
+
+        on_corrupt = RedisConnect._get_on_corrupt(model, on_corrupt)
+        projection = RedisConnect._get_projection(model, fields)
+
+        members = RedisConnect._get_meta_name(model, "members")
+        settings: Settings = model.__settings__
+        scan_count = int(settings.scan_count)
+        batch_size = int(batch_size or settings.batch_size)
+
+        async def _iter():
+            redis_handler = await AsyncRedisConnect._connect(model)
+            cursor = 0
+            while True:
+                cursor, identifiers = await redis_handler.sscan(members, cursor, count=scan_count)
+                names = RedisConnect._get_member_names(model, identifiers)
+                for i in range(0, len(names), batch_size):
+                    batch = names[i:i+batch_size]
+                    async with redis_handler.pipeline(transaction=False) as pipe:
+                        for name in batch:
+                            if projection:
+                                pipe.hmget(name, projection)
+                            else:
+                                pipe.hgetall(name)
+                        responses = await pipe.execute()
+
+                    if projection:
+                        responses = [RedisConnect._project(projection, resp) for resp in responses]
+                    missing = RedisConnect._get_missing(model, batch, responses)
+                    if missing:
+                        await redis_handler.srem(members, *missing)
+                    for new_model in await AsyncRedisConnect._hydrate_many(model, responses, on_corrupt, _set_fk, projection):
+                        yield new_model
+
+                if cursor == 0:
+                    break
+
+        return _iter()
+
+
+    @staticmethod
+    async def get_by_id(model: _model, identify: Any, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> _model|None:
+        """
+        Obtém um único registro pelo ID, sem percorrer a tabela (veja RedisConnect.get_by_id)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            on_corrupt (str) - o que fazer caso o registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            fields (list) - obtém somente estes atributos (HMGET), retornando um modelo parcial, sem verificação de integridade (padrão None)
+
+        Examples:
+
+            user = await AsyncRedisConnect.get_by_id(UserModel, 0) # retorna o modelo ou None, caso não exista
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        models = await AsyncRedisConnect._get_many_by_id(model, [identify], on_corrupt, _set_fk, fields)
+        return models[0] if models else None
+
+
+    @staticmethod
+    async def get_many_by_id(model: _model, identifiers: list, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> Getter:
+        """
+        Obtém vários registros pelos IDs, usando um único pipeline (veja RedisConnect.get_many_by_id)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identifiers (list) - identificadores dos registros. IDs sem registro são ignorados
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            fields (list) - obtém somente estes atributos (HMGET), retornando modelos parciais, sem verificação de integridade (padrão None)
+
+        Examples:
+
+            users = await AsyncRedisConnect.get_many_by_id(UserModel, [0, 1, 2]) # retorna Getter, na mesma ordem dos IDs
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return Getter(await AsyncRedisConnect._get_many_by_id(model, identifiers, on_corrupt, _set_fk, fields))
+
+
+    @staticmethod
+    async def _get_many_by_id(model: _model, identifiers: list, on_corrupt: str="default", _set_fk: bool=True, fields: list[str]=None) -> list[_model]:
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        on_corrupt = RedisConnect._get_on_corrupt(model, on_corrupt)
+        projection = RedisConnect._get_projection(model, fields)
+        idname = model.__idname__
+
+        names = []
+        for identify in identifiers:
+            setattr(model, idname, identify)
+            names.append(RedisConnect._get_name(model))
+
+        batch_size = int(model.__settings__.batch_size)
+        redis_handler = await AsyncRedisConnect._connect(model)
+        models = []
+        for i in range(0, len(names), batch_size):
+            responses = await AsyncRedisConnect._read_many(redis_handler, model, names[i:i+batch_size], projection)
+            models.extend(await AsyncRedisConnect._hydrate_many(model, responses, on_corrupt, _set_fk, projection))
+
+        return models
+
+
+    @staticmethod
+    async def _get_cache(model: _model) -> RecordCache|None:
+        if not model.__cache__:
+            return None
+
+        cache = _caches.get(RedisConnect._get_cache_key(model))
+        if cache is not None:
+            return cache
+
+        # a primeira leitura inscreve o processo nas invalidações (conexão síncrona e thread), fora do event loop
+        return await asyncio.get_running_loop().run_in_executor(None, RedisConnect._get_cache, model)
+
+
+    @staticmethod
+    async def _read_many(redis_handler: redis.asyncio.Redis, model: _model, names: list[str], projection: list[str]=None) -> list[dict]:
+        if projection:
+            # leituras parciais não usam o cache local, que guarda somente registros completos
+            async with redis_handler.pipeline(transaction=False) as pipe:
+                for name in names:
+                    pipe.hmget(name, projection)
+                return [RedisConnect._project(projection, resp) for resp in await pipe.execute()]
+
+        # lê os registros com um único pipeline, usando o cache local do modelo (__cache__) quando possível
+        cache = await AsyncRedisConnect._get_cache(model)
+        responses = [cache.get(name) if cache else None for name in names]
+        pending = [i for i, resp in enumerate(responses) if resp is None]
+        if not pending:
+            return responses
+
+        generation = cache.generation if cache is not None else None
+        async with redis_handler.pipeline(transaction=False) as pipe:
+            for i in pending:
+                pipe.hgetall(names[i])
+            for i, resp in zip(pending, await pipe.execute()):
+                responses[i] = resp
+                if cache is not None and resp:
+                    cache.set(names[i], resp, generation)
+
+        return responses
+
+
+    @staticmethod
+    async def _hydrate_many(model: _model, responses: list[dict], on_corrupt: str, _set_fk: bool=True, projection: list[str]=None) -> list[_model]:
+        if projection:
+            # registros parciais não possuem o conteúdo completo para verificar o hash de integridade
+            models = RedisConnect._hydrate_many(model, responses, on_corrupt, _set_fk, projection)
+            LazyForeignKey._set_async(models)
+            return models
+
+        # as chaves estrangeiras do lote são obtidas antes, para que a criação dos modelos não bloqueie o event loop
+        # (no modo "lazy", use AsyncRedisConnect.prefetch ou load antes de acessá-las)
+        fks = {}
+        if _set_fk and model.__settings__.load_type != "lazy":
+            for ref, (fk_model, ids) in RedisConnect._get_fk_ids(model, responses).items():
+                resolved = await AsyncRedisConnect._get_many_by_id(fk_model, ids)
+                fks[ref] = RedisConnect._map_fks(fk_model, resolved)
+
+        models = []
+        for resp in responses:
+            if not resp:
+                continue # o registro expirou ou foi apagado entre o SCAN e a leitura
+
+            new_model = RedisConnect._hydrate(model, resp, on_corrupt, _set_fk, fks)
+            if new_model is not None:
+                models.append(new_model)
+
+        LazyForeignKey._set_async(models)
+        return models
+
+
+    @staticmethod
+    async def prefetch(models: Getter|list[_model], ref: str):
+        """
+        Obtém de uma só vez a chave estrangeira "ref" de vários modelos (load_type "lazy"), usando um único pipeline (veja prefetch)
+
+        Params:
+
+            models (Getter|list) - modelos que possuem a chave estrangeira
+
+            ref (str) - nome da chave estrangeira
+
+        Examples:
+
+            orders = await AsyncRedisConnect.get(OrderModel)
+            await AsyncRedisConnect.prefetch(orders, "user") # order.user() não consulta o Redis
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        pending = LazyForeignKey._get_pending(models, ref)
+        if not pending:
+            return
+
+        fk_model = pending[0]._model
+        ids = sorted({str(fk._id) for fk in pending})
+        resolved = await AsyncRedisConnect._get_many_by_id(fk_model, ids)
+        LazyForeignKey._fill(pending, RedisConnect._map_fks(fk_model, resolved))
+
+
+    @staticmethod
+    async def delete(model: _model, identify: Any|list=None, non_existent_ok: bool=False):
+        """
+        Apaga um ou mais registro do banco de dados (veja RedisConnect.delete)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any|list) - identificador (es) do registro que será apagado. Caso o modelo esteja instanciado, não é obrigatório (padrão None)
+
+            non_existent_ok (bool) - quando True, nada acontece se identify não existir (padrão False)
+
+        Examples:
+
+            await AsyncRedisConnect.delete(UserModel, identify=[0, 1, 2])
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if not model.__instancied__ and identify is None:
+            raise RedisConnectNoIdentifierException(f"{model.__name__}: Use an instance of the model or provide an identifier.")
+
+        if model.__instancied__ and identify is None:
+            identify = getattr(model, model.__idname__)
+            model = model.__class__
+
+        model = model if callable(model) else model.__class__
+        identifiers = identify if isinstance(identify, list) else [identify]
+        await AsyncRedisConnect._delete_many(model, identifiers, non_existent_ok)
+
+
+    @staticmethod
+    async def _delete_many(model: _model, identifiers: list, non_existent_ok: bool=False):
+        # percorre o grafo das referências em largura antes de apagar qualquer registro (veja RedisConnect._delete_many)
+        delete_model = RedisConnect._get_instance(model)
+        settings: Settings = delete_model.__settings__
+
+        level = {type(delete_model): list(identifiers)}
+        visited = set()
+        plan = []
+        orphans = {}
+        while level:
+            following = {}
+            for cls, ids in level.items():
+                level_model = RedisConnect._get_instance(cls)
+                ids, names, refs_names = RedisConnect._get_deleted_names(level_model, ids, visited)
+                if not ids:
+                    continue
+
+                references, indexed, fk_values = await AsyncRedisConnect._read_deleted(level_model, ids, names, refs_names, non_existent_ok)
+                checks = RedisConnect._get_cascade(level_model, references, following, orphans)
+                await AsyncRedisConnect._check_references(type(level_model).__name__, settings, checks)
+                plan.append((level_model, ids, names, refs_names, indexed, fk_values))
+
+            non_existent_ok = True # registros em cascata podem ter sido apagados ou expirado
+            level = following
+
+        # apaga os registros começando pelo último nível, sem bloquear o servidor
+        deleted_refs = {refs_name for _, _, _, refs_names, _, _ in plan for refs_name in refs_names}
+        for (db, testing), names in orphans.items():
+            await AsyncRedisConnect._unlink(await AsyncRedisConnect._get_handler(settings, db, testing), settings, db, testing, names, [], True)
+
+        for level_model, ids, names, refs_names, indexed, fk_values in reversed(plan):
+            redis_handler = await AsyncRedisConnect._connect(level_model)
+            await AsyncRedisConnect._unlink(redis_handler, level_model.__settings__, level_model.__db__, level_model.__testing__, names, refs_names, bool(level_model.__cache__), level_model, ids, indexed)
+
+            if level_model.__foreign_keys__:
+                references = RedisConnect._get_unreferenced(level_model, names, fk_values)
+                await AsyncRedisConnect._set_referenced({refs_name: value for refs_name, value in references.items() if refs_name not in deleted_refs})
+
+
+    @staticmethod
+    async def _read_deleted(model: _model, identifiers: list, names: list[str], refs_names: list[str], non_existent_ok: bool) -> tuple[list, list, list]:
+        redis_handler = await AsyncRedisConnect._connect(model)
+        batch_size = int(model.__settings__.batch_size)
+        responses = []
+        for i in range(0, len(names), batch_size):
+            async with redis_handler.pipeline(transaction=False) as pipe:
+                for name, refs_name in zip(names[i:i+batch_size], refs_names[i:i+batch_size]):
+                    RedisConnect._queue_deleted(pipe, model, name, refs_name)
+                responses.extend(await pipe.execute())
+
+        return RedisConnect._parse_deleted(model, identifiers, responses, non_existent_ok)
+
+
+    @staticmethod
+    async def _check_references(cls_name: str, settings: Settings, references: list[dict]):
+        groups = {}
+        for value in references:
+            fk_handler = await AsyncRedisConnect._get_handler(settings, value["db"], value["testing"])
+            groups.setdefault(id(fk_handler), (fk_handler, []))[1].append(value)
+
+        for fk_handler, values in groups.values():
+            async with fk_handler.pipeline(transaction=False) as pipe:
+                for value in values:
+                    pipe.exists(value["name"])
+                RedisConnect._check_actions(cls_name, values, await pipe.execute())
+
+
+    @staticmethod
+    async def _unlink(redis_handler: redis.asyncio.Redis, settings: Settings, db: int, testing: bool, names: list[str], refs_names: list[str], publish: bool, model: _model=None, identifiers: list=None, indexed: list=None):
+        batch_size = int(settings.batch_size)
+        async with redis_handler.pipeline(transaction=False) as pipe:
+            if model is not None:
+                for _id, old in zip(identifiers, indexed):
+                    RedisConnect._set_indexes(pipe, model, _id, None, old)
+                for i in range(0, len(identifiers), batch_size):
+                    pipe.srem(RedisConnect._get_meta_name(model, "members"), *[str(_id) for _id in identifiers[i:i+batch_size]])
+            for i in range(0, len(names), batch_size):
+                pipe.unlink(*names[i:i+batch_size])
+            for i in range(0, len(refs_names), batch_size):
+                pipe.unlink(*refs_names[i:i+batch_size])
+            if publish:
+                RedisConnect._publish_invalidation(pipe, settings, db, names)
+            await pipe.execute()
+
+        if publish:
+            RedisConnect._invalidate(settings, testing, db, names)
+
+
+    @staticmethod
+    async def count(db: int|str, settings: Settings, testing: bool=False) -> int:
+        """
+        Retorna a quantidade de registros de um banco de dados completo (veja RedisConnect.count)
+
+        Params:
+
+            db (int|str) - índice do banco de dados
+            settings (Settings) - configurações para a conexão
+            testing (bool) - informa se é um teste
+
+        Examples:
+
+            count = await AsyncRedisConnect.count(db="tests", settings=settings)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if isinstance(db, str):
+            if not isinstance(settings, Settings):
+                raise RedisConnectionSettingsInstanceException("For a named db enter an instance of Settings!")
+            db = settings.get_db(db)
+
+        redis_handler = await AsyncRedisConnect._connect(use_model=False, settings=settings, db=db, testing=testing)
+        tables = await redis_handler.smembers(RedisConnect._get_tables_name(settings))
+        async with redis_handler.pipeline(transaction=False) as pipe:
+            for members in RedisConnect._get_members_names(settings, tables):
+                pipe.scard(members)
+            return sum(await pipe.execute())
+
+
+    @staticmethod
+    async def count_model(model: _model) -> int:
+        """
+        Retorna a quantidade de registros de um modelo (veja RedisConnect.count_model)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+        Examples:
+
+            count = await AsyncRedisConnect.count_model(UserModel)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        redis_handler = await AsyncRedisConnect._connect(model)
+        return await redis_handler.scard(RedisConnect._get_meta_name(model, "members"))
+
+
+
+"""
+created by:
+
+
+▄▀█ █▀ ▀█▀ █░█ ▀█▀ █▀█
+█▀█ ▄█ ░█░ █▄█ ░█░ █▄█
+
+https://github.com/paulindavzl/redis-okm
+"""
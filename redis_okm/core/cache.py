@@ -0,0 +1,105 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class RecordCache:
+    """
+    Cache local dos registros lidos do Redis, com remoção dos menos usados (LRU), expiração (TTL) e estatísticas
+    """
+    def __init__(self, max_entries: int, ttl: float|None=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float|None, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self._generation = 0 # incrementada a cada invalidação, para descartar leituras anteriores a ela (veja RecordCache.set)
+
+
+    @property
+    def generation(self) -> int:
+        """
+        retorna a geração atual do cache, que deve ser obtida antes de ler os registros do Redis
+        """
+        with self._lock:
+            return self._generation
+
+
+    def get(self, name: str) -> dict|None:
+        # retorna uma cópia do conteúdo do registro (a leitura altera o dicionário recebido)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires, content = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._entries[name]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(name)
+            self.hits += 1
+            return dict(content)
+
+
+    def set(self, name: str, content: dict, generation: int=None):
+        # um registro lido antes de uma invalidação pode estar desatualizado e não é guardado
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+
+            self._entries[name] = (expires, dict(content))
+            self._entries.move_to_end(name)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+
+    def invalidate(self, names: list[str]):
+        with self._lock:
+            self._generation += 1
+            for name in names:
+                if self._entries.pop(name, None) is not None:
+                    self.invalidations += 1
+
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+    @property
+    def stats(self) -> dict:
+        """
+        retorna as estatísticas do cache
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+
+
+"""
+created by:
+
+
+▄▀█ █▀ ▀█▀ █░█ ▀█▀ █▀█
+█▀█ ▄█ ░█░ █▄█ ░█░ █▄█
+
+https://github.com/paulindavzl/redis-okm
+"""
@@ -0,0 +1,237 @@
+import json
+import hashlib
+from typing import Any, Callable, get_origin
+
+from ..core import _model
+from .foreign_key import LazyForeignKey
+from ..exceptions.redis_model_exceptions import RedisModelAttributeException, RedisModelTypeValueException
+from ..exceptions.connection_exceptions import RedisConnectTypeValueException
+
+
+class ModelCodec:
+    """
+    Conversão entre modelos e registros do Redis, compilada uma única vez quando o modelo é criado
+    """
+    def __init__(self, model: type):
+        ann: dict = model.__annotations__
+
+        self.model = model
+        self.name = model.__name__
+        self.idname = model.__idname__
+        self.foreign_keys = {ref: fk["model"] for ref, fk in model.__foreign_keys__.items()}
+
+        # ordem fixa dos campos gravados (a mesma da declaração do modelo)
+        self.fields = [attr for attr in ann if isinstance(attr, str) and not attr.startswith("__") and attr not in model.__ignore__]
+
+        # tipos já resolvidos: campos gravados como JSON e conversores dos demais
+        self.json_fields: dict[str, type] = {}
+        self.types: dict[str, type] = {}
+        self.decoders: list[tuple[str, Callable, Callable]] = []
+        for attr in self.fields:
+            if attr in self.foreign_keys:
+                continue
+
+            pseudo_type = ann[attr]
+            typ = get_origin(pseudo_type) or pseudo_type
+            self.types[attr] = typ
+            if typ in [dict, list, tuple]:
+                self.json_fields[attr] = typ
+            # os registros lidos são gravados direto nos __slots__, sem passar por RedisModel.__setattr__
+            self.decoders.append((attr, ModelCodec._get_decoder(typ), getattr(model, attr).__set__))
+
+        # tipo dos IDs das chaves estrangeiras (o mesmo usado em RedisModel.__init__)
+        self.fk_types = {ref: str if model.__autoid__ else ann.get(fk.__idname__, fk.__annotations__[fk.__idname__]) for ref, fk in self.foreign_keys.items()}
+        self.defaults = {attr: value for attr, value in model.__defaults__.items() if attr in self.types}
+        self.params: dict = model.__params__
+        self._key_prefix = f"{self.idname}{model.__tablename__}{model.__db__}".encode("utf-8")
+
+
+    @staticmethod
+    def _get_decoder(typ: type) -> Callable:
+        if typ is str:
+            return str
+        elif typ is bool:
+            return lambda value: value == "True"
+        elif typ is tuple:
+            return lambda value: tuple(json.loads(value))
+        elif typ in [dict, list]:
+            return json.loads
+        return typ
+
+
+    def key(self, identify: Any) -> str:
+        return hashlib.sha256(self._key_prefix + str(identify).encode("utf-8")).hexdigest()
+
+
+    @staticmethod
+    def sign(key: str, content: dict) -> str:
+        return hashlib.sha256(key.encode("utf-8") + json.dumps(content).encode("utf-8")).hexdigest()
+
+
+    def order(self, values: dict) -> dict:
+        """
+        ordena o conteúdo do registro como os campos do modelo (campos desconhecidos ficam no final)
+        """
+        ordered = {attr: values[attr] for attr in self.fields if attr in values}
+        if len(ordered) != len(values):
+            ordered.update((attr, value) for attr, value in values.items() if attr not in ordered)
+        return ordered
+
+
+    def verify(self, key: str, values: dict, signature: str) -> bool:
+        ordered = self.order(values)
+        if ModelCodec.sign(key, ordered) == signature:
+            return True
+
+        # registros gravados em versões anteriores têm o hash calculado na ordem em que os campos foram recebidos
+        return list(ordered) != list(values) and ModelCodec.sign(key, values) == signature
+
+
+    def encode(self, model: _model) -> dict[str, str]:
+        """
+        converte o modelo no conteúdo do registro (sem o hash de integridade)
+        """
+        content = {}
+        json_fields = self.json_fields
+        for attr in self.fields:
+            if attr in self.foreign_keys:
+                content[attr] = str(model.__foreign_keys__[attr]["id"])
+                continue
+
+            value = getattr(model, attr)
+            if attr in json_fields:
+                content[attr] = self.encode_value(attr, value)
+                continue
+            elif callable(value):
+                params = self.params.get(attr)
+                value = self.types[attr](value(**params) if params else value())
+                setattr(model, attr, value)
+
+            content[attr] = str(value)
+        return content
+
+
+    def encode_value(self, attr: str, value: Any) -> str:
+        """
+        converte o valor de um atributo (exceto chaves estrangeiras) no valor gravado
+        """
+        typ = self.json_fields.get(attr)
+        if typ is None:
+            return str(value)
+        elif typ != type(value):
+            raise RedisConnectTypeValueException(f'{self.name}: Divergence in the type of the attribute "{attr}". expected: "{typ.__name__}" - received: "{type(value).__name__}"')
+        return json.dumps(value)
+
+
+    def decode(self, values: dict[str, str]) -> dict[str, Any]:
+        """
+        converte o conteúdo do registro nos valores dos atributos (exceto chaves estrangeiras)
+        """
+        attrs = {}
+        for attr, decoder, _ in self.decoders:
+            if attr not in values:
+                if attr not in self.defaults:
+                    raise RedisModelAttributeException(f"{self.name}: {attr} must receive a value!")
+                attrs[attr] = self.defaults[attr]
+                continue
+
+            attrs[attr] = self._decode_value(attr, decoder, values[attr])
+        return attrs
+
+
+    def _decode_value(self, attr: str, decoder: Callable, value: str) -> Any:
+        try:
+            return decoder(value)
+        except (ValueError, TypeError):
+            raise RedisModelTypeValueException(f"{self.name}: {attr} expected a possible {self.types[attr].__name__} value, but received a {type(value).__name__} ({value}) value!")
+
+
+    def build(self, values: dict[str, str], set_fk: bool=True, fks: dict=None) -> _model:
+        """
+        cria o modelo a partir de um registro do Redis, sem repetir as validações de RedisModel.__init__
+        """
+        model = self.model
+        new_model = model.__new__(model)
+        object.__setattr__(new_model, "__changes__", ()) # registros lidos rastreiam as alterações
+        if self.foreign_keys:
+            new_model.__foreign_keys__ = {ref: dict(fk) for ref, fk in model.__foreign_keys__.items()}
+
+        attrs = self.decode(values)
+        for attr, _, set_value in self.decoders:
+            set_value(new_model, attrs[attr])
+
+        lazy = model.__settings__.load_type == "lazy"
+        for ref, fk_model in self.foreign_keys.items():
+            identify = self.fk_types[ref](values[ref])
+            new_model.__foreign_keys__[ref]["id"] = identify
+            if not set_fk:
+                setattr(new_model, ref, identify)
+                continue
+
+            # no modo "lazy" somente o ID é guardado, e o registro é obtido no primeiro acesso
+            resolved = (fks or {}).get(ref, {}).get(str(identify))
+            foreign_key = LazyForeignKey(self.name, ref, fk_model, identify, resolved)
+            setattr(new_model, ref, foreign_key if lazy else foreign_key())
+
+        new_model.__instancied__ = True
+        return new_model
+
+
+    def build_partial(self, values: dict[str, str], set_fk: bool=True) -> _model:
+        """
+        cria um modelo parcial somente com os atributos obtidos (fields), sem verificar o hash de integridade
+        """
+        model = self.model
+        new_model = model.__new__(model)
+        if self.foreign_keys:
+            new_model.__foreign_keys__ = {ref: dict(fk) for ref, fk in model.__foreign_keys__.items()}
+
+        for attr, decoder, set_value in self.decoders:
+            if attr in values:
+                set_value(new_model, self._decode_value(attr, decoder, values[attr]))
+
+        # as chaves estrangeiras de modelos parciais são sempre obtidas no primeiro acesso
+        for ref, fk_model in self.foreign_keys.items():
+            if ref in values:
+                identify = self.fk_types[ref](values[ref])
+                new_model.__foreign_keys__[ref]["id"] = identify
+                setattr(new_model, ref, LazyForeignKey(self.name, ref, fk_model, identify) if set_fk else identify)
+
+        new_model.__partial__ = True
+        new_model.__instancied__ = True
+        return new_model
+
+
+    def build_corrupted(self, values: dict[str, str]) -> _model:
+        """
+        cria o modelo de um registro corrompido (on_corrupt "flag"), mantendo somente o identificador
+        """
+        model = self.model
+        new_model = model.__new__(model)
+        if self.foreign_keys:
+            new_model.__foreign_keys__ = {ref: dict(fk) for ref, fk in model.__foreign_keys__.items()}
+
+        idname = self.idname
+        identify = values.get(idname)
+        try:
+            identify = self.types[idname](identify) if idname in self.types else identify
+        except (ValueError, TypeError):
+            pass
+
+        for attr in self.fields:
+            setattr(new_model, attr, identify if attr == idname else "corrupted")
+        new_model.__status__ = False
+        new_model.__instancied__ = True
+        return new_model
+
+
+
+"""
+created by:
+
+
+▄▀█ █▀ ▀█▀ █░█ ▀█▀ █▀█
+█▀█ ▄█ ░█░ █▄█ ░█░ █▄█
+
+https://github.com/paulindavzl/redis-okm
+"""
@@ -35,6 +35,8 @@ class Settings:
     hash_algorithm: str
     on_corrupt: Literal["flag", "skip", "ignore"]
     load_type: Literal["lazy", "eager"]
+    scan_count: int = 1000 # sugestão de quantidade de chaves por página do SCAN
+    batch_size: int = 500 # quantidade de registros obtidos por pipeline
 
 
     def __init__(self, path: str="redis_configure.json"):
@@ -92,7 +94,6 @@ class Settings:
         typ = self._types(config_name)
         value = value.split("env:")[1].strip()
         env = os.getenv(value)
-        print(env, value)
         if env is None:
             raise SettingsEnvkeyException(f'"{value}" key does not exist in environment variables ({self._envfile})!')
         value = typ(env)
@@ -104,7 +105,7 @@ class Settings:
     def _types(config_name: str) -> type:
         _types = {
             "int": [
-                "port", "max_connections", "blocking_timeout"
+                "port", "max_connections", "blocking_timeout", "scan_count", "batch_size"
             ],
             "float": [
                 "timeout"
@@ -162,7 +163,9 @@ class Settings:
                 "max_connections": 10,
                 "blocking_timeout": 3,
                 "on_corrupt": "flag",
-                "load_type": "lazy"
+                "load_type": "lazy",
+                "scan_count": 1000,
+                "batch_size": 500
             },
             "structure": {
                 "separator": ":",
@@ -248,6 +251,8 @@ class Settings:
             "blocking_timeout": "pools",
             "on_corrupt": "pools",
             "load": "pools",
+            "scan_count": "pools",
+            "batch_size": "pools",
             "decode_response": "connection",
             "timeout": "connection",
             "retry_on_timeout": "connection",
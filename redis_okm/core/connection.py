@@ -1,14 +1,55 @@
 import time
 import json
+import threading
 import redis
 import hashlib
 import fakeredis
-from typing import Any, get_origin, Literal
+from typing import Any, Callable, Iterator, Literal
 
 from ..core import _model
 from .configure import Settings
 from .getter import Getter
+from .cache import RecordCache
 from ..exceptions.connection_exceptions import *
+from ..exceptions.getter_exceptions import GetterCorruptionException
+
+
+_pools: dict[tuple, redis.Redis] = {} # registro global de pools de conexão
+_pools_lock = threading.Lock()
+
+_caches: dict[tuple, RecordCache] = {} # caches locais dos modelos com __cache__, por Settings, testing, banco de dados e tabela
+_listeners: dict[tuple, tuple] = {} # inscrições (pub/sub) que invalidam os caches, por Settings e testing
+_caches_lock = threading.RLock()
+
+# grava o registro e a expiração de uma só vez, sem sobrescrever um registro existente (exceto com exists_ok) nem um registro de outra versão (__version__)
+# KEYS[1]: registro - ARGV[1]: "1" caso possa sobrescrever, ARGV[2]: expiração em ms (0 sem expiração), ARGV[3]: atributo da versão ("" sem versão),
+# ARGV[4]: versão esperada, ARGV[5...]: campo, valor - retorna 1 (gravado), 0 (já existe) ou -1 (versão diferente)
+_ADD_SCRIPT = """
+if ARGV[1] == "0" and redis.call("EXISTS", KEYS[1]) == 1 then
+    return 0
+end
+if ARGV[3] ~= "" and tonumber(redis.call("HGET", KEYS[1], ARGV[3]) or "0") ~= tonumber(ARGV[4]) then
+    return -1
+end
+redis.call("HSET", KEYS[1], unpack(ARGV, 5))
+if tonumber(ARGV[2]) > 0 then
+    redis.call("PEXPIRE", KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+# grava somente os campos alterados, caso o registro não tenha sido alterado desde que foi obtido
+# KEYS[1]: registro - ARGV[1]: hash esperado, ARGV[2]: novo hash, ARGV[3]: expiração em ms (0 sem expiração), ARGV[4...]: campo, valor
+_SAVE_SCRIPT = """
+if redis.call("HGET", KEYS[1], "__hash__") ~= ARGV[1] then
+    return 0
+end
+redis.call("HSET", KEYS[1], "__hash__", ARGV[2], unpack(ARGV, 4))
+if tonumber(ARGV[3]) > 0 then
+    redis.call("PEXPIRE", KEYS[1], ARGV[3])
+end
+return 1
+"""
 
 
 class RedisConnect:
@@ -17,6 +58,18 @@ class RedisConnect:
     """
     @staticmethod
     def _connect(model: _model=None, use_model: bool=True, **kwargs) -> redis.Redis:
+        settings, db, is_testing = RedisConnect._get_connection_info(model, use_model, **kwargs)
+        try:
+            return RedisConnect._get_handler(settings, db, is_testing)
+        except RedisConnectConnectionFailedException as e:
+            if use_model:
+                raise RedisConnectConnectionFailedException(f"{getattr(model, "__name__", type(model).__name__)}: {e}") from None
+            raise
+
+
+    @staticmethod
+    def _get_connection_info(model: _model=None, use_model: bool=True, **kwargs) -> tuple[Settings, int, bool]:
+        # obtém as configurações, o banco de dados e se é um teste, a partir do modelo ou dos parâmetros
         db: int|str
         settings: Settings
         is_testing: bool
@@ -39,21 +92,215 @@ class RedisConnect:
 
             if isinstance(db, str):
                 db = settings.get_db(db)
+
+        return settings, db, is_testing
+
+
+    @staticmethod
+    def _get_pool_key(settings: Settings, db: int, testing: bool) -> tuple:
+        # todas as informações de conexão fazem parte da chave, então alterar Settings (set_config) cria um novo pool
+        return (id(settings), db, bool(testing), tuple(settings.redis_info.items()))
+
+
+    @staticmethod
+    def _get_stale_keys(pools: dict, key: tuple) -> list[tuple]:
+        # pools do mesmo Settings (ou de um Settings descartado com o mesmo id) criados com informações de conexão antigas
+        return [other for other in pools if other[:3] == key[:3] and other != key]
+
+
+    @staticmethod
+    def _get_handler(settings: Settings, db: int, testing: bool) -> redis.Redis:
+        key = RedisConnect._get_pool_key(settings, db, testing)
+        handler = _pools.get(key)
+        if handler is not None:
+            return handler
         
-        retry = settings.retry_on_timeout
-        tries = int(retry[1]) if isinstance(retry, list) else 1
-        for attempts in range(tries):
-            try:
-                connection = settings.redis_info
-                connection.update({"db": db})
-                _redis = fakeredis.FakeRedis(**connection) if is_testing else redis.Redis(**connection)
-                _redis.ping()
-                return _redis
-            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
-                if attempts < tries - 1:
-                    time.sleep(.5)
-                    continue
-                raise RedisConnectConnectionFailedException(f"{f"{model.__name__}: " if use_model else ""}Unable to connect to Redis database: {e.__str__()}")
+        with _pools_lock:
+            handler = _pools.get(key)
+            if handler is not None:
+                return handler
+
+            for stale in RedisConnect._get_stale_keys(_pools, key):
+                stale_handler = _pools.pop(stale)
+                stale_handler.close()
+                stale_handler.connection_pool.disconnect()
+
+            retry = settings.retry_on_timeout
+            tries = int(retry[1]) if isinstance(retry, list) else 1
+            for attempts in range(tries):
+                try:
+                    connection = settings.redis_info
+                    connection.update({"db": db})
+                    if testing:
+                        handler = fakeredis.FakeRedis(**connection)
+                    else:
+                        max_connections = connection.pop("max_connections")
+                        pool = redis.BlockingConnectionPool(
+                            max_connections=int(max_connections) if max_connections else 10,
+                            timeout=settings.blocking_timeout,
+                            **connection
+                        )
+                        handler = redis.Redis(connection_pool=pool)
+                    handler.ping() # valida a conexão somente ao criar o pool
+                    _pools[key] = handler
+                    return handler
+                except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
+                    if handler is not None:
+                        handler.close()
+                        handler = None
+                    if attempts < tries - 1:
+                        time.sleep(.5)
+                        continue
+                    raise RedisConnectConnectionFailedException(f"Unable to connect to Redis database: {e.__str__()}")
+
+
+    @staticmethod
+    def close_pools(settings: Settings=None):
+        """
+        Fecha e descarta os pools de conexão compartilhados
+
+        Params:
+
+            settings (Settings) - quando informado, fecha somente os pools criados a partir desta instância de Settings. Caso None, fecha todos (padrão None)
+
+        Examples:
+
+            RedisConnect.close_pools() # fecha todas as conexões abertas pelo RedisOKM
+
+            RedisConnect.close_pools(settings) # fecha somente as conexões de settings
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        RedisConnect._stop_caches(settings) # sem conexão, os caches deixariam de ser invalidados
+
+        with _pools_lock:
+            for key in list(_pools.keys()):
+                if settings is None or key[0] == id(settings):
+                    handler = _pools.pop(key)
+                    handler.close()
+                    handler.connection_pool.disconnect()
+
+
+    @staticmethod
+    def cache_stats(model: _model) -> dict|None:
+        """
+        Retorna as estatísticas do cache local do modelo (__cache__)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+        Examples:
+
+            class UserModel(RedisModel):
+                __cache__ = {"max_entries": 10000, "ttl": 60}
+                ...
+
+            stats = RedisConnect.cache_stats(UserModel) # {"entries": ..., "hits": ..., "misses": ..., "evictions": ..., "expirations": ..., "invalidations": ...}
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        cache = RedisConnect._get_cache(RedisConnect._get_instance(model))
+        return cache.stats if cache is not None else None
+
+
+    @staticmethod
+    def clear_cache(model: _model):
+        """
+        Descarta os registros do cache local do modelo (__cache__)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+        Examples:
+
+            RedisConnect.clear_cache(UserModel)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        cache = RedisConnect._get_cache(RedisConnect._get_instance(model))
+        if cache is not None:
+            cache.clear()
+
+
+    @staticmethod
+    def _get_cache(model: _model) -> RecordCache|None:
+        config = model.__cache__
+        if not config:
+            return None
+        
+        key = RedisConnect._get_cache_key(model)
+        cache = _caches.get(key)
+        if cache is not None:
+            return cache
+        
+        with _caches_lock:
+            RedisConnect._listen(model)
+            return _caches.setdefault(key, RecordCache(config["max_entries"], config["ttl"]))
+
+
+    @staticmethod
+    def _get_cache_key(model: _model) -> tuple:
+        return (id(model.__settings__), bool(getattr(model, "__testing__", False)), model.__db__, model.__tablename__)
+
+
+    @staticmethod
+    def _listen(model: _model):
+        # recebe as invalidações publicadas pelas escritas de outros processos
+        settings: Settings = model.__settings__
+        testing = bool(getattr(model, "__testing__", False))
+        key = (id(settings), testing)
+        if key in _listeners:
+            return
+        
+        def on_message(message: dict):
+            data = json.loads(RedisConnect._decode(message["data"]))
+            RedisConnect._invalidate(settings, testing, data["db"], data["names"])
+
+        def on_error(e: Exception, pubsub, thread):
+            # sem as mensagens de invalidação, os registros em cache podem ficar desatualizados
+            RedisConnect._stop_caches(settings)
+
+        pubsub = RedisConnect._connect(model).pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{RedisConnect._get_cache_channel(settings): on_message})
+        thread = pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=on_error)
+        _listeners[key] = (pubsub, thread)
+
+
+    @staticmethod
+    def _stop_caches(settings: Settings=None):
+        with _caches_lock:
+            for key in list(_listeners.keys()):
+                if settings is None or key[0] == id(settings):
+                    pubsub, thread = _listeners.pop(key)
+                    thread.stop()
+                    if thread is not threading.current_thread():
+                        thread.join(timeout=1)
+                    pubsub.close()
+
+            for key in list(_caches.keys()):
+                if settings is None or key[0] == id(settings):
+                    del _caches[key]
+
+
+    @staticmethod
+    def _get_cache_channel(settings: Settings) -> str:
+        return str(settings.separator).join([str(settings.prefix), "__okm__", "cache"])
+
+
+    @staticmethod
+    def _invalidate(settings: Settings, testing: bool, db: int, names: list[str]):
+        # remove os registros alterados dos caches locais
+        for key, cache in list(_caches.items()):
+            if key[:3] == (id(settings), bool(testing), db):
+                cache.invalidate(names)
+
+
+    @staticmethod
+    def _publish_invalidation(pipe: redis.client.Pipeline, settings: Settings, db: int, names: list[str]):
+        # avisa os outros processos (pub/sub) quais registros foram alterados
+        pipe.publish(RedisConnect._get_cache_channel(settings), json.dumps({"db": db, "names": names}))
 
 
     @staticmethod
@@ -69,6 +316,54 @@ class RedisConnect:
         return name
 
 
+    @staticmethod
+    def _get_meta_name(model: _model, kind: str, *parts: Any) -> str:
+        # chaves internas do RedisOKM (sequências, índices...) ficam fora do padrão "prefix:tablename:*"
+        settings = model.__settings__
+        sep = str(settings.separator)
+        name = sep.join([str(settings.prefix), "__okm__", kind, str(model.__tablename__), *[str(part) for part in parts]])
+        return name
+
+
+    @staticmethod
+    def _get_tables_name(settings: Settings) -> str:
+        # tabelas que possuem um conjunto de IDs no banco de dados (usado por RedisConnect.count)
+        return str(settings.separator).join([str(settings.prefix), "__okm__", "tables"])
+
+
+    @staticmethod
+    def _get_members_names(settings: Settings, tables: set) -> list[str]:
+        sep = str(settings.separator)
+        return [sep.join([str(settings.prefix), "__okm__", "members", RedisConnect._decode(table)]) for table in tables]
+
+
+    @staticmethod
+    def _next_id(model: _model, amount: int=1) -> int:
+        # reserva "amount" posições de forma atômica e retorna a primeira delas
+        redis_handler = RedisConnect._connect(model)
+        name = RedisConnect._get_meta_name(model, "autoid")
+        return redis_handler.incrby(name, amount) - amount
+
+
+    @staticmethod
+    def session() -> "Session":
+        """
+        Cria uma sessão (unidade de trabalho), que acumula as escritas e grava todas de uma só vez ao sair do bloco with, em uma única transação (MULTI/EXEC) por banco de dados.
+        Caso algum erro ocorra dentro do bloco ou ao validar as operações, nada é gravado
+
+        Examples:
+
+            with RedisConnect.session() as session:
+                session.add(OrderModel(...))
+                session.add_many([ItemModel(...), ItemModel(...)])
+                session.delete(CartModel, identify=0)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        from .session import Session # session.py depende de RedisConnect
+        return Session()
+
+
     @staticmethod
     def add(model: _model, exists_ok: bool=False):
         """
@@ -87,251 +382,1461 @@ class RedisConnect:
                 __idname__ = "id"
                 ...
 
-                
-            user = UserModel(...)
-            
-            RedisConnect.add(model=user) # registra um modelo
+                
+            user = UserModel(...)
+            
+            RedisConnect.add(model=user) # registra um modelo
+
+            RedisConnect.add(model=user, exists_ok=True) # atualiza um registro
+
+            RedisConnect.add(model=user) # gera um erro - "This id (0) already exists in the database!"
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+
+        """
+        RedisConnect.add_many([model], exists_ok=exists_ok)
+
+
+    @staticmethod
+    def add_many(models: list[_model], exists_ok: bool=False, chunk_size: int=None, atomic: bool=False):
+        """
+        Adiciona vários registros no banco de dados de uma só vez. Todos os modelos são validados antes de qualquer escrita e os registros são gravados em pipelines
+
+        Params:
+
+            models (list) - modelos que usam RedisModel (instanciados)
+
+            exists_ok (bool) - quando True, atualiza os registros que já existem. Se False, gera um erro caso algum registro já exista (padrão False)
+
+            chunk_size (int) - quantidade de registros gravados por pipeline. Caso None, usa batch_size de Settings (padrão None)
+
+            atomic (bool) - quando True, cada pipeline é executado dentro de uma transação (MULTI/EXEC) (padrão False)
+
+        Examples:
+
+            users = [UserModel(...), UserModel(...), ...]
+
+            RedisConnect.add_many(users) # registra todos os modelos
+
+            RedisConnect.add_many(users, exists_ok=True, chunk_size=1000, atomic=True)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        models = list(models)
+        RedisConnect._check_added(models)
+        if not models:
+            return
+        
+        set_ids = RedisConnect._reserve_ids(models)
+        references, writes = RedisConnect._prepare_many(models, exists_ok, set_ids)
+
+        # atualiza as referências das chaves estrangeiras antes de gravar os registros (uma referência sem registro é ignorada ao apagar)
+        RedisConnect._set_referenced(references, atomic)
+
+        chunk_size = int(chunk_size or models[0].__settings__.batch_size)
+        for i in range(0, len(writes), chunk_size):
+            groups = {}
+            for value in writes[i:i+chunk_size]:
+                handler = RedisConnect._connect(value[0])
+                groups.setdefault(id(handler), (handler, []))[1].append(value)
+
+            for handler, values in groups.values():
+                cached = [name for model, name, *_ in values if model.__cache__]
+                script = handler.register_script(_ADD_SCRIPT)
+                with handler.pipeline(transaction=atomic) as pipe:
+                    positions = []
+                    for value in values:
+                        positions.append(len(pipe))
+                        RedisConnect._queue_add(pipe, script, *value, exists_ok)
+                    if cached:
+                        RedisConnect._publish_invalidation(pipe, values[0][0].__settings__, values[0][0].__db__, cached)
+                    responses = pipe.execute()
+
+                if cached:
+                    RedisConnect._invalidate(values[0][0].__settings__, values[0][0].__testing__, values[0][0].__db__, cached)
+
+                conflicts = RedisConnect._set_written(values, [responses[pos] for pos in positions])
+                if conflicts:
+                    # o registro foi criado (ou alterado) por outro processo após a verificação: os índices e as referências voltam a refletir o registro gravado
+                    RedisConnect._restore_indexes(handler, [value for value, _ in conflicts])
+                    RedisConnect._restore_references(handler, [value for value, _ in conflicts])
+                    RedisConnect._raise_conflict(conflicts)
+
+
+    @staticmethod
+    def _set_written(values: list[tuple], responses: list) -> list[tuple]:
+        # os modelos gravados passam a rastrear as alterações (veja RedisConnect.save) e a ter a versão gravada
+        # retorna os registros que não foram gravados, com a resposta de _ADD_SCRIPT
+        conflicts = []
+        for value, resp in zip(values, responses):
+            if resp == 1:
+                value[0].__changes__ = ()
+                value[0].__signature__ = None
+                RedisConnect._set_version(value[0], value[2])
+            else:
+                conflicts.append((value, resp))
+        return conflicts
+
+
+    @staticmethod
+    def _raise_conflict(conflicts: list[tuple]):
+        for (model, _, content, *_), resp in conflicts:
+            if resp == -1:
+                RedisConnect._raise_version(model, content)
+
+        model = conflicts[0][0][0]
+        idname = model.__idname__
+        raise RedisConnectionAlreadyRegisteredException(f"{type(model).__name__}: This {idname} ({getattr(model, idname)}) already exists in the database!")
+
+
+    @staticmethod
+    def _raise_version(model: _model, content: dict):
+        idname = model.__idname__
+        expected = int(content[model.__version__]) - 1
+        raise RedisConnectConflictException(f"{type(model).__name__}: This record ({idname}: {getattr(model, idname)}) was changed by another client since version {expected} was read!")
+
+
+    @staticmethod
+    def _set_version(model: _model, content: dict):
+        # a versão gravada é atribuída direto no __slot__, sem ser rastreada como alteração
+        version = model.__version__
+        if version:
+            getattr(type(model), version).__set__(model, int(content[version]))
+
+
+    @staticmethod
+    def _check_versions(models: list[_model]):
+        # verifica, antes de gravar, se os registros versionados continuam na versão dos modelos (veja Session)
+        groups = {}
+        for model in models:
+            if model.__version__:
+                handler = RedisConnect._connect(model)
+                groups.setdefault(id(handler), (handler, []))[1].append(model)
+
+        for handler, values in groups.values():
+            with handler.pipeline(transaction=False) as pipe:
+                for model in values:
+                    pipe.hget(RedisConnect._get_name(model), model.__version__)
+                for model, current in zip(values, pipe.execute()):
+                    if int(current or 0) != getattr(model, model.__version__):
+                        RedisConnect._raise_version(model, {model.__version__: getattr(model, model.__version__) + 1})
+
+
+    @staticmethod
+    def _check_added(models: list[_model]):
+        for model in models:
+            if not model.__instancied__:
+                raise RedisConnectionModelInstanceException(f"{model.__name__}: The model must be instantiated to be added to the database!")
+            elif model.__partial__:
+                raise RedisConnectionModelInstanceException(f"{type(model).__name__}: Partial models (obtained with fields) cannot be added to the database!")
+
+
+    @staticmethod
+    def _reserve_ids(models: list[_model]) -> set[int]:
+        # reserva os IDs automáticos de cada modelo com uma única operação na sequência, retornando os modelos que receberam um ID (id(model))
+        set_ids = set()
+        for group in RedisConnect._get_pending(models).values():
+            pos = RedisConnect._next_id(group[0], len(group))
+            for i, model in enumerate(group):
+                RedisConnect._set_identify(model, pos + i)
+                set_ids.add(id(model))
+        return set_ids
+
+
+    @staticmethod
+    def _prepare_many(models: list[_model], exists_ok: bool, set_ids: set[int], created: set[str]=None, check_exists: bool=False) -> tuple[dict, list]:
+        # valida os registros antes de qualquer escrita e retorna as referências e os registros que serão gravados: (modelo, nome, conteúdo, expiração, valores indexados)
+        # verifica quais registros já existem antes de gravar as referências (o script de escrita verifica novamente, veja RedisConnect._restore_references)
+        # um único registro com ID definido e sem chaves estrangeiras é verificado somente pelo próprio script de escrita (exceto com check_exists)
+        names = set()
+        check_exists = not exists_ok and (check_exists or RedisConnect._check_exists(models, exists_ok, set_ids))
+        existing = RedisConnect._exists_many(models) if check_exists else [False] * len(models)
+        for model, exists in zip(models, existing):
+            name = RedisConnect._get_name(model)
+            if (exists or name in names) and not exists_ok:
+                if id(model) not in set_ids:
+                    idname = model.__idname__
+                    raise RedisConnectionAlreadyRegisteredException(f"{type(model).__name__}: This {idname} ({getattr(model, idname)}) already exists in the database!")
+                
+                # registros anteriores à sequência podem ocupar os próximos IDs (veja RedisConnect.seed_autoid)
+                while RedisConnect.exists(model) or name in names:
+                    RedisConnect._set_identify(model, RedisConnect._next_id(model))
+                    name = RedisConnect._get_name(model)
+            names.add(name)
+
+        references = RedisConnect._get_references(models, created)
+        contents = [RedisConnect._prepare(model) for model in models]
+
+        # valores indexados atuais, para remover o registro dos índices antigos
+        indexed = RedisConnect._get_indexed_many(models)
+        return references, [(*content, old) for content, old in zip(contents, indexed)]
+
+
+    @staticmethod
+    def _check_exists(models: list[_model], exists_ok: bool, set_ids: set[int]) -> bool:
+        return not exists_ok and (len(models) > 1 or bool(set_ids) or bool(models[0].__foreign_keys__))
+
+
+    @staticmethod
+    def _queue_add(pipe: redis.client.Pipeline, script: redis.commands.core.Script, model: _model, name: str, content: dict, expire: float|None, old: dict, exists_ok: bool):
+        # grava o registro (_ADD_SCRIPT), o seu ID no conjunto do modelo e os índices
+        identify = getattr(model, model.__idname__)
+        script(keys=[name], args=RedisConnect._get_add_args(content, expire, exists_ok, model.__version__), client=pipe)
+        pipe.sadd(RedisConnect._get_meta_name(model, "members"), str(identify))
+        pipe.sadd(RedisConnect._get_tables_name(model.__settings__), str(model.__tablename__))
+        RedisConnect._set_indexes(pipe, model, identify, content, old)
+
+
+    @staticmethod
+    def _get_add_args(content: dict, expire: float|None, exists_ok: bool, version: str=None) -> list:
+        # argumentos de _ADD_SCRIPT: sobrescrever, expiração em ms, atributo e versão esperada (a anterior à gravada) e o conteúdo do registro
+        args = [int(exists_ok), int(expire * 1000) if expire else 0, version or "", int(content[version]) - 1 if version else 0]
+        for field, value in content.items():
+            args.extend((field, value))
+        return args
+
+
+    @staticmethod
+    def _restore_indexes(redis_handler: redis.Redis, conflicts: list[tuple]):
+        # desfaz os índices dos registros que não foram gravados, usando os valores do registro existente
+        conflicts = [(model, name, content) for model, name, content, *_ in conflicts if model.__indexes__ or model.__ranges__]
+        if not conflicts:
+            return
+
+        with redis_handler.pipeline(transaction=False) as pipe:
+            for model, name, _ in conflicts:
+                pipe.hmget(name, model.__indexes__ + model.__ranges__)
+            responses = pipe.execute()
+
+        with redis_handler.pipeline(transaction=False) as pipe:
+            for (model, _, content), values in zip(conflicts, responses):
+                current = RedisConnect._get_indexed(model.__indexes__ + model.__ranges__, [RedisConnect._decode(value) for value in values])
+                RedisConnect._set_indexes(pipe, model, getattr(model, model.__idname__), current, content)
+            pipe.execute()
+
+
+    @staticmethod
+    def _restore_references(redis_handler: redis.Redis, conflicts: list[tuple]):
+        # desfaz as referências dos registros que não foram gravados, usando as chaves estrangeiras do registro existente
+        conflicts = [(model, name) for model, name, *_ in conflicts if model.__foreign_keys__]
+        if not conflicts:
+            return
+
+        with redis_handler.pipeline(transaction=False) as pipe:
+            for model, name in conflicts:
+                pipe.hmget(name, list(model.__foreign_keys__))
+            responses = pipe.execute()
+
+        RedisConnect._set_referenced(RedisConnect._get_restored(conflicts, responses))
+
+
+    @staticmethod
+    def _get_restored(conflicts: list[tuple], fk_values: list[list]) -> dict[str, tuple]:
+        # referências dos registros não gravados (mesmo formato de _set_references): a referência gravada antes do script é removida
+        # e a referência ao registro referenciado pelo registro existente é gravada novamente
+        references = {}
+        for (model, name), values in zip(conflicts, fk_values):
+            for (key, value), stored in zip(model.__foreign_keys__.items(), values):
+                fk_model = value["model"]
+                field = RedisConnect._get_ref_field(model, name, key)
+                stored = RedisConnect._decode(stored)
+                if stored != str(value["id"]):
+                    references.setdefault(RedisConnect._get_meta_name(fk_model, "refs", value["id"]), (fk_model, {}))[1][field] = None
+                if stored is not None:
+                    references.setdefault(RedisConnect._get_meta_name(fk_model, "refs", stored), (fk_model, {}))[1][field] = RedisConnect._get_reference(model, name, key)
+        return references
+
+
+    @staticmethod
+    def save(model: _model, partial: bool=False):
+        """
+        Grava um modelo, adicionando ou atualizando o seu registro
+
+        Params:
+
+            model - modelo que usa RedisModel (instanciado)
+
+            partial (bool) - quando True, grava somente os atributos alterados desde que o registro foi obtido (ou gravado), atualizando o hash de integridade de forma atômica (script Lua). Caso o registro tenha sido alterado por outro processo nesse intervalo,
+            os atributos alterados são aplicados sobre o registro atual (veja RedisConnect.update) e o modelo recebe os valores gravados. Caso o modelo não tenha sido obtido do Redis, ele é gravado por completo (padrão False)
+
+        Examples:
+
+            user = RedisConnect.get_by_id(UserModel, 0)
+            user.age = 19
+
+            RedisConnect.save(user, partial=True) # grava somente "age" (e o novo hash do registro)
+
+            RedisConnect.save(UserModel(...)) # o mesmo que RedisConnect.add(..., exists_ok=True)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if not model.__instancied__:
+            raise RedisConnectionModelInstanceException(f"{model.__name__}: The model must be instantiated to be added to the database!")
+
+        update = RedisConnect._get_update(model) if partial else None
+        if update is None:
+            RedisConnect.add(model, exists_ok=True)
+            return
+
+        name, content, old, args = update
+        if len(args) > 3:
+            redis_handler = RedisConnect._connect(model)
+            if not redis_handler.register_script(_SAVE_SCRIPT)(keys=[name], args=args):
+                # o registro foi alterado (ou apagado) desde que foi obtido: somente os atributos alterados são aplicados sobre o registro atual
+                values = RedisConnect._get_merged(model, content)
+                current = RedisConnect.update(type(model), getattr(model, model.__idname__), lambda current: RedisConnect._set_values(current, values))
+                RedisConnect._refresh(model, current)
+                return
+
+            RedisConnect._set_updated(redis_handler, model, getattr(model, model.__idname__), name, content, old, list(model.__changes__))
+            RedisConnect._set_version(model, content)
+            model.__signature__ = None
+
+        model.__changes__ = ()
+
+
+    @staticmethod
+    def _get_merged(model: _model, content: dict) -> dict:
+        # atributos alterados que serão aplicados sobre o registro atual. Com __version__, o conflito é levantado (o registro mudou desde a versão lida)
+        if model.__version__:
+            RedisConnect._raise_version(model, content)
+        return {attr: getattr(model, attr) for attr in model.__changes__}
+
+
+    @staticmethod
+    def _set_values(model: _model, values: dict):
+        for attr, value in values.items():
+            setattr(model, attr, value)
+
+
+    @staticmethod
+    def _refresh(model: _model, current: _model):
+        # o modelo passa a ter os valores gravados (incluindo os alterados por outros clientes) e a rastrear as alterações a partir deles
+        for attr in model.__codec__.fields:
+            object.__setattr__(model, attr, getattr(current, attr))
+        if model.__codec__.foreign_keys:
+            model.__foreign_keys__ = current.__foreign_keys__
+        model.__changes__ = ()
+        model.__signature__ = current.__signature__
+
+
+    @staticmethod
+    def update(model: _model, identify: Any, function: Callable[[_model], Any], retries: int=5) -> _model:
+        """
+        Atualiza um registro com controle de concorrência otimista: obtém o registro, aplica function e grava somente os atributos alterados,
+        caso o registro não tenha sido alterado desde a leitura. Caso tenha sido, obtém o registro novamente e repete (até retries vezes)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            function (Callable) - função que recebe o modelo obtido e altera os seus atributos (pode ser executada mais de uma vez)
+
+            retries (int) - quantidade de novas tentativas em caso de conflito, antes de levantar RedisConnectConflictException (padrão 5)
+
+        Examples:
+
+            def withdraw(account):
+                account.balance -= 10
+
+            account = RedisConnect.update(AccountModel, 0, withdraw) # retorna o modelo gravado
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        cls = model if callable(model) else type(model)
+        for _ in range(retries + 1):
+            current = RedisConnect.get_by_id(cls, identify)
+            update = RedisConnect._apply_update(cls, identify, current, function)
+            if update is None:
+                return current
+
+            name, content, old, args = update
+            redis_handler = RedisConnect._connect(current)
+            if redis_handler.register_script(_SAVE_SCRIPT)(keys=[name], args=args):
+                RedisConnect._set_updated(redis_handler, current, identify, name, content, old, list(current.__changes__))
+                RedisConnect._set_version(current, content)
+                current.__changes__ = ()
+                current.__signature__ = None
+                return current
+
+            # o registro em cache pode ser o registro desatualizado
+            if current.__cache__:
+                RedisConnect._invalidate(current.__settings__, current.__testing__, current.__db__, [name])
+
+        raise RedisConnectConflictException(f"{cls.__name__}: This record ({cls.__idname__}: {identify}) was changed by another client in all {retries + 1} attempts!")
+
+
+    @staticmethod
+    def _apply_update(cls: type, identify: Any, current: _model|None, function: Callable[[_model], Any]) -> tuple|None:
+        # aplica function no registro obtido e retorna o que será gravado (veja RedisConnect._get_update), ou None caso nada tenha mudado
+        if current is None:
+            raise RedisConnectNoRecordsException(f"{cls.__name__}: This {cls.__idname__} ({identify}) does not exist in the database!")
+        elif not current.__status__:
+            raise GetterCorruptionException(f"{cls.__name__}: The information in this record ({cls.__idname__}: {identify}) is corrupt!")
+
+        function(current)
+        update = RedisConnect._get_update(current)
+        if update is None:
+            raise RedisConnectTypeValueException(f"{cls.__name__}: The function cannot change the {cls.__idname__} of the record!")
+        elif len(update[3]) <= 3:
+            current.__changes__ = ()
+            return None
+        return update
+
+
+    @staticmethod
+    def _set_updated(redis_handler: redis.Redis, model: _model, identify: Any, name: str, content: dict, old: dict, fields: list[str]):
+        # atualiza os índices e o cache de um registro gravado parcialmente
+        cached = [name] if model.__cache__ else []
+        if not cached and not RedisConnect._has_indexed(model, fields):
+            return
+
+        with redis_handler.pipeline(transaction=False) as pipe:
+            RedisConnect._set_indexes(pipe, model, identify, content, old)
+            if cached:
+                RedisConnect._publish_invalidation(pipe, model.__settings__, model.__db__, cached)
+            pipe.execute()
+
+        if cached:
+            RedisConnect._invalidate(model.__settings__, model.__testing__, model.__db__, cached)
+
+
+    @staticmethod
+    def incr(model: _model, identify: Any, field: str, amount: int=1) -> int:
+        """
+        Incrementa um atributo int de um registro de forma atômica, mantendo o hash de integridade válido
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            field (str) - nome do atributo (int) que será incrementado
+
+            amount (int) - valor somado ao atributo, podendo ser negativo (padrão 1)
+
+        Examples:
+
+            class ProductModel(RedisModel):
+                ...
+                pid: int
+                stock: int
+
+            RedisConnect.incr(ProductModel, 0, "stock", -1) # retorna o novo valor de "stock"
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return RedisConnect._incr(model, identify, field, amount, int)
+
+
+    @staticmethod
+    def incr_float(model: _model, identify: Any, field: str, amount: float=1.0) -> float:
+        """
+        Incrementa um atributo float de um registro de forma atômica, mantendo o hash de integridade válido (veja RedisConnect.incr)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            field (str) - nome do atributo (float) que será incrementado
+
+            amount (float) - valor somado ao atributo, podendo ser negativo (padrão 1.0)
+
+        Examples:
+
+            RedisConnect.incr_float(AccountModel, 0, "balance", 10.5)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return RedisConnect._incr(model, identify, field, amount, float)
+
+
+    @staticmethod
+    def _incr(model: _model, identify: Any, field: str, amount: int|float, typ: type) -> int|float:
+        model = RedisConnect._get_instance(model if callable(model) else type(model))
+        RedisConnect._check_incr(model, field, amount, typ)
+
+        setattr(model, model.__idname__, identify)
+        name = RedisConnect._get_name(model)
+        redis_handler = RedisConnect._connect(model)
+        script = redis_handler.register_script(_SAVE_SCRIPT)
+
+        # o script só grava se o registro não mudou desde a leitura; caso contrário, lê e tenta novamente
+        while True:
+            value, content, old, args = RedisConnect._get_increment(model, identify, field, amount, redis_handler.hgetall(name))
+            if script(keys=[name], args=args):
+                break
+
+        RedisConnect._set_updated(redis_handler, model, identify, name, content, old, [field])
+        return value
+
+
+    @staticmethod
+    def _check_incr(model: _model, field: str, amount: int|float, typ: type):
+        # somente atributos int (incr) ou float (incr_float), exceto o ID, podem ser incrementados
+        cls_name = type(model).__name__
+        field_type = model.__codec__.types.get(field)
+        if field_type is not typ or field == model.__idname__:
+            raise RedisConnectTypeValueException(f'{cls_name}: Only {typ.__name__} attributes (except {model.__idname__}) can be incremented. {field}: {getattr(field_type, "__name__", field_type)}')
+        elif not isinstance(amount, (int, float) if typ is float else int) or isinstance(amount, bool):
+            raise RedisConnectTypeValueException(f"{cls_name}: The amount must be {typ.__name__}. amount: {amount} ({type(amount).__name__})")
+
+
+    @staticmethod
+    def _get_increment(model: _model, identify: Any, field: str, amount: int|float, resp: dict) -> tuple:
+        # retorna (novo valor, conteúdo, conteúdo anterior, argumentos do script) do registro incrementado
+        if not resp:
+            raise RedisConnectNoRecordsException(f"{type(model).__name__}: This {model.__idname__} ({identify}) does not exist in the database!")
+
+        codec = model.__codec__
+        values = {RedisConnect._decode(k): RedisConnect._decode(v) for k, v in resp.items()}
+        signature = values.pop("__hash__", "error")
+        values.pop("__referenced__", None)
+
+        key = codec.key(values.get(codec.idname))
+        if not codec.verify(key, values, signature):
+            raise GetterCorruptionException(f"{type(model).__name__}: The information in this record ({model.__idname__}: {identify}) is corrupt!")
+
+        value = codec.types[field](values[field]) + amount
+        content = codec.order(values)
+        content[field] = str(value)
+        args = [signature, None, 0, field, content[field]]
+
+        version = model.__version__
+        if version:
+            content[version] = str(int(values.get(version, 0)) + 1)
+            content = codec.order(content)
+            args.extend([version, content[version]])
+        args[1] = codec.sign(key, content)
+        return value, content, values, args
+
+
+    @staticmethod
+    def _get_update(model: _model) -> tuple|None:
+        # retorna o que será gravado por save(..., partial=True): (nome, conteúdo, conteúdo anterior, argumentos do script)
+        # None indica que o registro deve ser gravado por completo
+        changes = model.__changes__
+        if changes is None or model.__idname__ in changes or model.__key__ == "__await_identify__":
+            return None
+
+        codec = model.__codec__
+        content = codec.encode(model)
+        old = dict(content)
+        for attr, value in changes.items():
+            old[attr] = codec.encode_value(attr, value)
+
+        expire = RedisConnect._get_expire(model)
+        version = model.__version__
+        if version:
+            content[version] = old[version] # a versão é controlada pelo RedisOKM
+        fields = [attr for attr in changes if content[attr] != old[attr]]
+        if version and fields:
+            content[version] = str(int(old[version]) + 1)
+            fields.append(version)
+
+        # o hash esperado é o lido do Redis: registros de versões anteriores têm o hash na ordem em que os campos foram recebidos (veja ModelCodec.verify)
+        expected = model.__signature__ or codec.sign(model.__key__, old)
+        args = [expected, codec.sign(model.__key__, content), int(expire * 1000) if expire else 0]
+        for attr in fields:
+            args.extend([attr, content[attr]])
+
+        return RedisConnect._get_name(model), content, old, args
+
+
+    @staticmethod
+    def _has_indexed(model: _model, fields: list[str]) -> bool:
+        # informa se algum dos atributos possui índice (__indexes__ ou __ranges__)
+        return any(attr in model.__indexes__ or attr in model.__ranges__ for attr in fields)
+
+
+    @staticmethod
+    def _set_identify(model: _model, pos: int):
+        idname = model.__idname__
+        algorithm = getattr(hashlib, model.__settings__.hash_algorithm)
+        identify = algorithm(str(pos).encode("utf-8")).hexdigest() if model.__hashid__ else pos
+
+        setattr(model, idname, identify)
+
+
+    @staticmethod
+    def _get_pending(models: list[_model]) -> dict[type, list]:
+        # modelos que aguardam um ID automático, agrupados por tipo
+        pending: dict[type, list] = {}
+        for model in models:
+            if model.__autoid__ is True and getattr(model, model.__idname__) == "__await_autoid__":
+                pending.setdefault(type(model), []).append(model)
+        return pending
+
+
+    @staticmethod
+    def _prepare(model: _model) -> tuple:
+        # retorna o que será gravado: (modelo, nome, conteúdo, expiração)
+        content = RedisConnect._serialize(model)
+        return model, RedisConnect._get_name(model), content, RedisConnect._get_expire(model)
+
+
+    @staticmethod
+    def _get_expire(model: _model) -> float|None:
+        # verifica se tem expiração
+        expire = getattr(model, "__expire__")
+        if expire:
+            try:
+                expire = float(expire)
+            except ValueError:
+                raise RedisConnectInvalidExpireException(f'{type(model).__name__}: expire must be convertible to float! expire: "{expire}"')
+
+        return expire
+
+
+    @staticmethod
+    def _exists_many(models: list[_model]) -> list[bool]:
+        # verifica a existência de vários registros, usando um pipeline por conexão
+        groups = {}
+        for i, model in enumerate(models):
+            handler = RedisConnect._connect(model)
+            groups.setdefault(id(handler), (handler, []))[1].append(i)
+
+        response = [False] * len(models)
+        for handler, indexes in groups.values():
+            with handler.pipeline(transaction=False) as pipe:
+                for i in indexes:
+                    pipe.exists(RedisConnect._get_name(models[i]))
+                for i, exists in zip(indexes, pipe.execute()):
+                    response[i] = exists == 1
+
+        return response
+
+
+    @staticmethod
+    def _get_indexed_many(models: list[_model]) -> list[dict]:
+        # obtém os valores atuais dos atributos indexados de cada registro
+        groups = {}
+        for i, model in enumerate(models):
+            if model.__indexes__:
+                handler = RedisConnect._connect(model)
+                groups.setdefault(id(handler), (handler, []))[1].append(i)
+
+        response = [{} for _ in models]
+        for handler, indexes in groups.values():
+            with handler.pipeline(transaction=False) as pipe:
+                for i in indexes:
+                    pipe.hmget(RedisConnect._get_name(models[i]), models[i].__indexes__)
+                for i, values in zip(indexes, pipe.execute()):
+                    response[i] = RedisConnect._get_indexed(models[i].__indexes__, values)
+
+        return response
+
+
+    @staticmethod
+    def _get_indexed(fields: list[str], values: list) -> dict:
+        # relaciona os atributos com os valores obtidos via HMGET, ignorando os vazios
+        return {field: value for field, value in zip(fields, values) if value is not None}
+
+
+    @staticmethod
+    def _set_indexes(pipe: redis.client.Pipeline, model: _model, identify: Any, content: dict|None, old: dict):
+        # mantém os índices secundários (__indexes__) em sincronia com o registro
+        for field in model.__indexes__:
+            old_value = old.get(field)
+            new_value = content.get(field) if content else None
+            if old_value == new_value:
+                continue
+
+            if old_value is not None:
+                pipe.srem(RedisConnect._get_meta_name(model, "index", field, old_value), str(identify))
+            if new_value is not None:
+                pipe.sadd(RedisConnect._get_meta_name(model, "index", field, new_value), str(identify))
+
+        # índices de intervalo (__ranges__) usam a pontuação do ZSET, sobrescrita a cada escrita
+        for field in model.__ranges__:
+            name = RedisConnect._get_meta_name(model, "range", field)
+            if content and content.get(field) is not None:
+                pipe.zadd(name, {str(identify): float(content[field])})
+            else:
+                pipe.zrem(name, str(identify))
+
+
+    @staticmethod
+    def _get_references(models: list[_model], created: set[str]=None) -> dict[str, tuple]:
+        # valida as chaves estrangeiras e retorna as referências que serão gravadas (e removidas) em cada registro referenciado
+        # (created: registros que serão gravados junto com os modelos, veja Session)
+        targets = RedisConnect._get_fk_targets(models)
+        children = [model for model in models if model.__foreign_keys__]
+
+        # verifica se os registros referenciados existem e obtém as chaves estrangeiras atuais dos registros gravados
+        groups = {}
+        for fk_name, fk_model in targets.items():
+            handler = RedisConnect._connect(fk_model)
+            groups.setdefault(id(handler), (handler, [], []))[1].append(fk_name)
+        for model in children:
+            handler = RedisConnect._connect(model)
+            groups.setdefault(id(handler), (handler, [], []))[2].append(model)
+
+        existing = {}
+        previous = {}
+        for handler, fk_names, models_fk in groups.values():
+            with handler.pipeline(transaction=False) as pipe:
+                for fk_name in fk_names:
+                    pipe.exists(fk_name)
+                for model in models_fk:
+                    pipe.hmget(RedisConnect._get_name(model), list(model.__foreign_keys__))
+                responses = pipe.execute()
+
+            existing.update(zip(fk_names, responses))
+            previous.update((id(model), values) for model, values in zip(models_fk, responses[len(fk_names):]))
+
+        existing.update((name, 1) for name in created or () if name in existing)
+        return RedisConnect._set_references(models, existing, previous)
+
+
+    @staticmethod
+    def _get_fk_targets(models: list[_model]) -> dict[str, _model]:
+        # valida as conexões das chaves estrangeiras e retorna os registros referenciados (nome: modelo)
+        targets = {}
+        for model in models:
+            fks: dict = model.__foreign_keys__
+            model_name = type(model).__name__
+            _settings: Settings = model.__settings__
+            for key, value in fks.items():
+                fk_model = value["model"](instance=False, identify=value["id"])
+                fk_settings: Settings = fk_model.__settings__
+
+                differences = [
+                    "HOST" if fk_settings.host != _settings.host else "", 
+                    "PORT" if fk_settings.port != _settings.port else "",
+                    "PASSWORD" if fk_settings.password != _settings.password else ""
+                ] 
+                differences = [d for d in differences if d]
+                if differences:
+                    raise RedisConnectForeignKeyException(f"{model_name}: The connection information (HOST, PORT and PASSWORD) of the reference model ({type(fk_model).__name__}) and the referenced model ({model_name}) must be the same. Differences: {", ".join(differences)}")
+                
+                targets.setdefault(RedisConnect._get_name(fk_model), fk_model)
+
+        return targets
+
+
+    @staticmethod
+    def _set_references(models: list[_model], existing: dict[str, int], previous: dict[int, list]) -> dict[str, tuple]:
+        # referências por registro referenciado: {nome: (modelo referenciado, {campo: referência, ou None para removê-la})}
+        references = {}
+        for model in models:
+            name = RedisConnect._get_name(model)
+            old_ids = previous.get(id(model)) or []
+            for i, (key, value) in enumerate(model.__foreign_keys__.items()):
+                fk_id = value["id"]
+                fk_model = value["model"](instance=False, identify=fk_id)
+
+                eid = fk_id if isinstance(fk_id, int) else f'"{fk_id}"'
+                if existing[RedisConnect._get_name(fk_model)] != 1:
+                    raise RedisConnectForeignKeyException(f'{type(model).__name__}: Foreign key "{key}" ({value["model"].__name__}) with ID {eid} has no record!')
+
+                field = RedisConnect._get_ref_field(model, name, key)
+                references.setdefault(RedisConnect._get_meta_name(fk_model, "refs", fk_id), (fk_model, {}))[1][field] = RedisConnect._get_reference(model, name, key)
+
+                # o registro deixou de referenciar o registro anterior
+                old_id = RedisConnect._decode(old_ids[i]) if i < len(old_ids) else None
+                if old_id is not None and old_id != str(fk_id):
+                    references.setdefault(RedisConnect._get_meta_name(fk_model, "refs", old_id), (fk_model, {}))[1].setdefault(field, None)
+
+        return references
+
+
+    @staticmethod
+    def _get_unreferenced(model: _model, names: list[str], fk_values: list[list]) -> dict[str, tuple]:
+        # referências removidas dos registros referenciados pelos registros apagados (mesmo formato de _set_references)
+        references = {}
+        for name, values in zip(names, fk_values):
+            for (key, value), fk_id in zip(model.__foreign_keys__.items(), values):
+                if fk_id is not None:
+                    fk_model = value["model"]
+                    refs_name = RedisConnect._get_meta_name(fk_model, "refs", RedisConnect._decode(fk_id))
+                    references.setdefault(refs_name, (fk_model, {}))[1][RedisConnect._get_ref_field(model, name, key)] = None
+        return references
+
+
+    @staticmethod
+    def _get_reference(model: _model, name: str, key: str) -> str:
+        # valor da referência gravado no registro referenciado
+        reference = {"key": key, "name": name, "action": model.__action__[key], "db": model.__db__, "testing": model.__testing__, "model": type(model).__name__, "table": model.__tablename__, "idname": model.__idname__, "id": getattr(model, model.__idname__)}
+        return json.dumps(reference)
+
+
+    @staticmethod
+    def _get_ref_field(model: _model, name: str, key: str) -> str:
+        # campo da referência: registro que referencia e o atributo da chave estrangeira
+        return f"{name}{model.__settings__.separator}{key}"
+
+
+    @staticmethod
+    def _set_referenced(references: dict[str, tuple], atomic: bool=False):
+        # grava (HSET) e remove (HDEL) as referências, com um pipeline por conexão
+        groups = {}
+        for refs_name, (fk_model, fields) in references.items():
+            handler = RedisConnect._connect(fk_model)
+            groups.setdefault(id(handler), (handler, []))[1].append((refs_name, fields))
+
+        for handler, values in groups.values():
+            with handler.pipeline(transaction=atomic) as pipe:
+                for refs_name, fields in values:
+                    RedisConnect._queue_referenced(pipe, refs_name, fields)
+                pipe.execute()
+
+
+    @staticmethod
+    def _queue_referenced(pipe: redis.client.Pipeline, refs_name: str, fields: dict[str, str|None]):
+        added = {field: value for field, value in fields.items() if value is not None}
+        removed = [field for field, value in fields.items() if value is None]
+        if added:
+            pipe.hset(refs_name, mapping=added)
+        if removed:
+            pipe.hdel(refs_name, *removed)
+
+
+    @staticmethod
+    def _serialize(model: _model) -> dict:
+        # converte o modelo no conteúdo do registro (codificação compilada do modelo), incluindo o hash de integridade
+        codec = model.__codec__
+        content = codec.encode(model)
+        version = model.__version__
+        if version:
+            content[version] = str(getattr(model, version) + 1) # a versão só é atribuída ao modelo após a gravação
+        model.__key__ = codec.key(getattr(model, model.__idname__))
+        content["__hash__"] = codec.sign(model.__key__, content)
+
+        return content
+
+
+    @staticmethod
+    def exists(model: _model, identify: Any=None) -> bool:
+        """
+        Verifica se um modelo já existe no banco de dados
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro que será verificado. Caso o modelo esteja instanciado, não é obrigatório (padrão None)
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            user = UserModel(...)
+
+            exists = RedisConnect.exists(model=user) # retorna True ou False
+
+            exists = RedisConnect.exists(model=UserModel, identify=0) # retorna True ou False
+        
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if not model.__instancied__ and identify is None:
+            raise RedisConnectNoIdentifierException(f"{model.__name__}: Use an instance of the model or provide an identifier.")
+
+        if model.__instancied__ and identify is None:
+            identify = getattr(model, model.__idname__)
+
+        if callable(model):
+            model = model(instance=False, identify=identify)
+
+        name = RedisConnect._get_name(model)
+        cache = RedisConnect._get_cache(model)
+        if cache is not None and cache.get(name) is not None:
+            return True
+
+        redis_handler = RedisConnect._connect(model)
+        return redis_handler.exists(name) == 1
+    
+
+    @staticmethod 
+    def get(model: _model, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> Getter:
+        """
+        Obtém dados do banco de dados baseado em modelos
+
+        Params:
+
+            model - modelo que usa RedisModel
+            fields (list) - obtém somente estes atributos (HMGET), retornando modelos parciais, sem verificação de integridade (padrão None)
+            _set_fk (bool) - indica se é necessário definir chave estrangeira (uso interno)
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            
+            models = RedisConnect.get(UserModel) # o retorno pode ser None, uma instância do modelo ou Getter (grupo de modelos)
+
+            names = RedisConnect.get(UserModel, fields=["name"]) # somente o ID e "name" de cada registro
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+
+        return Getter(list(RedisConnect.iter(model, on_corrupt=on_corrupt, fields=fields, _set_fk=_set_fk)))
+
+
+    @staticmethod
+    def iter(model: _model, batch_size: int=None, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> Iterator[_model]:
+        """
+        Percorre os registros de um modelo sob demanda, mantendo em memória somente um lote por vez
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            batch_size (int) - quantidade de registros obtidos por pipeline. Caso None, usa batch_size de Settings (padrão None)
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            fields (list) - obtém somente estes atributos (HMGET), retornando modelos parciais, sem verificação de integridade (padrão None)
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            for user in RedisConnect.iter(UserModel, batch_size=1000):
+                export(user)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        if callable(model):
+            model = RedisConnect._get_instance(model)
+
+        on_corrupt = RedisConnect._get_on_corrupt(model, on_corrupt)
+        projection = RedisConnect._get_projection(model, fields)
+        
+        settings: Settings = model.__settings__
+        scan_count = int(settings.scan_count)
+        batch_size = int(batch_size or settings.batch_size)
+        redis_handler = RedisConnect._connect(model)
+
+        def _iter():
+            for names in RedisConnect._scan_members(redis_handler, model, scan_count):
+                # obtém os registros de cada página do SSCAN em lotes, usando um único pipeline por lote
+                for i in range(0, len(names), batch_size):
+                    batch = names[i:i+batch_size]
+                    with redis_handler.pipeline(transaction=False) as pipe:
+                        for name in batch:
+                            if projection:
+                                pipe.hmget(name, projection)
+                            else:
+                                pipe.hgetall(name)
+                        responses = pipe.execute()
+
+                    if projection:
+                        responses = [RedisConnect._project(projection, resp) for resp in responses]
+                    missing = RedisConnect._get_missing(model, batch, responses)
+                    if missing:
+                        redis_handler.srem(RedisConnect._get_meta_name(model, "members"), *missing)
+                    yield from RedisConnect._hydrate_many(model, responses, on_corrupt, _set_fk, projection)
+
+        return _iter()
+
+
+    @staticmethod
+    def _scan_members(redis_handler: redis.Redis, model: _model, count: int) -> Iterator[list[str]]:
+        # percorre o conjunto de IDs do modelo (SSCAN), retornando os nomes dos registros de cada página
+        members = RedisConnect._get_meta_name(model, "members")
+        cursor = 0
+        while True:
+            cursor, identifiers = redis_handler.sscan(members, cursor, count=count)
+            yield RedisConnect._get_member_names(model, identifiers)
+            if cursor == 0:
+                break
+
+
+    @staticmethod
+    def _get_member_names(model: _model, identifiers: list) -> list[str]:
+        prefix = RedisConnect._get_name(model, True)[:-1]
+        return [prefix + RedisConnect._decode(identify) for identify in identifiers]
+
+
+    @staticmethod
+    def _get_missing(model: _model, names: list[str], responses: list[dict]) -> list[str]:
+        # IDs do conjunto cujos registros não existem mais (registros que expiraram ou apagados em cascata por outro modelo)
+        prefix = RedisConnect._get_name(model, True)[:-1]
+        return [name[len(prefix):] for name, resp in zip(names, responses) if not resp]
+
+
+    @staticmethod
+    def page(model: _model, cursor: str=None, limit: int=100, reference: str=None, desc: bool=False, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default") -> tuple[Getter, str|None]:
+        """
+        Obtém uma página de registros e o cursor da próxima página, buscando somente os registros da página
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            cursor (str) - cursor retornado pela página anterior. Caso None, obtém a primeira página (padrão None)
+
+            limit (int) - quantidade de registros por página (padrão 100)
+
+            reference (str) - atributo declarado em __ranges__ usado para ordenar as páginas. Caso None, as páginas seguem a ordem do SCAN (padrão None)
+
+            desc (bool) - ordena do maior para o menor, quando reference é informado (padrão False)
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            users, cursor = RedisConnect.page(UserModel, limit=50) # primeira página
+
+            while cursor is not None:
+                users, cursor = RedisConnect.page(UserModel, cursor=cursor, limit=50) # próximas páginas
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        cls_name = type(model).__name__
+        on_corrupt = RedisConnect._get_on_corrupt(model, on_corrupt)
+        kind = "range" if reference is not None else "scan"
+        redis_handler = RedisConnect._connect(model)
+
+        position = 0
+        offset = 0
+        if cursor is not None:
+            parts = str(cursor).split(":")
+            if parts[0] != kind or not parts[-1].isdigit() or (kind == "range" and ":".join(parts[1:-1]) != reference) or (kind == "scan" and (len(parts) > 3 or not parts[1].isdigit())):
+                raise RedisConnectCursorException(f'{cls_name}: Invalid cursor for this page! cursor: "{cursor}"')
+            position = int(parts[1]) if kind == "scan" else int(parts[-1])
+            offset = int(parts[2]) if kind == "scan" and len(parts) == 3 else 0
+
+        if reference is not None:
+            if reference not in model.__ranges__:
+                raise RedisConnectIndexException(f'{cls_name}: The attribute "{reference}" is not range indexed! Add it to __ranges__.')
+            
+            # página a partir da posição no índice de intervalo
+            name = RedisConnect._get_meta_name(model, "range", reference)
+            identifiers = redis_handler.zrange(name, position, position + limit - 1, desc=desc)
+            models = RedisConnect._get_many_by_id(model, identifiers, on_corrupt)
+            position += len(identifiers)
+            next_cursor = f"range:{reference}:{position}" if len(identifiers) == limit else None
+            return Getter(models), next_cursor
+
+        # página a partir do cursor do SSCAN no conjunto de IDs do modelo. O Redis ignora COUNT em conjuntos pequenos (intset/listpack) e retorna todos os IDs de uma vez,
+        # então a página é cortada em limit e o cursor guarda quantos IDs da resposta já foram retornados (offset)
+        members = RedisConnect._get_meta_name(model, "members")
+        identifiers = []
+        next_cursor = None
+        while True:
+            next_position, response = redis_handler.sscan(members, position, count=limit)
+            response = response[offset:]
+            missing = limit - len(identifiers)
+            if len(response) > missing:
+                identifiers.extend(response[:missing])
+                next_cursor = f"scan:{position}:{offset + missing}"
+                break
+
+            identifiers.extend(response)
+            position, offset = next_position, 0
+            if position == 0:
+                break
+            elif len(identifiers) == limit:
+                next_cursor = f"scan:{position}"
+                break
+
+        models = RedisConnect._get_many_by_name(model, RedisConnect._get_member_names(model, identifiers), on_corrupt)
+        return Getter(models), next_cursor
+
+
+    @staticmethod
+    def get_by_id(model: _model, identify: Any, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> _model|None:
+        """
+        Obtém um único registro pelo ID, sem percorrer a tabela
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any) - identificador do registro
+
+            on_corrupt (str) - o que fazer caso o registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            fields (list) - obtém somente estes atributos (HMGET), retornando um modelo parcial, sem verificação de integridade (padrão None)
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            user = RedisConnect.get_by_id(UserModel, 0) # retorna o modelo ou None, caso não exista
+
+            user = RedisConnect.get_by_id(UserModel, 0, fields=["name", "email"]) # modelo parcial
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        models = RedisConnect._get_many_by_id(model, [identify], on_corrupt, _set_fk, fields=fields)
+        return models[0] if models else None
+
+
+    @staticmethod
+    def get_many_by_id(model: _model, identifiers: list, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", fields: list[str]=None, _set_fk: bool=True) -> Getter:
+        """
+        Obtém vários registros pelos IDs, usando um único pipeline
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identifiers (list) - identificadores dos registros. IDs sem registro são ignorados
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            fields (list) - obtém somente estes atributos (HMGET), retornando modelos parciais, sem verificação de integridade (padrão None)
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            users = RedisConnect.get_many_by_id(UserModel, [0, 1, 2]) # retorna Getter, na mesma ordem dos IDs
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return Getter(RedisConnect._get_many_by_id(model, identifiers, on_corrupt, _set_fk, fields=fields))
+
+
+    @staticmethod
+    def find(model: _model, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", **conditions) -> Getter:
+        """
+        Obtém os registros que atendem às condições usando os índices secundários (__indexes__), sem percorrer a tabela
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+            **conditions - atributos indexados e os valores esperados (todas as condições devem ser atendidas)
+
+        Examples:
+
+            class UserModel(RedisModel):
+                __indexes__ = ["email", "status"]
+                ...
+
+            users = RedisConnect.find(UserModel, status="active") # retorna Getter
+
+            user = RedisConnect.find(UserModel, email="user@email.com", status="active").first()
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        cls_name = type(model).__name__
+        if not conditions:
+            raise RedisConnectIndexException(f"{cls_name}: Enter at least one condition!")
+
+        names = []
+        for field, value in conditions.items():
+            if field not in model.__indexes__:
+                raise RedisConnectIndexException(f'{cls_name}: The attribute "{field}" is not indexed! Add it to __indexes__.')
+            names.append(RedisConnect._get_meta_name(model, "index", field, RedisConnect._get_index_value(model, field, value)))
+
+        redis_handler = RedisConnect._connect(model)
+        identifiers = sorted(redis_handler.sinter(names))
+
+        # registros expirados continuam nos índices até serem encontrados
+        missing = []
+        models = RedisConnect._get_many_by_id(model, identifiers, on_corrupt, missing=missing)
+        if missing:
+            with redis_handler.pipeline(transaction=False) as pipe:
+                for name in names:
+                    pipe.srem(name, *missing)
+                pipe.execute()
+
+        return Getter(models)
+
+
+    @staticmethod
+    def range(model: _model, field: str, min: float|str="-inf", max: float|str="+inf", limit: int=None, offset: int=0, desc: bool=False, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default") -> Getter:
+        """
+        Obtém os registros cujo atributo está dentro do intervalo, usando o índice de intervalo (__ranges__) do atributo, já ordenados
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            field (str) - atributo declarado em __ranges__
+
+            min, max (float|str) - limites do intervalo (inclusivos). Aceita a sintaxe do Redis: "-inf", "+inf" e "(" para limites exclusivos (padrão "-inf" e "+inf")
+
+            limit (int) - quantidade máxima de registros. Caso None, retorna todos (padrão None)
+
+            offset (int) - quantidade de registros ignorados no início (padrão 0)
+
+            desc (bool) - ordena do maior para o menor (padrão False)
+
+            on_corrupt (str) - o que fazer caso um registro esteja corrompido ("flag", "skip" ou "ignore"). Por padrão, usa on_corrupt de Settings
+
+        Examples:
+
+            class OrderModel(RedisModel):
+                __ranges__ = ["created_at", "total"]
+                ...
+
+            newest = RedisConnect.range(OrderModel, "created_at", limit=20, desc=True) # 20 pedidos mais recentes
+
+            orders = RedisConnect.range(OrderModel, "total", min=100, max=500) # pedidos entre 100 e 500
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        if field not in model.__ranges__:
+            raise RedisConnectIndexException(f'{type(model).__name__}: The attribute "{field}" is not range indexed! Add it to __ranges__.')
+        
+        name = RedisConnect._get_meta_name(model, "range", field)
+        start, num = None, None
+        if limit is not None or offset:
+            start, num = offset, limit if limit is not None else -1
+
+        redis_handler = RedisConnect._connect(model)
+        if desc:
+            identifiers = redis_handler.zrevrangebyscore(name, max, min, start=start, num=num)
+        else:
+            identifiers = redis_handler.zrangebyscore(name, min, max, start=start, num=num)
+
+        missing = []
+        models = RedisConnect._get_many_by_id(model, identifiers, on_corrupt, missing=missing)
+        if missing:
+            redis_handler.zrem(name, *missing) # registros expirados ou apagados em cascata
+
+        return Getter(models)
+    
+
+    @staticmethod
+    def first(model: _model, field: str) -> _model|None:
+        """
+        Retorna o registro com o menor valor do atributo, usando o índice de intervalo (__ranges__)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            field (str) - atributo declarado em __ranges__
 
-            RedisConnect.add(model=user, exists_ok=True) # atualiza um registro
+        Examples:
 
-            RedisConnect.add(model=user) # gera um erro - "This id (0) already exists in the database!"
+            oldest = RedisConnect.first(OrderModel, "created_at")
 
         Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
-
         """
-        def _set_identify(algorithm):
-            pos = RedisConnect.get(model, _set_fk=False).length
-            identify = algorithm(str(pos).encode("utf-8")).hexdigest() if model.__hashid__ else pos
-
-            setattr(model, idname, identify)
-            model.to_dict[idname] = identify
+        return RedisConnect.range(model, field, limit=1).first()
+    
 
-        def _add(handler: redis.Redis, _settings: Settings, algorithm, set_id: bool=False):
-            if RedisConnect.exists(model) and not exists_ok:
-                if not set_id:
-                    raise RedisConnectionAlreadyRegisteredException(f"{type(model).__name__}: This {idname} ({getattr(model, idname)}) already exists in the database!")
-                else:
-                    _set_identify(algorithm)
+    @staticmethod
+    def last(model: _model, field: str) -> _model|None:
+        """
+        Retorna o registro com o maior valor do atributo, usando o índice de intervalo (__ranges__)
 
-            name = RedisConnect._get_name(model)
-            content: dict = model.to_dict
-            fks: dict = model.__foreign_keys__
-            if fks:
-                model_name = type(model).__name__
-                for key, value in fks.items():
-                    id = value["id"]
-                    fk_model = value["model"](instance=False, identify=id)
-                    fk_settings: Settings = fk_model.__settings__
-
-                    differences = [
-                        "HOST" if fk_settings.host != _settings.host else "", 
-                        "PORT" if fk_settings.port != _settings.port else "",
-                        "PASSWORD" if fk_settings.password != _settings.password else ""
-                    ] 
-                    differences = [d for d in differences if d]
-                    if differences:
-                        raise RedisConnectForeignKeyException(f"{model_name}: The connection information (HOST, PORT and PASSWORD) of the reference model ({type(fk_model).__name__}) and the referenced model ({model_name}) must be the same. Differences: {", ".join(differences)}")
-                    
-                    fk_name = RedisConnect._get_name(fk_model)
-                    fk_handler = RedisConnect._connect(fk_model)
-                    fk_db = fk_model.__db__
-                    fk_testing = fk_model.__testing__
-                    fk_tablename__ = fk_model.__tablename__
+        Params:
 
+            model - modelo que usa RedisModel
 
-                    fk_data = fk_handler.hgetall(fk_name)
-                    eid = id if isinstance(id, int) else f'"{id}"'
-                    if not fk_data:
-                        raise RedisConnectForeignKeyException(f'{type(model).__name__}: Foreign key "{key}" ({value["model"].__name__}) with ID {eid} has no record!')
+            field (str) - atributo declarado em __ranges__
 
-                    referenced = fk_data.get("__referenced__")
-                    referenced = json.loads(referenced) if referenced else {}
-                    
-                    referenced[fk_tablename__] = {"key": key, "name": name, "action": model.__action__[key], "db": fk_db, "testing": fk_testing, "model": model_name, "idname": model.__idname__, "id": getattr(model, model.__idname__)}
+        Examples:
 
-                    referenced = json.dumps(referenced)
-                    fk_data["__referenced__"] = referenced
-                    
-                    fk_handler.hset(fk_name, mapping=fk_data)
+            newest = RedisConnect.last(OrderModel, "created_at")
 
-                    content[key] = id
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        return RedisConnect.range(model, field, limit=1, desc=True).first()
 
-            all_params = getattr(model, "__params__", {})
-            for key, value in content.items():
-                if isinstance(value, (dict, list, tuple)):
-                    
-                    pseudo_type: type = model.__annotations__[key]
-                    typ: type = get_origin(pseudo_type)
-                    if not typ:
-                        typ = pseudo_type
 
-                    if typ != type(value):
-                        raise RedisConnectTypeValueException(f'{type(model).__name__}: Divergence in the type of the attribute "{key}". expected: "{typ.__name__}" - received: "{type(value).__name__}"')
-                    
-                    content[key] = json.dumps(value)
-                elif callable(value):
-                    typ: type = model.__class__.__annotations__[key]
-                    params = all_params.get(key)
-                    callable_value = typ(value(**params) if params else value())
-
-                    content[key] = callable_value
-                    setattr(model, key, callable_value)
-
-            content = {k: str(v) for k, v in content.items()}
-            setattr(model, "__key__", hashlib.sha256(
-                str(model.__idname__).encode("utf-8")
-                +str(model.__tablename__).encode("utf-8")
-                +str(model.__db__).encode("utf-8")
-                +str(getattr(model, model.__idname__)).encode("utf-8")
-            ).hexdigest())
-            data = str(model.__key__).encode("utf-8") + str(json.dumps(content)).encode("utf-8")
-            hs = hashlib.sha256(data).hexdigest()
-            content["__hash__"] = hs
-
-            handler.hset(name, mapping=content)
+    @staticmethod
+    def _get_index_value(model: _model, field: str, value: Any) -> str:
+        # converte a condição no mesmo formato em que o valor é gravado no registro (ModelCodec.encode)
+        codec = model.__codec__
+        if field in codec.foreign_keys:
+            fk_model = codec.foreign_keys[field]
+            if isinstance(value, fk_model):
+                value = getattr(value, fk_model.__idname__)
+            return str(value)
+
+        typ = codec.types[field]
+        try:
+            return codec.encode_value(field, typ(value))
+        except (ValueError, TypeError):
+            raise RedisConnectTypeValueException(f'{type(model).__name__}: The "{field}" condition must be a possible {typ.__name__}. {field}: "{value}" ({type(value).__name__})')
 
-        if not model.__instancied__:
-            raise RedisConnectionModelInstanceException(f"{model.__name__}: The model must be instantiated to be added to the database!")
 
+    @staticmethod
+    def _get_many_by_id(model: _model, identifiers: list, on_corrupt: str="default", _set_fk: bool=True, missing: list=None, fields: list[str]=None) -> list[_model]:
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        on_corrupt = RedisConnect._get_on_corrupt(model, on_corrupt)
+        projection = RedisConnect._get_projection(model, fields)
         idname = model.__idname__
-        set_id = model.__autoid__ is True and getattr(model, idname) == "__await_autoid__"
-        settings: Settings = model.__settings__
-        algorithm = getattr(hashlib, settings.hash_algorithm)
 
-        if set_id:
-            _set_identify(algorithm)
+        names = {}
+        for identify in identifiers:
+            setattr(model, idname, identify)
+            names[RedisConnect._get_name(model)] = identify
 
-        redis_handler = RedisConnect._connect(model)
-        _add(redis_handler, settings, algorithm, set_id)
+        missing_names = []
+        models = RedisConnect._get_many_by_name(model, list(names), on_corrupt, _set_fk, missing_names, projection)
+        if missing is not None:
+            missing.extend(names[name] for name in missing_names)
 
-        # verifica se tem expiração
-        expire = getattr(model, "__expire__")
-        if expire:
-            try:
-                name = RedisConnect._get_name(model)
-                expire = float(expire)
-                redis_handler.expire(name, expire)
-            except ValueError:
-                raise RedisConnectInvalidExpireException(f'{type(model).__name__}: expire must be convertible to float! expire: "{expire}"')
+        return models
 
 
     @staticmethod
-    def exists(model: _model, identify: Any=None) -> bool:
-        """
-        Verifica se um modelo já existe no banco de dados
-
-        Params:
+    def _get_many_by_name(model: _model, names: list[str], on_corrupt: str, _set_fk: bool=True, missing: list=None, projection: list[str]=None) -> list[_model]:
+        # obtém os registros das chaves em lotes, usando um único pipeline por lote
+        batch_size = int(model.__settings__.batch_size)
+        redis_handler = RedisConnect._connect(model)
+        models = []
+        for i in range(0, len(names), batch_size):
+            responses = RedisConnect._read_many(redis_handler, model, names[i:i+batch_size], projection)
+            if missing is not None:
+                missing.extend(name for name, resp in zip(names[i:i+batch_size], responses) if not resp)
+            models.extend(RedisConnect._hydrate_many(model, responses, on_corrupt, _set_fk, projection))
 
-            model - modelo que usa RedisModel
+        return models
 
-            identify (Any) - identificador do registro que será verificado. Caso o modelo esteja instanciado, não é obrigatório (padrão None)
 
-        Examples:
+    @staticmethod
+    def _read_many(redis_handler: redis.Redis, model: _model, names: list[str], projection: list[str]=None) -> list[dict]:
+        if projection:
+            # leituras parciais não usam o cache local, que guarda somente registros completos
+            with redis_handler.pipeline(transaction=False) as pipe:
+                for name in names:
+                    pipe.hmget(name, projection)
+                return [RedisConnect._project(projection, resp) for resp in pipe.execute()]
+
+        # lê os registros com um único pipeline, usando o cache local do modelo (__cache__) quando possível
+        cache = RedisConnect._get_cache(model)
+        responses = [cache.get(RedisConnect._decode(name)) if cache else None for name in names]
+        pending = [i for i, resp in enumerate(responses) if resp is None]
+        if not pending:
+            return responses
+        
+        generation = cache.generation if cache is not None else None
+        with redis_handler.pipeline(transaction=False) as pipe:
+            for i in pending:
+                pipe.hgetall(names[i])
+            for i, resp in zip(pending, pipe.execute()):
+                responses[i] = resp
+                if cache is not None and resp:
+                    cache.set(RedisConnect._decode(names[i]), resp, generation)
 
-            class UserModel(RedisModel):
-                ...
+        return responses
 
-            user = UserModel(...)
 
-            exists = RedisConnect.exists(model=user) # retorna True ou False
+    @staticmethod
+    def _hydrate_many(model: _model, responses: list[dict], on_corrupt: str, _set_fk: bool=True, projection: list[str]=None) -> list[_model]:
+        if projection:
+            # registros parciais não possuem o conteúdo completo para verificar o hash de integridade
+            codec = model.__codec__
+            return [codec.build_partial(resp, _set_fk) for resp in responses if resp]
 
-            exists = RedisConnect.exists(model=UserModel, identify=0) # retorna True ou False
-        
-        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
-        """
-        if not model.__instancied__ and identify is None:
-            raise RedisConnectNoIdentifierException(f"{model.__name__}: Use an instance of the model or provide an identifier.")
+        # as chaves estrangeiras do lote são obtidas de uma só vez, um pipeline por modelo referenciado (no modo "lazy", somente quando acessadas)
+        fks = {}
+        if _set_fk and model.__settings__.load_type != "lazy":
+            for ref, (fk_model, ids) in RedisConnect._get_fk_ids(model, responses).items():
+                resolved = RedisConnect._get_many_by_id(fk_model, ids)
+                fks[ref] = RedisConnect._map_fks(fk_model, resolved)
 
-        if model.__instancied__ and identify is None:
-            identify = getattr(model, model.__idname__)
+        models = []
+        for resp in responses:
+            if not resp:
+                continue # o registro expirou ou foi apagado entre a busca e a leitura
 
-        if callable(model):
-            model = model(instance=False, identify=identify)
+            new_model = RedisConnect._hydrate(model, resp, on_corrupt, _set_fk, fks)
+            if new_model is not None:
+                models.append(new_model)
 
-        redis_handler = RedisConnect._connect(model)
-        name = RedisConnect._get_name(model)
-        return redis_handler.exists(name) == 1
-    
+        return models
 
-    @staticmethod 
-    def get(model: _model, on_corrupt: Literal["flag", "skip", "ignore", "default"]="default", _set_fk: bool=True) -> Getter:
-        """
-        Obtém dados do banco de dados baseado em modelos
 
-        Params:
+    @staticmethod
+    def _get_projection(model: _model, fields: list[str]|None) -> list[str]|None:
+        # atributos obtidos com HMGET em leituras parciais (o ID é sempre obtido)
+        if fields is None:
+            return None
 
-            model - modelo que usa RedisModel
-            _set_fk (bool) - indica se é necessário definir chave estrangeira (uso interno)
+        codec = model.__codec__
+        projection = [codec.idname]
+        for field in fields:
+            if field not in codec.fields:
+                raise RedisConnectFieldException(f'{type(model).__name__}: "{field}" is not an attribute of the model!')
+            elif field not in projection:
+                projection.append(field)
+        return projection
 
-        Examples:
 
-            class UserModel(RedisModel):
-                ...
+    @staticmethod
+    def _project(projection: list[str], values: list) -> dict[str, str]:
+        # converte a resposta de HMGET no conteúdo do registro (vazio caso o registro não exista)
+        if values[0] is None:
+            return {}
+        return {field: RedisConnect._decode(value) for field, value in zip(projection, values) if value is not None}
 
-            
-            models = RedisConnect.get(UserModel) # o retorno pode ser None, uma instância do modelo ou Getter (grupo de modelos)
 
-        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
-        """
+    @staticmethod
+    def _map_fks(fk_model: _model, resolved: list[_model]) -> dict[str, _model]:
+        # registros com o mesmo ID compartilham a mesma instância
+        fk_idname = fk_model.__idname__
+        return {str(getattr(fk, fk_idname)): fk for fk in resolved}
 
-        if callable(model):
-            model = RedisConnect._get_instance(model)
 
+    @staticmethod
+    def _get_on_corrupt(model: _model, on_corrupt: str) -> str:
         if on_corrupt == "default":
             on_corrupt = model.__settings__.on_corrupt
             
         if on_corrupt not in ["skip", "flag", "ignore"]:
             raise RedisConnectGetOnCorruptException(f'on_corrupt must be "flag", "skip" or "ignore"! on_corrupt: "{on_corrupt}"')
-        
-        pattern = RedisConnect._get_name(model, True)
+        return on_corrupt
 
-        redis_handler = RedisConnect._connect(model)
-        getters = []
-        for name in redis_handler.scan_iter(pattern):
-            resp = redis_handler.hgetall(name)
-            
-            __hash__ = resp.pop("__hash__", "error")
-            content = resp
-            resp.pop("__referenced__", None)
-
-            for key, value in resp.items():
-                pseudo_type: type = model.__annotations__[key]
-                typ: type = get_origin(pseudo_type)
-                if not typ:
-                    typ = pseudo_type
-
-                if typ in [list, dict, tuple]:
-                    try:
-                        value = value.decode("utf-8") if isinstance(value, bytes) else value
-                        resp[key] = json.loads(value)
-                    except json.JSONDecodeError:
-                        resp[key] = "corrupted"
-
-            new_model = model.__class__(set_fk=_set_fk, **resp)
-            
-            setattr(new_model, "__key__", hashlib.sha256(
-                str(new_model.__idname__).encode("utf-8")
-                +str(new_model.__tablename__).encode("utf-8")
-                +str(new_model.__db__).encode("utf-8")
-                +str(getattr(new_model, new_model.__idname__)).encode("utf-8")
-            ).hexdigest())
-
-            data = str(new_model.__key__).encode("utf-8")+str(json.dumps(content)).encode("utf-8")
-            hs = hashlib.sha256(
-                data
-            ).hexdigest()
-
-            if hs != __hash__:
-                if on_corrupt == "flag":
-                    new_model.__status__ = False
-                    for attr in new_model.__annotations__:
-                        if attr not in [new_model.__idname__, "__idname__"]:
-                            setattr(new_model, attr, "corrupted")
-                elif on_corrupt == "skip":
-                    continue
-            getters.append(new_model)
 
-        return Getter(getters)
+    @staticmethod
+    def _get_fk_ids(model: _model, responses: list[dict]) -> dict[str, tuple]:
+        # IDs das chaves estrangeiras de um lote de registros, por atributo: {ref: (fk_model, [ids])}
+        fk_ids = {}
+        for ref, fk in model.__foreign_keys__.items():
+            ids = {RedisConnect._decode(resp[ref]) for resp in responses if resp and resp.get(ref) is not None}
+            if ids:
+                fk_ids[ref] = (fk["model"], sorted(ids))
+        return fk_ids
+
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+    @staticmethod
+    def _hydrate(model: _model, resp: dict, on_corrupt: str, _set_fk: bool=True, fks: dict=None) -> _model|None:
+        codec = model.__codec__
+        # com decode_responses o conteúdo já é str e não precisa ser convertido campo a campo
+        values = resp if isinstance(next(iter(resp), ""), str) else {RedisConnect._decode(k): RedisConnect._decode(v) for k, v in resp.items()}
+        __hash__ = values.pop("__hash__", "error")
+        values.pop("__referenced__", None)
+
+        # o hash é verificado no conteúdo gravado, antes de qualquer conversão
+        key = codec.key(values.get(codec.idname))
+        if codec.verify(key, values, __hash__):
+            new_model = codec.build(values, _set_fk, fks)
+            new_model.__signature__ = __hash__
+        elif on_corrupt == "skip":
+            return None
+        elif on_corrupt == "flag":
+            new_model = codec.build_corrupted(values)
+        else:
+            new_model = codec.build(values, _set_fk, fks)
+
+        new_model.__key__ = key
+        return new_model
     
 
     @staticmethod
@@ -367,6 +1872,13 @@ class RedisConnect:
         
         Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
         """
+        model, identifiers = RedisConnect._get_deleted(model, identify)
+        RedisConnect._delete_many(model, identifiers, non_existent_ok)
+
+
+    @staticmethod
+    def _get_deleted(model: _model, identify: Any|list) -> tuple[type, list]:
+        # classe do modelo e IDs que serão apagados (veja RedisConnect.delete)
         if not model.__instancied__ and identify is None:
             raise RedisConnectNoIdentifierException(f"{model.__name__}: Use an instance of the model or provide an identifier.")
 
@@ -374,61 +1886,240 @@ class RedisConnect:
             identify = getattr(model, model.__idname__)
             model = model.__class__
         
-        def _delete(delete_model: _model):
-            if not non_existent_ok and not RedisConnect.exists(delete_model):
-                idname = delete_model.__idname__
-                raise RedisConnectNoRecordsException(f"{type(model).__name__}: This {idname} ({getattr(delete_model, idname)}) does not exist in the database!")
+        model = model if callable(model) else model.__class__
+        return model, identify if isinstance(identify, list) else [identify]
 
-            name = RedisConnect._get_name(delete_model)
-            redis_handler = RedisConnect._connect(delete_model)
 
-            referenced = redis_handler.hget(name, "__referenced__")
-            if referenced:
-                fk_connection = delete_model.__settings__.redis_info
-                try:
-                    referenced: dict = json.loads(referenced)
-
-                    for value in referenced.values():
-                        fk_key = value["key"]
-                        fk_name = value["name"]
-                        fk_action = value["action"]
-                        fk_testing = value["testing"]
-                        fk_model = value["model"]
-                        fk_idname = value["idname"]
-                        fk_id = value["id"]
-
-                        fk_connection.update({"db": value["db"]})
-                        fk_handler = fakeredis.FakeRedis(**fk_connection) if fk_testing else redis.Redis(**fk_connection)
-
-                        if fk_handler.exists(fk_name) == 1:
-                            if fk_action == "restrict":
-                                raise RedisConnectForeignKeyException(f"{type(delete_model).__name__}: It was not possible to delete the model because it is a reference to another record ({fk_model} - {fk_idname}: {fk_id} - {fk_key})!")
-                            elif fk_action == "cascade":
-                                fk_handler.delete(fk_name)
-                            else:
-                                raise RedisConnectForeignKeyException(f"{fk_model}: Foreign key action is invalid ({fk_key}: {fk_action} - {fk_idname}: {fk_id})!")
-                except json.JSONDecodeError:
-                    raise RedisConnectForeignKeyException(f"{fk_model}: Failed to decode __referenced__ field. Data might be corrupted.")
-                
-            redis_handler.delete(name)
-        
-        if isinstance(identify, list):
-            for _id in identify:
-                del_model = RedisConnect._get_instance(model if callable(model) else model.__class__)
-                setattr(del_model, del_model.__idname__, _id)
-                del_model.__instancied__ = True
-                _delete(del_model)
-        else:
-            del_model = RedisConnect._get_instance(model if callable(model) else model.__class__)
-            setattr(del_model, del_model.__idname__, identify)
-            del_model.__instancied__ = True
-            _delete(del_model)
+    @staticmethod
+    def _delete_many(model: _model, identifiers: list, non_existent_ok: bool=False):
+        settings: Settings = model.__settings__
+        plan, orphans = RedisConnect._plan_delete(model, identifiers, non_existent_ok)
+
+        # apaga os registros começando pelo último nível, sem bloquear o servidor
+        for (db, testing), names in orphans.items():
+            RedisConnect._unlink(RedisConnect._get_handler(settings, db, testing), settings, db, testing, names, [], True)
+
+        for level_model, ids, names, refs_names, indexed, _ in reversed(plan):
+            redis_handler = RedisConnect._connect(level_model)
+            RedisConnect._unlink(redis_handler, level_model.__settings__, level_model.__db__, level_model.__testing__, names, refs_names, bool(level_model.__cache__), level_model, ids, indexed)
+
+        # remove as referências dos registros apagados nos registros que eles referenciam
+        RedisConnect._set_referenced(RedisConnect._get_unreferenced_many(plan))
+
+
+    @staticmethod
+    def _plan_delete(model: _model, identifiers: list, non_existent_ok: bool=False) -> tuple[list, dict]:
+        # retorna os registros que serão apagados, por nível do grafo: (modelo, IDs, nomes, referências, valores indexados, chaves estrangeiras),
+        # e os registros de modelos não declarados neste processo ({(db, testing): nomes})
+        delete_model = RedisConnect._get_instance(model)
+        settings: Settings = delete_model.__settings__
+
+        # percorre o grafo das referências em largura (um nível por vez) antes de apagar qualquer registro,
+        # de forma que uma referência "restrict" impede a operação por completo
+        level = {type(delete_model): list(identifiers)}
+        visited = set()
+        plan = []
+        orphans = {}
+        while level:
+            following = {}
+            for cls, ids in level.items():
+                level_model = RedisConnect._get_instance(cls)
+                ids, names, refs_names = RedisConnect._get_deleted_names(level_model, ids, visited)
+                if not ids:
+                    continue
+
+                references, indexed, fk_values = RedisConnect._read_deleted(level_model, ids, names, refs_names, non_existent_ok)
+                checks = RedisConnect._get_cascade(level_model, references, following, orphans)
+                RedisConnect._check_references(type(level_model).__name__, settings, checks)
+                plan.append((level_model, ids, names, refs_names, indexed, fk_values))
+
+            non_existent_ok = True # registros em cascata podem ter sido apagados ou expirado
+            level = following
+
+        return plan, orphans
+
+
+    @staticmethod
+    def _get_unreferenced_many(plan: list) -> dict[str, tuple]:
+        # referências removidas pelos registros apagados (exceto nos registros referenciados que também foram apagados)
+        deleted_refs = {refs_name for _, _, _, refs_names, _, _ in plan for refs_name in refs_names}
+        references = {}
+        for level_model, _, names, _, _, fk_values in plan:
+            if level_model.__foreign_keys__:
+                for refs_name, (fk_model, fields) in RedisConnect._get_unreferenced(level_model, names, fk_values).items():
+                    if refs_name not in deleted_refs:
+                        references.setdefault(refs_name, (fk_model, {}))[1].update(fields)
+        return references
+
+
+    @staticmethod
+    def _get_deleted_names(model: _model, identifiers: list, visited: set) -> tuple[list, list, list]:
+        # nomes dos registros e das suas referências, ignorando os registros já visitados no grafo
+        idname = model.__idname__
+        ids, names, refs_names = [], [], []
+        for _id in identifiers:
+            setattr(model, idname, _id)
+            name = RedisConnect._get_name(model)
+            if name in visited:
+                continue
+
+            visited.add(name)
+            ids.append(_id)
+            names.append(name)
+            refs_names.append(RedisConnect._get_meta_name(model, "refs", _id))
+        return ids, names, refs_names
+
+
+    @staticmethod
+    def _read_deleted(model: _model, identifiers: list, names: list[str], refs_names: list[str], non_existent_ok: bool) -> tuple[list, list, list]:
+        # verifica a existência e obtém as referências, os valores indexados e as chaves estrangeiras dos registros, em lotes
+        redis_handler = RedisConnect._connect(model)
+        batch_size = int(model.__settings__.batch_size)
+        responses = []
+        for i in range(0, len(names), batch_size):
+            with redis_handler.pipeline(transaction=False) as pipe:
+                for name, refs_name in zip(names[i:i+batch_size], refs_names[i:i+batch_size]):
+                    RedisConnect._queue_deleted(pipe, model, name, refs_name)
+                responses.extend(pipe.execute())
+
+        return RedisConnect._parse_deleted(model, identifiers, responses, non_existent_ok)
+
+
+    @staticmethod
+    def _check_references(cls_name: str, settings: Settings, references: list[dict]):
+        # verifica, em lote por banco de dados, se os registros com ações diferentes de "cascade" ainda existem
+        groups = {}
+        for value in references:
+            fk_handler = RedisConnect._get_handler(settings, value["db"], value["testing"])
+            groups.setdefault(id(fk_handler), (fk_handler, []))[1].append(value)
+
+        for fk_handler, values in groups.values():
+            with fk_handler.pipeline(transaction=False) as pipe:
+                for value in values:
+                    pipe.exists(value["name"])
+                RedisConnect._check_actions(cls_name, values, pipe.execute())
+
+
+    @staticmethod
+    def _unlink(redis_handler: redis.Redis, settings: Settings, db: int, testing: bool, names: list[str], refs_names: list[str], publish: bool, model: _model=None, identifiers: list=None, indexed: list=None):
+        # apaga os registros e as suas referências (UNLINK), removendo-os dos índices e dos caches
+        with redis_handler.pipeline(transaction=False) as pipe:
+            RedisConnect._queue_unlink(pipe, settings, db, names, refs_names, publish, model, identifiers, indexed)
+            pipe.execute()
+
+        if publish:
+            RedisConnect._invalidate(settings, testing, db, names)
+
+
+    @staticmethod
+    def _queue_unlink(pipe: redis.client.Pipeline, settings: Settings, db: int, names: list[str], refs_names: list[str], publish: bool, model: _model=None, identifiers: list=None, indexed: list=None):
+        batch_size = int(settings.batch_size)
+        if model is not None:
+            for _id, old in zip(identifiers, indexed):
+                RedisConnect._set_indexes(pipe, model, _id, None, old)
+            for i in range(0, len(identifiers), batch_size):
+                pipe.srem(RedisConnect._get_meta_name(model, "members"), *[str(_id) for _id in identifiers[i:i+batch_size]])
+        for i in range(0, len(names), batch_size):
+            pipe.unlink(*names[i:i+batch_size])
+        for i in range(0, len(refs_names), batch_size):
+            pipe.unlink(*refs_names[i:i+batch_size])
+        if publish:
+            RedisConnect._publish_invalidation(pipe, settings, db, names)
+
+
+    @staticmethod
+    def _queue_deleted(pipe: redis.client.Pipeline, model: _model, name: str, refs_name: str):
+        # leituras de cada registro apagado (veja RedisConnect._parse_deleted)
+        pipe.exists(name)
+        pipe.hget(name, "__referenced__") # registros gravados por versões anteriores
+        pipe.hgetall(refs_name)
+        if model.__indexes__:
+            pipe.hmget(name, model.__indexes__)
+        if model.__foreign_keys__:
+            pipe.hmget(name, list(model.__foreign_keys__))
+
+
+    @staticmethod
+    def _parse_deleted(model: _model, identifiers: list, responses: list, non_existent_ok: bool) -> tuple[list, list, list]:
+        # converte as respostas de EXISTS, HGET "__referenced__", HGETALL (referências) e HMGET (índices e chaves estrangeiras) de cada registro apagado
+        cls_name = type(model).__name__
+        indexes = model.__indexes__
+        foreign_keys = model.__foreign_keys__
+        step = 3 + bool(indexes) + bool(foreign_keys)
+        references = []
+        indexed = []
+        fk_values = []
+        for i, _id in enumerate(identifiers):
+            exists, referenced, refs = responses[i*step:i*step+3]
+            indexed.append(RedisConnect._get_indexed(indexes, responses[i*step+3]) if indexes else {})
+            fk_values.append(responses[i*step+step-1] if foreign_keys else [])
+            if not non_existent_ok and exists != 1:
+                raise RedisConnectNoRecordsException(f"{cls_name}: This {model.__idname__} ({_id}) does not exist in the database!")
+            
+            try:
+                if referenced:
+                    references.extend(json.loads(referenced).values())
+                references.extend(json.loads(value) for value in refs.values())
+            except json.JSONDecodeError:
+                raise RedisConnectForeignKeyException(f"{cls_name}: Failed to decode the references. Data might be corrupted.")
+
+        return references, indexed, fk_values
+
+
+    @staticmethod
+    def _get_cascade(model: _model, references: list[dict], following: dict, orphans: dict) -> list[dict]:
+        # separa as referências "cascade" (próximo nível do grafo) das que precisam ser verificadas antes de apagar
+        checks = []
+        for value in references:
+            if value["action"] != "cascade":
+                checks.append(value)
+                continue
+
+            child = RedisConnect._get_child(model, value)
+            if child is None:
+                # modelo não declarado neste processo: somente o registro é apagado
+                orphans.setdefault((value["db"], value["testing"]), []).append(value["name"])
+            else:
+                following.setdefault(child, []).append(value["id"])
+
+        return checks
+
+
+    @staticmethod
+    def _get_child(model: _model, value: dict) -> type|None:
+        # modelo que referencia o registro, identificado pela tabela (modelos de módulos diferentes podem ter o mesmo nome)
+        references: dict = type(model).__references__
+        if "table" in value:
+            return references.get((value["table"], value["db"], bool(value["testing"])))
+
+        # referências gravadas por versões anteriores: somente o nome do modelo, usado apenas se não for ambíguo
+        children = [child for child in references.values() if child.__name__ == value["model"] and child.__db__ == value["db"]]
+        return children[0] if len(children) == 1 else None
+
+
+    @staticmethod
+    def _check_actions(cls_name: str, values: list[dict], existing: list):
+        # aplica as ações das referências que ainda existem (exceto "cascade")
+        for value, exists in zip(values, existing):
+            if exists != 1:
+                continue
+
+            fk_key = value["key"]
+            fk_action = value["action"]
+            fk_model = value["model"]
+            fk_idname = value["idname"]
+            fk_id = value["id"]
+            if fk_action == "restrict":
+                raise RedisConnectForeignKeyException(f"{cls_name}: It was not possible to delete the model because it is a reference to another record ({fk_model} - {fk_idname}: {fk_id} - {fk_key})!")
+            else:
+                raise RedisConnectForeignKeyException(f"{fk_model}: Foreign key action is invalid ({fk_key}: {fk_action} - {fk_idname}: {fk_id})!")
 
 
     @staticmethod
     def count(db: int|str, settings: Settings, testing: bool=False) -> int:
         """
-        Retorna a quantidade de registros de um banco de dados completo, sejam eles do mesmo modelo ou não
+        Retorna a quantidade de registros de um banco de dados completo, sejam eles do mesmo modelo ou não.
+        Soma os conjuntos de IDs das tabelas do banco de dados (um SCARD por tabela), sem percorrer as chaves: as chaves internas do RedisOKM não são contabilizadas
 
         Params:
 
@@ -448,10 +2139,197 @@ class RedisConnect:
             db = settings.get_db(db)
         
         redis_handler = RedisConnect._connect(use_model=False, settings=settings, db=db, testing=testing)
-        count = redis_handler.dbsize()
-        return count
+        tables = redis_handler.smembers(RedisConnect._get_tables_name(settings))
+        with redis_handler.pipeline(transaction=False) as pipe:
+            for members in RedisConnect._get_members_names(settings, tables):
+                pipe.scard(members)
+            return sum(pipe.execute())
+
+
+    @staticmethod
+    def count_model(model: _model) -> int:
+        """
+        Retorna a quantidade de registros de um modelo (SCARD no conjunto de IDs do modelo), sem percorrer o banco de dados
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            count = RedisConnect.count_model(UserModel)
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        redis_handler = RedisConnect._connect(model)
+        return redis_handler.scard(RedisConnect._get_meta_name(model, "members"))
+
+
+    @staticmethod
+    def seed_autoid(model: _model) -> int:
+        """
+        Inicializa a sequência de IDs automáticos (__autoid__) a partir dos registros existentes. Útil para tabelas criadas antes da sequência existir (use RedisConnect.rebuild_members antes, caso os registros também sejam anteriores ao conjunto de IDs)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+        Examples:
+
+            class UserModel(RedisModel):
+                __autoid__ = True
+                ...
+
+            next_id = RedisConnect.seed_autoid(UserModel) # retorna a próxima posição que será usada como ID
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model)
+        settings: Settings = model.__settings__
+        redis_handler = RedisConnect._connect(model)
+
+        # a próxima posição deve superar a quantidade de registros e o maior ID numérico já usado
+        seed = 0
+        for identify in redis_handler.sscan_iter(RedisConnect._get_meta_name(model, "members"), count=int(settings.scan_count)):
+            identify = RedisConnect._decode(identify)
+            seed += 1
+            if identify.isdigit():
+                seed = max(seed, int(identify) + 1)
+
+        name = RedisConnect._get_meta_name(model, "autoid")
+        with redis_handler.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(name)
+                    current = int(pipe.get(name) or 0)
+                    if seed <= current:
+                        pipe.unwatch()
+                        return current
+                    
+                    pipe.multi()
+                    pipe.set(name, seed)
+                    pipe.execute()
+                    return seed
+                except redis.exceptions.WatchError:
+                    continue
     
 
+    @staticmethod
+    def rebuild_members(model: _model) -> int:
+        """
+        Reconstrói o conjunto de IDs do modelo (usado por get, iter, page, count_model e seed_autoid) a partir dos registros existentes. Útil para registros gravados por versões anteriores
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+        Examples:
+
+            class UserModel(RedisModel):
+                ...
+
+            count = RedisConnect.rebuild_members(UserModel) # retorna a quantidade de registros do modelo
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        settings: Settings = model.__settings__
+        scan_count = int(settings.scan_count)
+        batch_size = int(settings.batch_size)
+        members = RedisConnect._get_meta_name(model, "members")
+        prefix = RedisConnect._get_name(model, True)[:-1]
+        redis_handler = RedisConnect._connect(model)
+        redis_handler.sadd(RedisConnect._get_tables_name(settings), str(model.__tablename__))
+
+        # o conjunto não é apagado antes, para não perder os registros adicionados durante a reconstrução
+        cursor = 0
+        while True:
+            cursor, names = redis_handler.scan(cursor, match=RedisConnect._get_name(model, True), count=scan_count)
+            if names:
+                redis_handler.sadd(members, *[RedisConnect._decode(name)[len(prefix):] for name in names])
+            if cursor == 0:
+                break
+
+        # remove os IDs cujos registros não existem mais
+        for names in RedisConnect._scan_members(redis_handler, model, scan_count):
+            for i in range(0, len(names), batch_size):
+                batch = names[i:i+batch_size]
+                with redis_handler.pipeline(transaction=False) as pipe:
+                    for name in batch:
+                        pipe.exists(name)
+                    existing = pipe.execute()
+
+                missing = [name[len(prefix):] for name, exists in zip(batch, existing) if not exists]
+                if missing:
+                    redis_handler.srem(members, *missing)
+
+        return redis_handler.scard(members)
+
+
+    @staticmethod
+    def rebuild_indexes(model: _model) -> int:
+        """
+        Reconstrói os índices secundários (__indexes__ e __ranges__) a partir dos registros existentes. Útil ao adicionar índices em um modelo que já possui registros
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+        Examples:
+
+            class UserModel(RedisModel):
+                __indexes__ = ["email"]
+                ...
+
+            indexed = RedisConnect.rebuild_indexes(UserModel) # retorna a quantidade de registros indexados
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        model = RedisConnect._get_instance(model if callable(model) else model.__class__)
+        settings: Settings = model.__settings__
+        scan_count = int(settings.scan_count)
+        batch_size = int(settings.batch_size)
+        indexes = model.__indexes__
+        redis_handler = RedisConnect._connect(model)
+
+        # apaga os índices atuais
+        with redis_handler.pipeline(transaction=False) as pipe:
+            for name in redis_handler.scan_iter(RedisConnect._get_meta_name(model, "index", "*"), count=scan_count):
+                pipe.unlink(name)
+            for field in model.__ranges__:
+                pipe.unlink(RedisConnect._get_meta_name(model, "range", field))
+            pipe.execute()
+
+        fields = indexes + model.__ranges__
+        if not fields:
+            return 0
+
+        indexed = 0
+        prefix = RedisConnect._get_name(model, True)[:-1]
+        for names in RedisConnect._scan_members(redis_handler, model, scan_count):
+            for i in range(0, len(names), batch_size):
+                batch = names[i:i+batch_size]
+                with redis_handler.pipeline(transaction=False) as pipe:
+                    for name in batch:
+                        pipe.hmget(name, fields)
+                    responses = pipe.execute()
+
+                with redis_handler.pipeline(transaction=False) as pipe:
+                    for name, values in zip(batch, responses):
+                        if all(value is None for value in values):
+                            continue # registro que não existe mais (veja RedisConnect.rebuild_members)
+                        content = {field: value for field, value in zip(fields, values) if value is not None}
+                        RedisConnect._set_indexes(pipe, model, name[len(prefix):], content, {})
+                        indexed += 1
+                    pipe.execute()
+
+        return indexed
+
+
     @staticmethod
     def _get_instance(model: _model) -> _model:
         if callable(model):
@@ -487,6 +2365,11 @@ class RedisConnect:
         def restart(index):
             redis_handler = RedisConnect._connect(use_model=False, db=index, settings=settings)
             redis_handler.flushall()
+
+        # os registros em cache deixam de existir
+        with _caches_lock:
+            for cache in [cache for key, cache in _caches.items() if key[0] == id(settings)]:
+                cache.clear()
         
         if db == "__all__":
             for i in range(16):
@@ -0,0 +1,159 @@
+from typing import Any
+
+from ..core import _model
+from .getter import Getter
+from .connection import RedisConnect
+from ..exceptions.redis_model_exceptions import RedisModelForeignKeyException
+from ..exceptions.getter_exceptions import GetterCorruptionException
+
+
+class LazyForeignKey:
+    """
+    Chave estrangeira que guarda somente o ID do registro referenciado, obtendo-o no primeiro acesso (load_type "lazy")
+    """
+    __slots__ = ["_owner", "_ref", "_model", "_id", "_value", "_async"]
+
+    def __init__(self, owner: str, ref: str, model: type, identify: Any, value: _model=None):
+        self._owner = owner
+        self._ref = ref
+        self._model = model
+        self._id = identify
+        self._value = None
+        self._async = False # obtida por AsyncRedisConnect: nunca consulta o Redis de forma síncrona
+        if value is not None:
+            self._set(value)
+
+
+    def __call__(self) -> _model:
+        """
+        Retorna o registro referenciado, obtendo-o somente no primeiro acesso
+
+        Examples:
+
+            order = RedisConnect.get_by_id(OrderModel, 0)
+            user = order.user() # obtém o registro de UserModel (acessos seguintes não consultam o Redis)
+        """
+        if self._value is None:
+            if self._async:
+                # uma leitura síncrona bloquearia o event loop
+                raise RedisModelForeignKeyException(f'{self._owner}: The foreign key "{self._ref}" ({self._model.__name__}) was read with AsyncRedisConnect and has not been loaded! Use "await AsyncRedisConnect.prefetch(models, "{self._ref}")" or "await model.{self._ref}.load()" before accessing it.')
+            self._set(RedisConnect.get_by_id(self._model, self._id))
+        return self._value
+
+
+    async def load(self) -> _model:
+        """
+        Obtém o registro referenciado sem bloquear o event loop (AsyncRedisConnect), somente no primeiro acesso
+
+        Examples:
+
+            order = await AsyncRedisConnect.get_by_id(OrderModel, 0)
+            user = await order.user.load() # acessos seguintes (order.user() e order.user.name) não consultam o Redis
+        """
+        if self._value is None:
+            from .async_connection import AsyncRedisConnect # async_connection.py depende de LazyForeignKey
+            self._set(await AsyncRedisConnect.get_by_id(self._model, self._id))
+        return self._value
+
+
+    def __getattr__(self, attr: str) -> Any:
+        # permite acessar os atributos do registro referenciado diretamente (order.user.name)
+        if attr in LazyForeignKey.__slots__:
+            raise AttributeError(attr)
+        return getattr(self(), attr)
+
+
+    def __repr__(self) -> str:
+        return f"<LazyForeignKey {self._model.__name__}: {self._id} ({"loaded" if self._value is not None else "pending"})>"
+
+
+    def _set(self, value: _model|None):
+        fk_model = self._model
+        if value is None:
+            raise RedisModelForeignKeyException(f'{self._owner}: There is no record for foreign key "{self._ref}" ({fk_model.__name__}) with ID {self._id if isinstance(self._id, int) else f"{self._id}"}!')
+        elif not value.__status__:
+            raise GetterCorruptionException(f"{fk_model.__name__}: The information in this record ({fk_model.__idname__}: {self._id}) is corrupt!")
+        self._value = value
+
+
+    @staticmethod
+    def _get_pending(models: Getter|list[_model], ref: str) -> list["LazyForeignKey"]:
+        # chaves estrangeiras "ref" dos modelos que ainda não foram obtidas
+        models = models._getters if isinstance(models, Getter) else list(models)
+        if not models:
+            return []
+
+        if ref not in type(models[0]).__foreign_keys__:
+            raise RedisModelForeignKeyException(f'{type(models[0]).__name__}: "{ref}" is not a foreign key of the model!')
+
+        pending = []
+        for model in models:
+            fk = getattr(model, ref)
+            if isinstance(fk, LazyForeignKey) and fk._value is None:
+                pending.append(fk)
+        return pending
+
+
+    @staticmethod
+    def _set_async(models: list[_model]):
+        # marca as chaves estrangeiras pendentes dos modelos obtidos por AsyncRedisConnect
+        if not models:
+            return
+
+        refs = list(type(models[0]).__codec__.foreign_keys)
+        for model in models:
+            for ref in refs:
+                fk = getattr(model, ref, None)
+                if isinstance(fk, LazyForeignKey) and fk._value is None:
+                    fk._async = True
+
+
+    @staticmethod
+    def _fill(pending: list["LazyForeignKey"], resolved: dict[str, _model]):
+        # registros inexistentes continuam pendentes e levantam o erro somente quando acessados
+        for fk in pending:
+            value = resolved.get(str(fk._id))
+            if value is not None:
+                fk._set(value)
+
+
+def prefetch(models: Getter|list[_model], ref: str):
+    """
+    Obtém de uma só vez a chave estrangeira "ref" de vários modelos (load_type "lazy"), usando um único pipeline
+
+    Params:
+
+        models (Getter|list) - modelos que possuem a chave estrangeira
+
+        ref (str) - nome da chave estrangeira
+
+    Examples:
+
+        orders = RedisConnect.get(OrderModel)
+        prefetch(orders, "user") # obtém todos os usuários dos pedidos
+
+        for order in orders._getters:
+            print(order.user.name) # não consulta o Redis
+
+    Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+    """
+    pending = LazyForeignKey._get_pending(models, ref)
+    if not pending:
+        return
+
+    fk_model = pending[0]._model
+    ids = sorted({str(fk._id) for fk in pending})
+    resolved = RedisConnect._get_many_by_id(fk_model, ids)
+    LazyForeignKey._fill(pending, RedisConnect._map_fks(fk_model, resolved))
+
+
+
+"""
+created by:
+
+
+▄▀█ █▀ ▀█▀ █░█ ▀█▀ █▀█
+█▀█ ▄█ ░█░ █▄█ ░█░ █▄█
+
+https://github.com/paulindavzl/redis-okm
+"""
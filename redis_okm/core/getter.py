@@ -69,22 +69,19 @@ class Getter:
         
         resp = ""
         if reference:
-            models = {}
-            references = []
+            # busca linear, sem ordenar a lista (em empates, prevalece o último modelo)
+            key = None
             for model in self._getters:
                 ref = getattr(model, reference, None)
                 if ref is None:
                     raise GetterAttributeException(f"{type(model).__name__} does not have the {reference} attribute!")
                 
-                models[ref] = model
-                references.append(ref)
+                if key is None or ref <= key:
+                    key = ref
+                    resp = model
 
-            if not references:
+            if key is None:
                 raise ValueError(f"The reference used did not return any model! reference: {reference}")
-            
-            references = sorted(references)
-            key = references[0]
-            resp = models.get(key)
         else:
             resp = self._getters[0] if self._getters else None
 
@@ -103,22 +100,19 @@ class Getter:
         
         resp = ""
         if reference:
-            models = {}
-            references = []
+            # busca linear, sem ordenar a lista (em empates, prevalece o último modelo)
+            key = None
             for model in self._getters:
                 ref = getattr(model, reference, None)
                 if ref is None:
                     raise GetterAttributeException(f"{type(model).__name__} does not have the {reference} attribute!")
                 
-                models[ref] = model
-                references.append(ref)
+                if key is None or ref >= key:
+                    key = ref
+                    resp = model
 
-            if not references:
+            if key is None:
                 raise ValueError(f"The reference used did not return any model! reference: {reference}")
-            
-            references = sorted(references, reverse=True)
-            key = references[0]
-            resp = models.get(key)
         else:
             resp = self._getters[-1] if self._getters else None
     
@@ -1,24 +1,67 @@
-from types import MemberDescriptorType
-
 from .. import settings
-from .connection import RedisConnect
+from .codec import ModelCodec
+from .foreign_key import LazyForeignKey
 from ..exceptions.redis_model_exceptions import *
 
 
 
-class RedisModel:
+class _ModelMeta(type):
+    """
+    Gera os __slots__ dos modelos a partir das anotações, de forma que as instâncias não tenham __dict__
+    """
+    def __new__(mcs, name: str, bases: tuple, namespace: dict, **kwargs):
+        if bases:
+            ann: dict = namespace.get("__annotations__", {})
+            fields = [attr for attr in ann if isinstance(attr, str) and not (attr.startswith("__") and attr.endswith("__"))]
+            slotted = {slot for base in bases for klass in base.__mro__ for slot in getattr(klass, "__slots__", [])}
+
+            # os valores padrões dos atributos não podem coexistir com os __slots__ de mesmo nome
+            defaults = {}
+            for base in reversed(bases):
+                defaults.update(getattr(base, "__defaults__", {}))
+            defaults.update({attr: namespace.pop(attr) for attr in fields if attr in namespace})
+
+            namespace["__defaults__"] = defaults
+            namespace["__slots__"] = list(namespace.get("__slots__", [])) + [attr for attr in fields if attr not in slotted]
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+
+
+class _ModelState:
+    """
+    Estado de cada instância (guardado nos __slots__ de RedisModel), com um valor padrão definido no modelo
+    """
+    __slots__ = ["slot", "default"]
+
+    def __init__(self, slot, default):
+        self.slot = slot
+        self.default = default
+
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.default
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            return self.default
+
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+
+
+class RedisModel(metaclass=_ModelMeta):
     """
     Base para todos os modelos em RedisOKM
     """
-    __slots__ = ["__db__", "__instancied__", "__idname__", "__tablename__", "__autoid__", "__testing__", "__hashid__", "__settings__", "__expire__", "__to_dict__", "__action__", "__foreign_keys__", "__references__", "__key__", "__status__", "__params__", "__ignore__"]
+    # "__dict__" só é criado quando uma configuração do modelo é alterada na própria instância
+    __slots__ = ["__instancied__", "__foreign_keys__", "__key__", "__status__", "__changes__", "__partial__", "__signature__", "__dict__"]
 
     def _set_attributes(cls, ann: dict[str|type]):
         cls_name = cls.__name__ if callable(cls) else type(cls).__name__
-        cls.__slots__ = getattr(cls, "__slots__", []) + RedisModel.__slots__
 
-        for attr in ann.keys():
-            if attr.startswith("__") and attr.endswith("__") and attr not in cls.__slots__:
-                raise RedisModelInvalidNomenclatureException(f'{cls_name}: Cannot set attributes that start and end with "__" ({attr})!')
         # valores padrões dos atributos
         default_values = {
             "__db__": None, 
@@ -31,12 +74,20 @@ class RedisModel:
             "__expire__": None, 
             "__action__": None, 
             "__ignore__": [],
-            "__params__": {}
+            "__params__": {},
+            "__indexes__": [],
+            "__ranges__": [],
+            "__cache__": None,
+            "__version__": None
         }
+
+        for attr in ann.keys():
+            if attr.startswith("__") and attr.endswith("__") and attr not in default_values and attr not in RedisModel.__slots__:
+                raise RedisModelInvalidNomenclatureException(f'{cls_name}: Cannot set attributes that start and end with "__" ({attr})!')
         
-        for attr in dir(cls):
-            if isinstance(getattr(cls, attr, None), MemberDescriptorType) and attr in default_values:
-                setattr(cls, attr, default_values[attr])
+        for attr, value in default_values.items():
+            if not hasattr(cls, attr):
+                setattr(cls, attr, value)
 
         # obtém informações do modelo
         db = getattr(cls, "__db__", None)
@@ -50,6 +101,10 @@ class RedisModel:
         action = getattr(cls, "__action__", None)
         params = getattr(cls, "__params__", {})
         ignore = getattr(cls, "__ignore__", [])
+        indexes = getattr(cls, "__indexes__", [])
+        ranges = getattr(cls, "__ranges__", [])
+        cache = getattr(cls, "__cache__", None)
+        version = getattr(cls, "__version__", None)
 
         if db is None:
             raise RedisModelAttributeException(f"{cls_name}: Specify the database using __db__ when structuring the model")
@@ -78,13 +133,21 @@ class RedisModel:
         cls.__expire__ = expire
         cls.__action__ = action
         cls.__references__ = {}
-        cls.__to_dict__ = {}
-        cls.__status__ = True
-        cls.__key__ = "__await_identify__"
         cls.__params__ = params
         cls.__ignore__ = ignore
-
-        cls.__foreign_keys__: dict[type, any] = {}
+        cls.__indexes__ = list(indexes)
+        cls.__ranges__ = list(ranges)
+        cls.__cache__ = None
+        cls.__version__ = version
+
+        # estado das instâncias, com o valor padrão de cada modelo
+        cls.__status__ = _ModelState(RedisModel.__dict__["__status__"], True)
+        cls.__key__ = _ModelState(RedisModel.__dict__["__key__"], "__await_identify__")
+        cls.__instancied__ = _ModelState(RedisModel.__dict__["__instancied__"], False)
+        cls.__changes__ = _ModelState(RedisModel.__dict__["__changes__"], None)
+        cls.__partial__ = _ModelState(RedisModel.__dict__["__partial__"], False)
+        cls.__signature__ = _ModelState(RedisModel.__dict__["__signature__"], None) # hash lido do Redis, até o modelo ser gravado
+        cls.__foreign_keys__ = _ModelState(RedisModel.__dict__["__foreign_keys__"], {})
         for attr, value in ann.items():
             if isinstance(value, cls):
                 raise RedisModelForeignKeyException(f"{cls_name}: You cannot define a foreign key in a model of itself ({attr})!")
@@ -103,6 +166,7 @@ class RedisModel:
                     raise RedisModelForeignKeyException(f"{cls_name}: The connection information (HOST, PORT and PASSWORD) of the reference model ({value.__name__}) and the referenced model ({cls_name}) must be the same. Differences: {", ".join(differences)}")
                     
                 cls.__foreign_keys__[attr] = {"model": value}
+                value.__references__[(cls.__tablename__, cls.__db__, bool(cls.__testing__))] = cls # modelos que referenciam o modelo (por tabela), usados ao apagar em cascata
 
         if cls.__foreign_keys__ and not cls.__action__:
             raise RedisModelForeignKeyException(f'{cls_name}: To define the foreign key, add an action for it in __action__')
@@ -110,10 +174,43 @@ class RedisModel:
         if ann[cls.__idname__] not in [str, int]:
             raise RedisModelTypeValueException(f"{cls_name}: The {cls.__idname__} must be of type int (integer) or str (string). {cls.__idname__}: {ann[cls.__idname__].__name__}")
 
+        for attr in cls.__indexes__ + cls.__ranges__:
+            if attr not in ann or attr.startswith("__"):
+                raise RedisModelAttributeException(f'{cls_name}: Cannot index "{attr}" because it is not an attribute of the model!')
+            
+        for attr in cls.__ranges__:
+            if ann[attr] not in [int, float]:
+                raise RedisModelTypeValueException(f"{cls_name}: Only int or float attributes can be range indexed. {attr}: {getattr(ann[attr], "__name__", ann[attr])}")
+
+        if version is not None:
+            # versão do registro (controle de concorrência otimista), incrementada a cada escrita
+            if not isinstance(version, str) or version not in ann or version.startswith("__") or version == cls.__idname__ or version in cls.__foreign_keys__ or version in cls.__ignore__:
+                raise RedisModelAttributeException(f'{cls_name}: Cannot use "{version}" as __version__ because it is not an attribute of the model!')
+            elif ann[version] is not int:
+                raise RedisModelTypeValueException(f"{cls_name}: The __version__ attribute must be of type int. {version}: {getattr(ann[version], "__name__", ann[version])}")
+            
+            # registros novos (e gravados antes da versão existir) estão na versão 0
+            cls.__defaults__.setdefault(version, 0)
+
+        if cache is not None:
+            # cache local dos registros: {"max_entries": int, "ttl": segundos ou None}
+            if not isinstance(cache, dict) or set(cache) - {"max_entries", "ttl"}:
+                raise RedisModelAttributeException(f'{cls_name}: __cache__ must be a dict with "max_entries" and "ttl". __cache__: {cache}')
+            
+            max_entries = cache.get("max_entries", 1000)
+            ttl = cache.get("ttl")
+            if not isinstance(max_entries, int) or max_entries < 1 or (ttl is not None and (not isinstance(ttl, (int, float)) or ttl <= 0)):
+                raise RedisModelAttributeException(f"{cls_name}: __cache__ max_entries must be a positive int and ttl a positive number of seconds (or None). __cache__: {cache}")
+            elif expire:
+                raise RedisModelAttributeException(f"{cls_name}: Models with __expire__ cannot use __cache__!")
+            
+            cls.__cache__ = {"max_entries": max_entries, "ttl": float(ttl) if ttl is not None else None}
+
         if cls.__hashid__:
-            setattr(cls, cls.__idname__, str)
+            cls.__defaults__[cls.__idname__] = str
 
-        cls.__instancied__ = False
+        # conversão entre o modelo e o registro, compilada uma única vez
+        cls.__codec__ = ModelCodec(cls)
 
 
     def __init_subclass__(cls, **kwargs):
@@ -144,6 +241,7 @@ class RedisModel:
         Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
         """
         cls_name = type(self).__name__
+        object.__setattr__(self, "__changes__", None) # instâncias novas não rastreiam alterações
         _set_fk = attributes.pop("set_fk") if attributes.get("set_fk") is not None else True 
 
         for attr in self.__ignore__:
@@ -156,6 +254,10 @@ class RedisModel:
             if not self.__idname__ in attributes and self.__autoid__:
                 attributes[self.__idname__] = "__await_autoid__"
 
+            # cada instância guarda os IDs das suas próprias chaves estrangeiras
+            if type(self).__foreign_keys__:
+                self.__foreign_keys__ = {ref: dict(fk) for ref, fk in type(self).__foreign_keys__.items()}
+
             if self.__action__ and _set_fk:
                 # garante que as ações das chaves estrangeiras são dict
                 if not isinstance(self.__action__, dict):
@@ -168,28 +270,20 @@ class RedisModel:
                         raise RedisModelForeignKeyException(f'{cls_name}: Set a value for the foreign key "{ref}".')
                     
                     fk_model: type[RedisModel] = self.__foreign_keys__[ref]["model"] # obtém o modelo da chave estrangeira
-                    class Return(fk_model):
-                        pass
-                    
                     fk_idname = fk_model.__idname__
                     id = attributes.pop(ref)
+                    fk_returned = None
                     if type(id) == fk_model:
+                        # um registro já obtido (gravado ou resolvido em lote) dispensa uma nova consulta
+                        if id.__key__ != "__await_identify__":
+                            fk_returned = id
                         id = getattr(id, fk_idname)
-                    typ_id = str if self.__autoid__ else ann[fk_idname]
-                    id = typ_id(id)
-                    f_id = {fk_idname:id} # filtro para id
+                    id = self.__codec__.fk_types[ref](id)
 
-                    fk_returned = RedisConnect.get(fk_model).filter_by(**f_id)
-                    if fk_returned is None:
-                        raise RedisModelForeignKeyException(f'{cls_name}: There is no record for foreign key "{ref}" ({fk_model.__name__}) with ID {id if isinstance(id, int) else f"{id}"}!')
-
-                    def foreign_key() -> Return:
-                        fk = fk_returned
-                        return fk
-                    
+                    # no modo "lazy" somente o ID é guardado, e o registro é obtido no primeiro acesso
+                    foreign_key = LazyForeignKey(cls_name, ref, fk_model, id, fk_returned)
                     setattr(self, ref, foreign_key if self.__settings__.load_type == "lazy" else foreign_key())
                     self.__foreign_keys__[ref]["id"] = id
-                    self.__to_dict__[ref] = id
                     
 
             # passa as informações para o modelo caso ele aceite-as
@@ -214,19 +308,14 @@ class RedisModel:
                     raise e
 
             for attr, value in attrs.items():
-                setattr(self, attr, value)
-
-            self.__to_dict__ = attrs # define to_dict
+                object.__setattr__(self, attr, value) # instâncias novas não rastreiam alterações
 
             ann = self.__annotations__ # recarrega __annotations__
             for attr in ann:
                 if not str(attr).startswith("__") and attr not in attrs and attr not in self.__foreign_keys__ and not attr in self.__ignore__:
-                    name = type(self)
-                    if not hasattr(name, attr):
+                    if attr not in self.__defaults__:
                         raise RedisModelAttributeException(f"{cls_name}: {attr} must receive a value!")
-                    value = getattr(name, attr)
-                    setattr(self, attr, value)
-                    self.__to_dict__[attr] = value
+                    object.__setattr__(self, attr, self.__defaults__[attr])
             
             self.__instancied__ = True
         else:
@@ -237,14 +326,21 @@ class RedisModel:
                 setattr(self, idname, typ(identify))
 
     
+    def __setattr__(self, attr: str, value):
+        # guarda o valor original dos atributos alterados desde a leitura/gravação (veja RedisConnect.save)
+        if attr in self.__codec__.types:
+            changes = self.__changes__
+            if changes is not None and attr not in changes:
+                changes = dict(changes)
+                changes[attr] = getattr(self, attr, None)
+                object.__setattr__(self, "__changes__", changes)
+        object.__setattr__(self, attr, value)
+
+
     @property
     def to_dict(self) -> dict:
-        for attr, value in self.__to_dict__.items():
-            n_value = self.__dict__[attr] 
-            if n_value != value:
-                self.__to_dict__[attr] = value
-        
-        return self.__to_dict__
+        # calculado a cada acesso a partir dos atributos (exceto chaves estrangeiras)
+        return {attr: getattr(self, attr) for attr in self.__codec__.types if hasattr(self, attr)}
 
 
         
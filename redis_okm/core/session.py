@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import redis
+from typing import Any
+
+from ..core import _model
+from .connection import RedisConnect, _ADD_SCRIPT
+from ..exceptions.connection_exceptions import RedisConnectSessionException, RedisConnectSessionPartialException
+
+
+class Session:
+    """
+    Unidade de trabalho: acumula as escritas (add, add_many e delete) e grava todas de uma só vez ao sair do bloco with, em uma transação (MULTI/EXEC) por banco de dados
+    """
+    def __init__(self):
+        self._added: list[tuple[_model, bool]] = []
+        self._deleted: list[tuple[type, list, bool]] = []
+        self._closed = False
+
+
+    def __enter__(self) -> Session:
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # um erro dentro do bloco descarta as operações, sem gravar nada
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+    def add(self, model: _model, exists_ok: bool=False):
+        """
+        Adiciona um registro na sessão. Ele só é gravado em Session.commit (veja RedisConnect.add)
+
+        Params:
+
+            model - modelo que usa RedisModel (instanciado)
+
+            exists_ok (bool) - quando True, atualiza o valor do registro, caso exista. Se False, gera um erro ao gravar a sessão caso já exista (padrão False)
+
+        Examples:
+
+            with RedisConnect.session() as session:
+                session.add(UserModel(...))
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        self.add_many([model], exists_ok=exists_ok)
+
+
+    def add_many(self, models: list[_model], exists_ok: bool=False):
+        """
+        Adiciona vários registros na sessão (veja RedisConnect.add_many)
+
+        Params:
+
+            models (list) - modelos que usam RedisModel (instanciados)
+
+            exists_ok (bool) - quando True, atualiza os registros que já existem. Se False, gera um erro ao gravar a sessão caso algum registro já exista (padrão False)
+
+        Examples:
+
+            with RedisConnect.session() as session:
+                session.add_many([OrderModel(...), OrderModel(...)])
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        self._check_open()
+        models = list(models)
+        RedisConnect._check_added(models)
+        self._added.extend((model, bool(exists_ok)) for model in models)
+
+
+    def delete(self, model: _model, identify: Any|list=None, non_existent_ok: bool=False):
+        """
+        Apaga um ou mais registros ao gravar a sessão (veja RedisConnect.delete)
+
+        Params:
+
+            model - modelo que usa RedisModel
+
+            identify (Any|list) - ID ou lista de IDs que serão apagados. Caso o modelo esteja instanciado, não é obrigatório (padrão None)
+
+            non_existent_ok (bool) - quando True, ignora os IDs sem registro (padrão False)
+
+        Examples:
+
+            with RedisConnect.session() as session:
+                session.delete(UserModel, identify=[0, 1])
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        self._check_open()
+        model, identifiers = RedisConnect._get_deleted(model, identify)
+        self._deleted.append((model, identifiers, non_existent_ok))
+
+
+    def rollback(self):
+        """
+        Descarta as operações da sessão, sem gravar nada
+
+        Examples:
+
+            session = RedisConnect.session()
+            session.add(UserModel(...))
+            session.rollback()
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        self._added.clear()
+        self._deleted.clear()
+        self._closed = True
+
+
+    def commit(self):
+        """
+        Valida e grava as operações da sessão. Todas as leituras (IDs automáticos, existência dos registros e chaves estrangeiras) são feitas em lote antes de qualquer escrita,
+        e as escritas de cada banco de dados são executadas em uma única transação (MULTI/EXEC). Caso algum erro ocorra, nada é gravado
+
+        Examples:
+
+            session = RedisConnect.session()
+            session.add(UserModel(...))
+            session.delete(OrderModel, identify=0)
+            session.commit() # o mesmo que sair do bloco with
+
+        Veja mais informações no [**GitHub**](https://github.com/paulindavzl/redis-okm "GitHub RedisOKM")
+        """
+        self._check_open()
+        self._closed = True
+        if not self._added and not self._deleted:
+            return
+
+        transactions = {}
+        try:
+            self._commit(transactions)
+        finally:
+            for _, pipe in transactions.values():
+                pipe.reset()
+
+        self._added.clear()
+        self._deleted.clear()
+
+
+    def _check_open(self):
+        if self._closed:
+            raise RedisConnectSessionException("Session: The session has already been committed or rolled back!")
+
+
+    def _commit(self, transactions: dict):
+        models = [model for model, _ in self._added]
+        set_ids = RedisConnect._reserve_ids(models)
+        created = {RedisConnect._get_name(model) for model in models}
+
+        # observa (WATCH) os registros verificados antes das leituras: uma escrita concorrente cancela a transação
+        watched = {}
+        for model, exists_ok in self._added:
+            if (not exists_ok or model.__version__) and id(model) not in set_ids:
+                Session._add_watched(watched, RedisConnect._connect(model), [RedisConnect._get_name(model)])
+        for name, fk_model in RedisConnect._get_fk_targets(models).items():
+            if name not in created:
+                Session._add_watched(watched, RedisConnect._connect(fk_model), [name])
+        for model, identifiers, _ in self._deleted:
+            _, names, refs_names = RedisConnect._get_deleted_names(RedisConnect._get_instance(model), identifiers, set())
+            Session._add_watched(watched, RedisConnect._connect(model), names + refs_names)
+        Session._watch(transactions, watched)
+
+        # registros versionados (__version__) devem continuar na versão dos modelos
+        RedisConnect._check_versions([model for model in models if id(model) not in set_ids])
+
+        # registros que serão gravados, validados em lote (um grupo por exists_ok)
+        references = {}
+        writes = []
+        for exists_ok in (False, True):
+            group = [model for model, ok in self._added if ok is exists_ok]
+            if group:
+                # na sessão, a verificação é sempre feita antes: um registro recusado pelo script não pode interromper a transação já aplicada
+                group_references, group_writes = RedisConnect._prepare_many(group, exists_ok, set_ids, created, check_exists=True)
+                Session._merge_references(references, group_references)
+                writes.extend((*write, exists_ok) for write in group_writes)
+
+        # registros que serão apagados (incluindo os registros em cascata, também observados)
+        plans = []
+        orphans = {}
+        watched = {}
+        for model, identifiers, non_existent_ok in self._deleted:
+            plan, model_orphans = RedisConnect._plan_delete(model, identifiers, non_existent_ok)
+            for level_model, _, names, refs_names, _, _ in plan:
+                Session._add_watched(watched, RedisConnect._connect(level_model), names + refs_names)
+            for (db, testing), names in model_orphans.items():
+                orphans.setdefault((model.__settings__, db, testing), []).extend(names)
+            plans.extend(plan)
+        Session._watch(transactions, watched)
+
+        deleted_refs = {refs_name for _, _, _, refs_names, _, _ in plans for refs_name in refs_names}
+        for refs_name, (fk_model, fields) in references.items():
+            if refs_name in deleted_refs and any(value is not None for value in fields.values()):
+                raise RedisConnectSessionException(f"{type(fk_model).__name__}: A record referenced by a model added in this session cannot be deleted in the same session! ({refs_name})")
+
+        # enfileira todas as escritas (referências antes dos registros, como em RedisConnect.add_many)
+        invalidations = []
+        for refs_name, (fk_model, fields) in references.items():
+            RedisConnect._queue_referenced(Session._multi(transactions, RedisConnect._connect(fk_model)), refs_name, fields)
+
+        scripts = {}
+        positions = {}
+        cached = {}
+        written = {} # registros gravados ou apagados por cada transação
+        for write in writes:
+            model, name, content, expire, old, exists_ok = write
+            handler = RedisConnect._connect(model)
+            script = scripts.setdefault(id(handler), handler.register_script(_ADD_SCRIPT))
+            pipe = Session._multi(transactions, handler)
+            positions.setdefault(id(handler), []).append((len(pipe), write)) # posição da resposta de _ADD_SCRIPT
+            written.setdefault(id(handler), []).append(name)
+            RedisConnect._queue_add(pipe, script, model, name, content, expire, old, exists_ok)
+            if model.__cache__:
+                cached.setdefault(id(handler), (handler, model, []))[2].append(name)
+        for handler, model, names in cached.values():
+            RedisConnect._publish_invalidation(Session._multi(transactions, handler), model.__settings__, model.__db__, names)
+            invalidations.append((model.__settings__, model.__testing__, model.__db__, names))
+
+        for (settings, db, testing), names in orphans.items():
+            handler = RedisConnect._get_handler(settings, db, testing)
+            RedisConnect._queue_unlink(Session._multi(transactions, handler), settings, db, names, [], True)
+            written.setdefault(id(handler), []).extend(names)
+            invalidations.append((settings, testing, db, names))
+
+        for level_model, ids, names, refs_names, indexed, _ in plans:
+            settings = level_model.__settings__
+            publish = bool(level_model.__cache__)
+            handler = RedisConnect._connect(level_model)
+            RedisConnect._queue_unlink(Session._multi(transactions, handler), settings, level_model.__db__, names, refs_names, publish, level_model, ids, indexed)
+            written.setdefault(id(handler), []).extend(names)
+            if publish:
+                invalidations.append((settings, level_model.__testing__, level_model.__db__, names))
+
+        for refs_name, (fk_model, fields) in RedisConnect._get_unreferenced_many(plans).items():
+            RedisConnect._queue_referenced(Session._multi(transactions, RedisConnect._connect(fk_model)), refs_name, fields)
+
+        responses = {}
+        for key, (handler, pipe) in transactions.items():
+            try:
+                responses[key] = Session._multi(transactions, handler).execute()
+            except redis.exceptions.WatchError:
+                if not responses:
+                    raise RedisConnectSessionException("Session: Records used by the session were changed by another client during the commit! The transaction was not executed.") from None
+
+                # as transações dos outros bancos de dados já foram executadas e não podem ser desfeitas
+                for settings, testing, db, names in invalidations:
+                    RedisConnect._invalidate(settings, testing, db, names)
+                committed = [RedisConnect._decode(name) for done in responses for name in written.get(done, [])]
+                raise RedisConnectSessionPartialException(f"Session: Records used by the session were changed by another client during the commit! Only the transactions of other databases were executed. Written records: {committed}") from None
+
+        # os modelos gravados passam a rastrear as alterações (veja RedisConnect.save) e a ter a versão gravada
+        conflicts = []
+        for key, values in positions.items():
+            handler_conflicts = RedisConnect._set_written([write for _, write in values], [responses[key][pos] for pos, _ in values])
+            if handler_conflicts:
+                # registros recusados por _ADD_SCRIPT: os índices e as referências voltam a refletir o registro gravado (veja RedisConnect.add_many)
+                handler = transactions[key][0]
+                RedisConnect._restore_indexes(handler, [write for write, _ in handler_conflicts])
+                RedisConnect._restore_references(handler, [write for write, _ in handler_conflicts])
+                conflicts.extend(handler_conflicts)
+
+        for settings, testing, db, names in invalidations:
+            RedisConnect._invalidate(settings, testing, db, names)
+        if conflicts:
+            RedisConnect._raise_conflict(conflicts)
+
+
+    @staticmethod
+    def _add_watched(watched: dict, handler: redis.Redis, names: list[str]):
+        watched.setdefault(id(handler), (handler, []))[1].extend(names)
+
+
+    @staticmethod
+    def _watch(transactions: dict, watched: dict):
+        # um único WATCH por conexão
+        for handler, names in watched.values():
+            if names:
+                Session._get_pipeline(transactions, handler).watch(*names)
+
+
+    @staticmethod
+    def _get_pipeline(transactions: dict, handler: redis.Redis) -> redis.client.Pipeline:
+        if id(handler) not in transactions:
+            transactions[id(handler)] = (handler, handler.pipeline(transaction=True))
+        return transactions[id(handler)][1]
+
+
+    @staticmethod
+    def _multi(transactions: dict, handler: redis.Redis) -> redis.client.Pipeline:
+        # inicia a transação da conexão (após o WATCH), caso ainda não tenha sido iniciada
+        pipe = Session._get_pipeline(transactions, handler)
+        if not pipe.explicit_transaction:
+            pipe.multi()
+        return pipe
+
+
+    @staticmethod
+    def _merge_references(references: dict[str, tuple], other: dict[str, tuple]):
+        for refs_name, (fk_model, fields) in other.items():
+            references.setdefault(refs_name, (fk_model, {}))[1].update(fields)
+
+
+
+"""
+created by:
+
+
+▄▀█ █▀ ▀█▀ █░█ ▀█▀ █▀█
+█▀█ ▄█ ░█░ █▄█ ░█░ █▄█
+
+https://github.com/paulindavzl/redis-okm
+"""
@@ -55,4 +55,40 @@ class RedisConnectTypeValueException(Exception):
 class RedisConnectGetOnCorruptException(Exception):
     """
     on_corrupt invalid.
+    """
+
+
+class RedisConnectIndexException(Exception):
+    """
+    The attribute is not indexed.
+    """
+
+
+class RedisConnectCursorException(Exception):
+    """
+    Invalid pagination cursor.
+    """
+
+
+class RedisConnectFieldException(Exception):
+    """
+    The field is not an attribute of the model.
+    """
+
+
+class RedisConnectSessionException(Exception):
+    """
+    The session cannot be committed.
+    """
+
+
+class RedisConnectSessionPartialException(RedisConnectSessionException):
+    """
+    Only part of the session (the transactions of other databases) was committed.
+    """
+
+
+class RedisConnectConflictException(Exception):
+    """
+    The record was changed by another client.
     """
\ No newline at end of file
@@ -3,6 +3,9 @@ from .core.configure import Settings
 from .core.getter import Getter
 from .core.redis_model import RedisModel
 from .core.connection import RedisConnect
+from .core.async_connection import AsyncRedisConnect
+from .core.session import Session
+from .core.foreign_key import LazyForeignKey, prefetch
 
 
 __all__ = [
@@ -10,5 +13,9 @@ __all__ = [
     "Settings",
     "Getter",
     "RedisModel",
-    "RedisConnect"
+    "RedisConnect",
+    "AsyncRedisConnect",
+    "Session",
+    "LazyForeignKey",
+    "prefetch"
 ]
\ No newline at end of file
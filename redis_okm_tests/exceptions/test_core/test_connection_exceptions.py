@@ -38,6 +38,13 @@ def test__exceptions__redis_connect__model_instance_exception():
     with pytest.raises(RedisConnectionModelInstanceException, match=expected):
         RedisConnect.add(TestModel)
 
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+    partial = RedisConnect.get_by_id(TestModel, "test", fields=["attr2"])
+
+    expected2 = re.escape("TestModel: Partial models (obtained with fields) cannot be added to the database!")
+    with pytest.raises(RedisConnectionModelInstanceException, match=expected2):
+        RedisConnect.save(partial)
+
 
 def test__exceptions__redis_connect__already_registered_exception():
     model = TestModel(attr1="test", attr2=0, attr3=0)
@@ -48,6 +55,15 @@ def test__exceptions__redis_connect__already_registered_exception():
     with pytest.raises(RedisConnectionAlreadyRegisteredException, match=expected):
         RedisConnect.add(model)
 
+    expected2 = re.escape("This attr1 (test2) already exists in the database!")
+    with pytest.raises(RedisConnectionAlreadyRegisteredException, match=expected2):
+        RedisConnect.add_many([
+            TestModel(attr1="test2", attr2=0, attr3=0), 
+            TestModel(attr1="test2", attr2=1, attr3=1)
+        ])
+
+    assert not RedisConnect.exists(TestModel, "test2") # nada é gravado se algum modelo for inválido
+
 
 def test__exceptions__redis_connect__no_identifier_exception():
     expected1 = re.escape("TestModel: Use an instance of the model or provide an identifier.")
@@ -68,6 +84,13 @@ def test__exceptions__redis_connect__no_records_exception():
     with pytest.raises(RedisConnectNoRecordsException, match=expected):
         RedisConnect.delete(model)
 
+    RedisConnect.add(model)
+    expected2 = re.escape("TestModel: This attr1 (error) does not exist in the database!")
+    with pytest.raises(RedisConnectNoRecordsException, match=expected2):
+        RedisConnect.delete(TestModel, ["test", "error"])
+
+    assert RedisConnect.exists(model) # nenhum registro é apagado se algum ID não existir
+
 
 def test__exceptions__redis_connect__invalid_expire_exception():
     model = TestModel(attr1="test", attr2=0, attr3=0)
@@ -94,6 +117,8 @@ def test__exceptions__redis_connect__foreign_key_exception():
         RedisConnect.add(TestFK(reference="test"))
         RedisConnect.delete(TestModel, "test")
 
+    RedisConnect.delete(TestFK, 0) # cada registro que referencia "test" possui a sua própria referência
+
     expected2 = re.escape("TestFK2: Foreign key action is invalid (reference: a - tid: 0)!")
     with pytest.raises(RedisConnectForeignKeyException, match=expected2):
         class TestFK2(RedisModel):
@@ -157,9 +182,118 @@ def test__exceptions__redis_connect__type_value_exception():
     with pytest.raises(RedisConnectTypeValueException, match=expected):
         RedisConnect.add(model)
 
+    expected2 = re.escape("TestModel: Only int attributes (except attr1) can be incremented. attr3: float")
+    with pytest.raises(RedisConnectTypeValueException, match=expected2):
+        RedisConnect.incr(TestModel, "test", "attr3")
+
+    expected3 = re.escape("TestModel: The amount must be int. amount: 1.5 (float)")
+    with pytest.raises(RedisConnectTypeValueException, match=expected3):
+        RedisConnect.incr(TestModel, "test", "attr2", 1.5)
+
+    expected4 = re.escape("TestModel: This attr1 (test) does not exist in the database!")
+    with pytest.raises(RedisConnectNoRecordsException, match=expected4):
+        RedisConnect.incr(TestModel, "test", "attr2")
+
 
 def test__exceptions__redis_connect__get_on_corrupt__exception():
     expected = re.escape('on_corrupt must be "flag", "skip" or "ignore"! on_corrupt: "raise"')
 
     with pytest.raises(RedisConnectGetOnCorruptException, match=expected):
-        RedisConnect.get(TestModel, on_corrupt="raise")
\ No newline at end of file
+        RedisConnect.get(TestModel, on_corrupt="raise")
+
+
+def test__exceptions__redis_connect__index_exception():
+    class TestIndexed(RedisModel):
+        __test__ = False
+        __db__ = "tests"
+        __testing__ = True
+        __indexes__ = ["status"]
+
+        uid: int
+        status: str
+        name: str
+
+    expected1 = re.escape('TestIndexed: The attribute "name" is not indexed! Add it to __indexes__.')
+    with pytest.raises(RedisConnectIndexException, match=expected1):
+        RedisConnect.find(TestIndexed, name="test")
+
+    expected2 = re.escape("TestIndexed: Enter at least one condition!")
+    with pytest.raises(RedisConnectIndexException, match=expected2):
+        RedisConnect.find(TestIndexed)
+
+    expected3 = re.escape('TestIndexed: The attribute "status" is not range indexed! Add it to __ranges__.')
+    with pytest.raises(RedisConnectIndexException, match=expected3):
+        RedisConnect.range(TestIndexed, "status")
+
+
+
+def test__exceptions__redis_connect__cursor_exception():
+    expected = re.escape('TestModel: Invalid cursor for this page! cursor: "range:attr2:10"')
+
+    with pytest.raises(RedisConnectCursorException, match=expected):
+        RedisConnect.page(TestModel, cursor="range:attr2:10")
+
+
+def test__exceptions__redis_connect__field_exception():
+    expected = re.escape('TestModel: "attr4" is not an attribute of the model!')
+
+    with pytest.raises(RedisConnectFieldException, match=expected):
+        RedisConnect.get_by_id(TestModel, "test", fields=["attr2", "attr4"])
+
+    with pytest.raises(RedisConnectFieldException, match=expected):
+        RedisConnect.get(TestModel, fields=["attr4"])
+
+
+
+def test__exceptions__redis_connect__session_exception():
+    expected1 = re.escape("Session: The session has already been committed or rolled back!")
+
+    with RedisConnect.session() as session:
+        session.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    with pytest.raises(RedisConnectSessionException, match=expected1):
+        session.add(TestModel(attr1="test2", attr2=0, attr3=0))
+
+    expected2 = re.escape("TestModel: A record referenced by a model added in this session cannot be deleted in the same session!")
+
+    class TestSessionFK(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __action__ = {"test_model": "cascade"}
+
+        tid: int
+        test_model: TestModel
+
+    with pytest.raises(RedisConnectSessionException, match=expected2):
+        with RedisConnect.session() as session:
+            session.add(TestSessionFK(test_model="test"))
+            session.delete(TestModel, "test")
+
+    assert RedisConnect.exists(TestModel, "test")
+
+
+def test__exceptions__redis_connect__conflict_exception():
+    class TestVersion(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __version__ = "version"
+
+        tid: int
+        attr: str
+        version: int
+
+    RedisConnect.add(TestVersion(attr="test"))
+    stale = RedisConnect.get_by_id(TestVersion, 0)
+    RedisConnect.update(TestVersion, 0, lambda model: setattr(model, "attr", "other"))
+
+    expected1 = re.escape("TestVersion: This record (tid: 0) was changed by another client since version 1 was read!")
+    with pytest.raises(RedisConnectConflictException, match=expected1):
+        RedisConnect.add(stale, exists_ok=True)
+
+    def concurrent(model):
+        RedisConnect.incr(TestVersion, 0, "version", 0)
+        model.attr = "test"
+
+    expected2 = re.escape("TestVersion: This record (tid: 0) was changed by another client in all 2 attempts!")
+    with pytest.raises(RedisConnectConflictException, match=expected2):
+        RedisConnect.update(TestVersion, 0, concurrent, retries=1)
@@ -43,6 +43,45 @@ def test__exceptions__redis_model__attribute_exception():
             attr1: str
             attr2: int
 
+    expected6 = re.escape('TestModel3: Cannot index "attr3" because it is not an attribute of the model!')
+    with pytest.raises(RedisModelAttributeException, match=expected6):
+        class TestModel3(RedisModel):
+            __test__ = False
+            __db__ = "tests"
+            __indexes__ = ["attr3"]
+
+            attr1: str
+            attr2: int
+
+    expected8 = re.escape("TestModel4: __cache__ max_entries must be a positive int and ttl a positive number of seconds (or None). __cache__: {'max_entries': 0}")
+    with pytest.raises(RedisModelAttributeException, match=expected8):
+        class TestModel4(RedisModel):
+            __test__ = False
+            __db__ = "tests"
+            __cache__ = {"max_entries": 0}
+
+            attr1: str
+
+    expected9 = re.escape("TestModel4: Models with __expire__ cannot use __cache__!")
+    with pytest.raises(RedisModelAttributeException, match=expected9):
+        class TestModel4(RedisModel):
+            __test__ = False
+            __db__ = "tests"
+            __expire__ = 10
+            __cache__ = {"max_entries": 10, "ttl": 5}
+
+            attr1: str
+
+    expected10 = re.escape('TestModel5: Cannot use "attr3" as __version__ because it is not an attribute of the model!')
+    with pytest.raises(RedisModelAttributeException, match=expected10):
+        class TestModel5(RedisModel):
+            __test__ = False
+            __db__ = "tests"
+            __version__ = "attr3"
+
+            attr1: str
+            attr2: int
+
 
 def test__exceptions__redis_model__type_value_exception():
     class TestModel1(RedisModel):
@@ -65,6 +104,26 @@ def test__exceptions__redis_model__type_value_exception():
             attr1: float
             attr2: str
 
+    expected4 = re.escape("TestModel4: Only int or float attributes can be range indexed. attr2: str")
+    with pytest.raises(RedisModelTypeValueException, match=expected4):
+        class TestModel4(RedisModel):
+            __test__ = False
+            __db__ = "tests"
+            __ranges__ = ["attr2"]
+
+            attr1: int
+            attr2: str
+
+    expected5 = re.escape("TestModel5: The __version__ attribute must be of type int. attr2: str")
+    with pytest.raises(RedisModelTypeValueException, match=expected5):
+        class TestModel5(RedisModel):
+            __test__ = False
+            __db__ = "tests"
+            __version__ = "attr2"
+
+            attr1: int
+            attr2: str
+
     expected3 = re.escape('TestModel3: Divergence in the type of the attribute "attr2". expected: "dict" - received: "list"')
     with pytest.raises(RedisModelTypeValueException, match=expected3):
         class TestModel3(RedisModel):
@@ -116,6 +175,7 @@ def test__exceptions__redis_model__foreign_key_exception():
             fk: TestModel
         
         test = TestModel(fk=0)
+        test.fk() # no modo "lazy", o registro é obtido somente no primeiro acesso
 
     expected5 = re.escape('TestModel1: To define the foreign key, add an action for it in __action__')
     with pytest.raises(RedisModelForeignKeyException, match=expected5):
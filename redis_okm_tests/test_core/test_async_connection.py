@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import pytest
+
+from redis_okm.tools import AsyncRedisConnect, Getter, RedisConnect, RedisModel
+from redis_okm.exceptions import RedisModelForeignKeyException
+
+from redis_okm_tests.conftest import TestModel, settings_test
+
+
+def test__async_redis_connect__add_exists_count():
+    async def main():
+        assert await AsyncRedisConnect.count("tests", settings_test, True) == 0
+        assert not await AsyncRedisConnect.exists(TestModel, identify="test")
+
+        await AsyncRedisConnect.add(TestModel(attr1="test", attr2=7357, attr3=0))
+        await AsyncRedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0), exists_ok=True)
+
+        assert await AsyncRedisConnect.exists(TestModel, identify="test")
+        assert await AsyncRedisConnect.count("tests", settings_test, True) == 1
+        assert await AsyncRedisConnect.count_model(TestModel) == 1
+
+    asyncio.run(main())
+
+    # os registros gravados são os mesmos lidos pela API síncrona
+    model = RedisConnect.get_by_id(TestModel, "test")
+    assert model.attr2 == 0
+    assert model.__status__
+
+
+def test__async_redis_connect__get_iter():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(7)])
+
+    handler = RedisConnect._connect(TestModel)
+    handler.hset(RedisConnect._get_name(TestModel(attr1="test3", attr2=3, attr3=3)), mapping={"attr2": "30"})
+
+    async def main():
+        models = await AsyncRedisConnect.get(TestModel, on_corrupt="skip")
+        assert isinstance(models, Getter)
+        assert models.length == 6
+
+        flagged = [model.attr1 async for model in AsyncRedisConnect.iter(TestModel, batch_size=2, on_corrupt="flag") if not model.__status__]
+        assert flagged == ["test3"]
+
+        user = await AsyncRedisConnect.get_by_id(TestModel, "test1")
+        assert user.attr2 == 1
+
+    asyncio.run(main())
+
+
+def test__async_redis_connect__get__fields():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(3)])
+
+    async def main():
+        model = await AsyncRedisConnect.get_by_id(TestModel, "test1", fields=["attr2"])
+        assert model.to_dict == {"attr1": "test1", "attr2": 1}
+
+        models = await AsyncRedisConnect.get(TestModel, fields=["attr3"])
+        assert sorted(model.attr3 for model in models._getters) == [0.0, 1.0, 2.0]
+
+    asyncio.run(main())
+
+
+def test__async_redis_connect__save__partial():
+    async def main():
+        await AsyncRedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+        model = await AsyncRedisConnect.get_by_id(TestModel, "test")
+        model.attr2 = 10
+        await AsyncRedisConnect.save(model, partial=True)
+        assert model.__changes__ == ()
+
+    asyncio.run(main())
+
+    model = RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip")
+    assert (model.attr2, model.attr3) == (10, 0.0)
+
+
+def test__async_redis_connect__update():
+    class TestVersioned(RedisModel):
+        __test__ = False
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __version__ = "version"
+
+        vid: int
+        balance: int
+        version: int
+
+    RedisConnect.add(TestVersioned(balance=10))
+
+    async def main():
+        await asyncio.gather(*[AsyncRedisConnect.update(TestVersioned, 0, lambda model: setattr(model, "balance", model.balance - 1), retries=10) for _ in range(5)])
+
+    asyncio.run(main())
+
+    model = RedisConnect.get_by_id(TestVersioned, 0)
+    assert (model.balance, model.version) == (5, 6)
+
+
+def test__async_redis_connect__incr():
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    async def main():
+        await asyncio.gather(*[AsyncRedisConnect.incr(TestModel, "test", "attr2") for _ in range(10)])
+        assert await AsyncRedisConnect.incr_float(TestModel, "test", "attr3", 1.5) == 1.5
+
+    asyncio.run(main())
+
+    model = RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip")
+    assert (model.attr2, model.attr3) == (10, 1.5)
+
+
+def test__async_redis_connect__foreign_key_delete(monkeypatch):
+    class TestFK(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __action__ = {"test_model": "cascade"}
+
+        tid: int
+        test_model: TestModel
+
+    async def main():
+        await AsyncRedisConnect.add(TestModel(attr1="test", attr2=7357, attr3="73.57"))
+        await asyncio.gather(*[AsyncRedisConnect.add(TestFK(test_model="test")) for _ in range(3)])
+
+        # as chaves estrangeiras são obtidas pela conexão assíncrona, nunca pela síncrona
+        with monkeypatch.context() as patch:
+            patch.setattr(RedisConnect, "get_by_id", None)
+            models = await AsyncRedisConnect.get(TestFK)
+            await AsyncRedisConnect.prefetch(models, "test_model")
+
+        assert sorted(model.tid for model in models._getters) == [0, 1, 2]
+        assert all(model.test_model().attr1 == "test" for model in models._getters)
+
+        await AsyncRedisConnect.delete(TestFK, identify=[0, 1, 2])
+        await AsyncRedisConnect.delete(TestModel, identify="test")
+        assert await AsyncRedisConnect.count_model(TestFK) == 0
+        assert await AsyncRedisConnect.count_model(TestModel) == 0
+
+    asyncio.run(main())
+
+
+def test__async_redis_connect__foreign_key_load(monkeypatch):
+    class TestFK(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __action__ = {"test_model": "cascade"}
+
+        tid: int
+        test_model: TestModel
+
+    async def main():
+        await AsyncRedisConnect.add(TestModel(attr1="test", attr2=7357, attr3="73.57"))
+        await AsyncRedisConnect.add(TestFK(test_model="test"))
+
+        with monkeypatch.context() as patch:
+            patch.setattr(RedisConnect, "get_by_id", None)
+            model = await AsyncRedisConnect.get_by_id(TestFK, 0)
+
+            # acessar a chave estrangeira sem carregá-la bloquearia o event loop
+            with pytest.raises(RedisModelForeignKeyException):
+                model.test_model.attr1
+
+            assert (await model.test_model.load()).attr1 == "test"
+            assert model.test_model.attr2 == 7357
+
+    asyncio.run(main())
+
+
+def test__async_redis_connect__cache(monkeypatch):
+    class TestCached(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __autoid__ = False
+        __cache__ = {"max_entries": 2, "ttl": None}
+
+        cid: int
+        name: str
+
+    RedisConnect.add(TestCached(cid=0, name="test0"))
+    RedisConnect._stop_caches(settings_test)
+
+    # a inscrição nas invalidações (conexão síncrona e thread) não pode ocorrer no event loop
+    threads = []
+    listen = RedisConnect._listen
+    monkeypatch.setattr(RedisConnect, "_listen", lambda model: (threads.append(threading.current_thread()), listen(model)))
+
+    async def main():
+        assert (await AsyncRedisConnect.get_by_id(TestCached, 0)).name == "test0" # miss
+        assert await AsyncRedisConnect.exists(TestCached, identify=0) # hit
+        return threading.current_thread()
+
+    loop_thread = asyncio.run(main())
+    assert len(threads) == 1 and threads[0] is not loop_thread
+    assert RedisConnect.cache_stats(TestCached)["hits"] == 1
@@ -1,4 +1,12 @@
-from redis_okm.tools import Getter, RedisConnect, RedisModel
+import re
+import json
+import time
+import threading
+import pytest
+
+from redis_okm.core.connection import _pools
+from redis_okm.tools import Getter, LazyForeignKey, RedisConnect, RedisModel, prefetch
+from redis_okm.exceptions.connection_exceptions import RedisConnectForeignKeyException, RedisConnectionAlreadyRegisteredException, RedisConnectSessionException, RedisConnectSessionPartialException, RedisConnectConflictException, RedisConnectNoRecordsException
 
 from redis_okm_tests.conftest import TestModel, settings_test
 
@@ -9,7 +17,7 @@ def test__redis_connection__add():
     model = TestModel(attr1="test", attr2="7357", attr3=0)
     RedisConnect.add(model)
 
-    assert RedisConnect.count("tests", settings_test, "True") == 1
+    assert RedisConnect.count_model(TestModel) == 1
 
     up_model = TestModel(attr1="test", attr2=0, attr3=0)
 
@@ -19,7 +27,7 @@ def test__redis_connection__add():
 
     assert update_model.attr2 == 0
 
-    assert RedisConnect.count("tests", settings_test, "True") == 1
+    assert RedisConnect.count_model(TestModel) == 1
 
 
 def test__redis_connection__exists():
@@ -78,6 +86,32 @@ def test__redis_connect__add_get__foreign_key():
     assert test_model.attr1 == "test"
 
 
+def test__redis_connect__get__batch_foreign_key(monkeypatch):
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(2)])
+
+    class TestFK(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __action__ = {"test_model":"cascade"}
+
+        tid: int
+        test_model: TestModel
+
+    RedisConnect.add_many([TestFK(test_model=f"test{i % 2}") for i in range(6)])
+
+    # as chaves estrangeiras são obtidas em lote, sem uma consulta por registro
+    monkeypatch.setattr(TestFK.__settings__, "load_type", "eager")
+    monkeypatch.setattr(RedisConnect, "get_by_id", None)
+    models = RedisConnect.get(TestFK)._getters
+    assert len(models) == 6
+
+    by_id = {}
+    for model in models:
+        test_model = model.test_model
+        assert test_model.attr1 == f"test{model.tid % 2}"
+        assert by_id.setdefault(test_model.attr1, test_model) is test_model # mesmo ID, mesma instância
+
+
 def test__redis_connect__delete():
     models = []
     for i in range(4):
@@ -85,16 +119,16 @@ def test__redis_connect__delete():
         RedisConnect.add(model)
         models.append(model)
 
-    assert RedisConnect.count("tests", settings_test, "True") == 4
+    assert RedisConnect.count_model(TestModel) == 4
 
     RedisConnect.delete(TestModel, 0)
     RedisConnect.delete(models[1])
 
-    assert RedisConnect.count("tests", settings_test, "True") == 2
+    assert RedisConnect.count_model(TestModel) == 2
 
     RedisConnect.delete(TestModel, [2, 3])
 
-    assert RedisConnect.count("tests", settings_test, "True") == 0
+    assert RedisConnect.count_model(TestModel) == 0
 
 
 def test__redis_connect__delete__foreign_key():
@@ -118,6 +152,113 @@ def test__redis_connect__delete__foreign_key():
     assert not RedisConnect.exists(test)
 
 
+def test__redis_connect__delete__foreign_key_references():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(2)])
+
+    class TestFK(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __action__ = {"test_model":"cascade"}
+
+        tid: int
+        test_model: TestModel
+
+    # cada registro que referencia "test0" possui a sua própria referência
+    RedisConnect.add_many([TestFK(test_model="test0") for _ in range(3)])
+    handler = RedisConnect._connect(TestModel)
+    refs_name = RedisConnect._get_meta_name(TestModel, "refs", "test0")
+    assert handler.hlen(refs_name) == 3
+
+    # a referência acompanha a chave estrangeira do registro
+    RedisConnect.add(TestFK(tid=2, test_model="test1"), exists_ok=True)
+    RedisConnect.delete(TestFK, 1)
+    assert handler.hlen(refs_name) == 1
+    assert handler.hlen(RedisConnect._get_meta_name(TestModel, "refs", "test1")) == 1
+
+    RedisConnect.delete(TestModel, "test0")
+    assert [model.tid for model in RedisConnect.get(TestFK)._getters] == [2]
+    assert not handler.exists(refs_name)
+
+
+def test__redis_connect__delete__cascade_same_name():
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    def make_child(tablename: str) -> type:
+        # modelos com o mesmo nome de classe, em tabelas diferentes (como em módulos diferentes)
+        class TestChild(RedisModel):
+            __db__ = "tests"
+            __testing__ = True
+            __settings__ = settings_test
+            __tablename__ = tablename
+            __action__ = {"test_model": "cascade"}
+
+            cid: int
+            test_model: TestModel
+        return TestChild
+
+    orders, invoices = make_child("orders"), make_child("invoices")
+    RedisConnect.add_many([orders(test_model="test") for _ in range(2)])
+    RedisConnect.add(invoices(test_model="test"))
+    RedisConnect.add(TestModel(attr1="other", attr2=0, attr3=0))
+    RedisConnect.add(invoices(cid=1, test_model="other"))
+
+    # o ID 1 de "orders" referencia "test", mas o ID 1 de "invoices" não
+
+    RedisConnect.delete(TestModel, "test")
+    assert RedisConnect.count_model(orders) == 0
+    assert [model.cid for model in RedisConnect.get(invoices)._getters] == [1]
+
+
+def test__redis_connect__delete__cascade_graph():
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    class TestChild(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __action__ = {"test_model": "cascade"}
+        __indexes__ = ["status"]
+
+        cid: int
+        test_model: TestModel
+        status: str
+
+    class TestGrandchild(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __action__ = {"child": "cascade"}
+
+        gid: int
+        child: TestChild
+
+    class TestRestrict(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __action__ = {"grandchild": "restrict"}
+
+        rid: int
+        grandchild: TestGrandchild
+
+    RedisConnect.add_many([TestChild(test_model="test", status="active") for _ in range(200)])
+    RedisConnect.add_many([TestGrandchild(child=i) for i in range(200)])
+    RedisConnect.add(TestRestrict(grandchild=199))
+
+    # a referência "restrict" no terceiro nível impede que qualquer registro seja apagado
+    with pytest.raises(RedisConnectForeignKeyException):
+        RedisConnect.delete(TestModel, "test")
+    assert RedisConnect.get(TestGrandchild).length == 200
+
+    RedisConnect.delete(TestRestrict, 0)
+    RedisConnect.delete(TestModel, "test")
+
+    assert RedisConnect.get(TestChild).length == 0
+    assert RedisConnect.get(TestGrandchild).length == 0
+    assert RedisConnect.find(TestChild, status="active").length == 0
+    assert not RedisConnect._connect(TestModel).keys(RedisConnect._get_meta_name(TestChild, "refs", "*"))
+
+
 def test__redis_connect__count():
     assert RedisConnect.count("tests", settings_test, "True") == 0
 
@@ -127,6 +268,30 @@ def test__redis_connect__count():
     assert RedisConnect.count("tests", settings_test, "True") == 1
 
 
+def test__redis_connect__count_model__members():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(3)])
+
+    handler = RedisConnect._connect(TestModel)
+    sep = settings_test.separator
+    handler.hset(f"{settings_test.prefix}{sep}other{sep}0", mapping={"attr1": "other"}) # chaves de outras tabelas não são percorridas
+    assert RedisConnect.count_model(TestModel) == 3
+    assert RedisConnect.get(TestModel).length == 3
+
+    RedisConnect.delete(TestModel, "test0")
+    assert RedisConnect.count_model(TestModel) == 2
+
+    # registros que não existem mais são removidos do conjunto ao serem lidos
+    handler.delete(RedisConnect._get_name(TestModel(attr1="test1", attr2=1, attr3=1)))
+    assert RedisConnect.get(TestModel).length == 1
+    assert RedisConnect.count_model(TestModel) == 1
+
+    # registros legados, gravados sem o conjunto de IDs
+    handler.delete(RedisConnect._get_meta_name(TestModel, "members"))
+    assert RedisConnect.get(TestModel).length == 0
+    assert RedisConnect.rebuild_members(TestModel) == 1
+    assert [model.attr1 for model in RedisConnect.get(TestModel)._getters] == ["test2"]
+
+
 def test__redis_connect__get__corrupt():
     test = TestModel(attr1="test", attr2=0, attr3=0)
     RedisConnect.add(test)
@@ -151,3 +316,808 @@ def test__redis_connect__get__corrupt():
     model = ignore.filter_by(attr1="test")
     assert model.attr2 == 10
 
+
+
+def test__redis_connect__shared_pools():
+    handler1 = RedisConnect._connect(TestModel)
+    handler2 = RedisConnect._connect(use_model=False, settings=settings_test, db="tests")
+
+    assert handler1 is handler2 # mesmo pool para settings, host, port, db e testing
+
+    RedisConnect.close_pools(settings_test)
+
+    handler3 = RedisConnect._connect(TestModel)
+    assert handler3 is not handler1
+
+    # alterar as informações de conexão cria um novo pool e descarta o antigo
+    settings_test.set_config(timeout=0.2)
+    try:
+        handler4 = RedisConnect._connect(TestModel)
+        assert handler4 is not handler3
+        assert handler4.connection_pool.connection_kwargs["socket_timeout"] == 0.2
+        assert [key for key in _pools if key[0] == id(settings_test)] == [RedisConnect._get_pool_key(settings_test, settings_test.get_db("tests"), True)]
+    finally:
+        settings_test.set_config(timeout=0.1)
+
+
+def test__redis_connect__get__batches():
+    batch_size, scan_count = settings_test.batch_size, settings_test.scan_count
+    settings_test.batch_size, settings_test.scan_count = 2, 3 # força várias páginas e vários pipelines
+
+    try:
+        for i in range(7):
+            RedisConnect.add(TestModel(attr1=f"test{i}", attr2=i, attr3=i))
+
+        models = RedisConnect.get(TestModel)
+        assert models.length == 7
+        assert sorted(model.attr2 for model in models._getters) == list(range(7))
+    finally:
+        settings_test.batch_size, settings_test.scan_count = batch_size, scan_count
+
+
+def test__redis_connect__autoid():
+    class TestAutoID(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+
+        tid: int
+        attr1: str
+
+    RedisConnect.add(TestAutoID(attr1="test0"))
+    RedisConnect.add(TestAutoID(attr1="test1"))
+    RedisConnect.delete(TestAutoID, 0)
+    RedisConnect.add(TestAutoID(attr1="test2"))
+
+    models = RedisConnect.get(TestAutoID)
+    assert sorted(model.tid for model in models._getters) == [1, 2] # IDs não são reaproveitados
+    assert RedisConnect.count_model(TestAutoID) == 2
+
+
+def test__redis_connect__seed_autoid():
+    class TestAutoID(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+
+        tid: int
+        attr1: str
+
+    handler = RedisConnect._connect(TestAutoID(instance=False))
+    for i in [0, 1, 5]: # registros legados, criados sem a sequência
+        RedisConnect.add(TestAutoID(tid=i, attr1=f"test{i}"))
+    handler.delete(RedisConnect._get_meta_name(TestAutoID(instance=False), "autoid"))
+
+    assert RedisConnect.seed_autoid(TestAutoID) == 6
+
+    model = TestAutoID(attr1="test6")
+    RedisConnect.add(model)
+    assert model.tid == 6
+
+
+def test__redis_connect__add_many():
+    models = [TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(10)]
+    RedisConnect.add_many(models, chunk_size=3, atomic=True)
+
+    assert RedisConnect.count_model(TestModel) == 10
+    assert RedisConnect.get(TestModel).filter_by(attr1="test7").attr2 == 7
+
+    models[7].attr2 = 70
+    RedisConnect.add_many([TestModel(attr1="test7", attr2=70, attr3=7)], exists_ok=True)
+    assert RedisConnect.get(TestModel).filter_by(attr1="test7").attr2 == 70
+
+
+def test__redis_connect__add_many__autoid_foreign_key():
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    class TestFK(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __action__ = {"test_model":"cascade"}
+
+        tid: int
+        test_model: TestModel
+
+    RedisConnect.add_many([TestFK(test_model="test") for _ in range(5)])
+
+    models = RedisConnect.get(TestFK)
+    assert sorted(model.tid for model in models._getters) == [0, 1, 2, 3, 4]
+    assert models.filter_by(tid=3).test_model().attr1 == "test"
+
+
+def test__redis_connect__delete__many():
+    RedisConnect.add_many([TestModel(attr1=i, attr2=i, attr3=i) for i in range(20)])
+
+    settings_test.batch_size, batch_size = 3, settings_test.batch_size
+    try:
+        RedisConnect.delete(TestModel, list(range(15)))
+    finally:
+        settings_test.batch_size = batch_size
+
+    assert RedisConnect.count_model(TestModel) == 5
+
+    RedisConnect.delete(TestModel, [15, 16, "non_existent"], non_existent_ok=True)
+    assert RedisConnect.count_model(TestModel) == 3
+
+
+def test__redis_connect__get_by_id():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(3)])
+
+    model = RedisConnect.get_by_id(TestModel, "test1")
+    assert isinstance(model, TestModel)
+    assert model.attr2 == 1
+    assert RedisConnect.get_by_id(TestModel, "non_existent") is None
+
+    models = RedisConnect.get_many_by_id(TestModel, ["test2", "non_existent", "test0"])
+    assert isinstance(models, Getter)
+    assert [model.attr1 for model in models._getters] == ["test2", "test0"]
+
+
+def test__redis_connect__get_by_id__corrupt():
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+    handler = RedisConnect._connect(TestModel)
+    handler.hset(RedisConnect._get_name(TestModel(attr1="test", attr2=0, attr3=0)), mapping={"attr2": "10"})
+
+    assert not RedisConnect.get_by_id(TestModel, "test", on_corrupt="flag").__status__
+    assert RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip") is None
+    assert RedisConnect.get_by_id(TestModel, "test", on_corrupt="ignore").attr2 == 10
+
+
+def test__redis_connect__get__fields():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(3)])
+    handler = RedisConnect._connect(TestModel)
+    handler.hset(RedisConnect._get_name(TestModel(attr1="test1", attr2=1, attr3=1)), mapping={"attr2": "10"})
+
+    # somente os atributos pedidos (e o ID) são obtidos, sem verificar a integridade
+    model = RedisConnect.get_by_id(TestModel, "test1", on_corrupt="skip", fields=["attr2"])
+    assert model.__partial__
+    assert model.to_dict == {"attr1": "test1", "attr2": 10}
+    assert not hasattr(model, "attr3")
+
+    models = RedisConnect.get_many_by_id(TestModel, ["test2", "non_existent", "test0"], fields=["attr3"])
+    assert [(model.attr1, model.attr3) for model in models._getters] == [("test2", 2.0), ("test0", 0.0)]
+
+    models = RedisConnect.get(TestModel, fields=["attr2"])
+    assert sorted(model.attr2 for model in models._getters) == [0, 2, 10]
+    assert RedisConnect.get_by_id(TestModel, "non_existent", fields=["attr2"]) is None
+
+
+def test__redis_connect__codec__containers():
+    class TestContainers(RedisModel):
+        __db__ = "tests"
+        __settings__ = settings_test
+        __testing__ = True
+        __autoid__ = False
+
+        kid: int
+        tags: list[str]
+        extra: dict
+        point: tuple
+        active: bool
+
+    RedisConnect.add(TestContainers(kid=0, tags=["a", "b"], extra={"x": 1}, point=(1, 2), active=False))
+
+    # registros com listas, dicionários e tuplas não são mais considerados corrompidos
+    model = RedisConnect.get_by_id(TestContainers, 0, on_corrupt="skip")
+    assert model is not None
+    assert (model.tags, model.extra, model.point, model.active) == (["a", "b"], {"x": 1}, (1, 2), False)
+
+
+def test__redis_connect__codec__legacy_hash():
+    model = TestModel(attr1="test", attr2=0, attr3=0)
+    content = RedisConnect._serialize(model)
+    content.pop("__hash__")
+
+    # registros antigos têm o hash calculado na ordem em que os atributos foram recebidos
+    legacy = {"attr2": content["attr2"], "attr1": content["attr1"], "attr3": content["attr3"]}
+    legacy["__hash__"] = TestModel.__codec__.sign(model.__key__, legacy)
+    RedisConnect._connect(TestModel).hset(RedisConnect._get_name(model), mapping=legacy)
+
+    assert RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip").attr2 == 0
+
+
+def test__redis_connect__save__partial_legacy_hash():
+    model = TestModel(attr1="test", attr2=0, attr3=0)
+    content = RedisConnect._serialize(model)
+    legacy = {"attr2": content["attr2"], "attr1": content["attr1"], "attr3": content["attr3"]}
+    legacy["__hash__"] = TestModel.__codec__.sign(model.__key__, legacy)
+    RedisConnect._connect(TestModel).hset(RedisConnect._get_name(model), mapping=legacy)
+
+    # o hash esperado pelo script é o lido do Redis, e não o recalculado na ordem dos atributos do modelo
+    model = RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip")
+    model.attr2 = 1
+    RedisConnect.save(model, partial=True)
+    model.attr2 = 2
+    RedisConnect.save(model, partial=True)
+    assert RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip").attr2 == 2
+
+    RedisConnect._connect(TestModel).hset(RedisConnect._get_name(model), mapping=legacy)
+    RedisConnect.update(TestModel, "test", lambda current: setattr(current, "attr2", 3), retries=0)
+    assert RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip").attr2 == 3
+
+
+def test__redis_connect__codec__trusted_hydration(monkeypatch):
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    # registros obtidos do Redis não repetem as validações de RedisModel.__init__
+    init = TestModel.__init__
+    def checked_init(self, **attributes):
+        assert attributes.get("instance") is False
+        init(self, **attributes)
+    monkeypatch.setattr(TestModel, "__init__", checked_init)
+
+    model = RedisConnect.get_by_id(TestModel, "test")
+    assert (model.attr1, model.attr2, model.attr3) == ("test", 0, 0.0)
+    assert model.to_dict == {"attr1": "test", "attr2": 0, "attr3": 0.0}
+
+
+def test__redis_connect__get__lazy_foreign_key(monkeypatch):
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(2)])
+
+    class TestFK(RedisModel):
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __action__ = {"test_model":"cascade"}
+
+        tid: int
+        test_model: TestModel
+
+    RedisConnect.add_many([TestFK(test_model=f"test{i % 2}") for i in range(4)])
+
+    # somente os IDs são guardados, e prefetch obtém todas as referências de uma só vez
+    monkeypatch.setattr(RedisConnect, "get_by_id", None)
+    models = RedisConnect.get(TestFK)
+    assert all(isinstance(model.test_model, LazyForeignKey) for model in models._getters)
+
+    prefetch(models, "test_model")
+    assert sorted(model.test_model.attr1 for model in models._getters) == ["test0", "test0", "test1", "test1"]
+    assert models._getters[0].test_model() is models._getters[0].test_model()
+    monkeypatch.undo()
+
+    # sem prefetch, o registro é obtido no primeiro acesso
+    model = RedisConnect.get_by_id(TestFK, 0)
+    assert model.test_model().attr2 == 0
+
+
+class TestIndexed(RedisModel):
+    __test__ = False
+    __db__ = "tests"
+    __testing__ = True
+    __settings__ = settings_test
+    __indexes__ = ["status", "age"]
+
+    uid: int
+    status: str
+    age: int
+
+
+def test__redis_connect__find():
+    RedisConnect.add_many([TestIndexed(status="active" if i % 2 else "inactive", age=i % 3) for i in range(6)])
+
+    active = RedisConnect.find(TestIndexed, status="active")
+    assert sorted(model.uid for model in active._getters) == [1, 3, 5]
+
+    model = RedisConnect.find(TestIndexed, status="active", age="2").first()
+    assert model.uid == 5
+
+    RedisConnect.add(TestIndexed(uid=5, status="inactive", age=2), exists_ok=True) # atualiza o índice
+    assert RedisConnect.find(TestIndexed, status="active", age=2).length == 0
+
+    RedisConnect.delete(TestIndexed, [1, 3])
+    assert RedisConnect.find(TestIndexed, status="active").length == 0
+
+
+def test__redis_connect__find__encoded_condition():
+    class TestTagged(RedisModel):
+        __test__ = False
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __indexes__ = ["tags", "active"]
+
+        tid: int
+        tags: tuple
+        active: bool
+
+    RedisConnect.add_many([TestTagged(tags=("a", "b"), active=True), TestTagged(tags=("c",), active=False)])
+
+    # as condições são convertidas como os valores gravados (ModelCodec)
+    assert [model.tid for model in RedisConnect.find(TestTagged, tags=["a", "b"])._getters] == [0]
+    assert [model.tid for model in RedisConnect.find(TestTagged, tags=("c",), active=False)._getters] == [1]
+
+
+def test__redis_connect__save__partial():
+    RedisConnect.add(TestIndexed(status="active", age=1))
+    model = RedisConnect.get_by_id(TestIndexed, 0)
+
+    # somente os atributos alterados são enviados
+    model.status = "inactive"
+    assert model.__changes__ == {"status": "active"}
+    name, content, old, args = RedisConnect._get_update(model)
+    assert args[3:] == ["status", "inactive"]
+
+    RedisConnect.save(model, partial=True)
+    assert model.__changes__ == ()
+    assert RedisConnect.get_by_id(TestIndexed, 0, on_corrupt="skip").status == "inactive" # o hash foi atualizado
+    assert [model.uid for model in RedisConnect.find(TestIndexed, status="inactive")._getters] == [0]
+    assert RedisConnect.find(TestIndexed, status="active").length == 0
+
+
+def test__redis_connect__save__partial_conflict():
+    RedisConnect.add(TestIndexed(status="active", age=1))
+    model1 = RedisConnect.get_by_id(TestIndexed, 0)
+    model2 = RedisConnect.get_by_id(TestIndexed, 0)
+
+    model1.age = 2
+    RedisConnect.save(model1, partial=True)
+
+    # o registro mudou desde que model2 foi obtido: somente "status" é aplicado sobre o registro atual
+    model2.status = "inactive"
+    RedisConnect.save(model2, partial=True)
+    assert (model2.status, model2.age, model2.__changes__) == ("inactive", 2, ())
+
+    model = RedisConnect.get_by_id(TestIndexed, 0)
+    assert (model.status, model.age) == ("inactive", 2)
+    assert [model.uid for model in RedisConnect.find(TestIndexed, age=2)._getters] == [0]
+
+    # incrementos concorrentes também não são perdidos
+    RedisConnect.incr(TestIndexed, 0, "age")
+    model2.status = "active"
+    RedisConnect.save(model2, partial=True)
+    model = RedisConnect.get_by_id(TestIndexed, 0)
+    assert (model.status, model.age) == ("active", 3)
+
+    # um registro apagado não é recriado
+    RedisConnect.delete(TestIndexed, 0)
+    model1.status = "inactive"
+    with pytest.raises(RedisConnectNoRecordsException):
+        RedisConnect.save(model1, partial=True)
+    assert not RedisConnect.exists(TestIndexed, 0)
+
+
+def test__redis_connect__add__atomic(monkeypatch):
+    class TestAtomic(RedisModel):
+        __test__ = False
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __autoid__ = False
+        __indexes__ = ["status"]
+        __expire__ = 60
+
+        aid: int
+        status: str
+
+    RedisConnect.add(TestAtomic(aid=0, status="active"))
+    handler = RedisConnect._connect(TestAtomic)
+    assert 0 < handler.pttl(RedisConnect._get_name(TestAtomic(aid=0, status="active"))) <= 60000
+
+    # outro processo cria o registro entre a verificação e a escrita
+    monkeypatch.setattr(RedisConnect, "_exists_many", lambda models: [False] * len(models))
+    with pytest.raises(RedisConnectionAlreadyRegisteredException):
+        RedisConnect.add_many([TestAtomic(aid=1, status="active"), TestAtomic(aid=0, status="inactive")])
+
+    assert RedisConnect.get_by_id(TestAtomic, 0).status == "active"
+    assert [model.aid for model in RedisConnect.find(TestAtomic, status="active")._getters] == [0, 1]
+    assert RedisConnect.find(TestAtomic, status="inactive").length == 0
+
+
+def test__redis_connect__add__single_round_trip(monkeypatch):
+    RedisConnect.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    # sem chaves estrangeiras, a existência de um único registro é verificada somente pelo script de escrita
+    checked = []
+    exists_many = RedisConnect._exists_many
+    monkeypatch.setattr(RedisConnect, "_exists_many", lambda models: checked.append(models) or exists_many(models))
+    with pytest.raises(RedisConnectionAlreadyRegisteredException):
+        RedisConnect.add(TestModel(attr1="test", attr2=1, attr3=1))
+    RedisConnect.add(TestModel(attr1="test2", attr2=2, attr3=2))
+
+    assert checked == []
+    assert RedisConnect.get_by_id(TestModel, "test", on_corrupt="skip").attr2 == 0
+    assert RedisConnect.count_model(TestModel) == 2
+
+
+def test__redis_connect__add__rejected_references(monkeypatch):
+    class TestOrder(RedisModel):
+        __test__ = False
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __autoid__ = False
+        __action__ = {"test_model": "cascade"}
+
+        code: str
+        test_model: TestModel
+
+    RedisConnect.add_many([TestModel(attr1="u0", attr2=0, attr3=0), TestModel(attr1="u1", attr2=1, attr3=1), TestModel(attr1="u2", attr2=2, attr3=2)])
+    RedisConnect.add(TestOrder(code="o1", test_model="u0"))
+
+    # um registro duplicado não altera as referências do registro existente
+    with pytest.raises(RedisConnectionAlreadyRegisteredException):
+        RedisConnect.add(TestOrder(code="o1", test_model="u1"))
+
+    # outro processo cria o registro entre a verificação e a escrita: as referências são desfeitas
+    monkeypatch.setattr(RedisConnect, "_exists_many", lambda models: [False] * len(models))
+    with pytest.raises(RedisConnectionAlreadyRegisteredException):
+        RedisConnect.add(TestOrder(code="o1", test_model="u2"))
+    monkeypatch.undo()
+
+    RedisConnect.delete(TestModel, ["u1", "u2"])
+    assert RedisConnect.get_by_id(TestOrder, "o1").test_model().attr1 == "u0"
+
+    RedisConnect.delete(TestModel, "u0")
+    assert not RedisConnect.exists(TestOrder, "o1")
+
+
+def test__redis_connect__session():
+    class TestSession(RedisModel):
+        __test__ = False
+        __db__ = "tests"
+        __testing__ = True
+        __settings__ = settings_test
+        __action__ = {"test_model": "cascade"}
+        __indexes__ = ["status"]
+
+        sid: int
+        status: str
+        test_model: TestModel
+
+    RedisConnect.add(TestModel(attr1="old", attr2=0, attr3=0))
+    with RedisConnect.session() as session:
+        parent = TestModel(attr1="test", attr2=1, attr3=1)
+        session.add(parent)
+        session.add_many([TestSession(status="active", test_model="test") for _ in range(2)]) # referencia um registro da mesma sessão
+        session.delete(TestModel, "old")
+
+        assert not RedisConnect.exists(parent) # nada é gravado antes de sair do bloco
+
+    assert not RedisConnect.exists(TestModel, "old")
+    assert [model.sid for model in RedisConnect.find(TestSession, status="active")._getters] == [0, 1]
+    assert RedisConnect.count_model(TestModel) == 1
+
+    # um erro dentro do bloco descarta as operações
+    with pytest.raises(ValueError):
+        with RedisConnect.session() as session:
+            session.add(TestSession(status="active", test_model="test"))
+            raise ValueError()
+    assert RedisConnect.count_model(TestSession) == 2
+
+    # um erro ao validar as operações também impede todas as escritas
+    with pytest.raises(RedisConnectionAlreadyRegisteredException):
+        with RedisConnect.session() as session:
+            session.add(TestSession(status="inactive", test_model="test"))
+            session.add(TestModel(attr1="test", attr2=2, attr3=2))
+    assert RedisConnect.find(TestSession, status="inactive").length == 0
+
+    # apagar em cascata na mesma transação
+    with RedisConnect.session() as session:
+        session.delete(TestModel, "test")
+    assert RedisConnect.count_model(TestSession) == 0
+
+
+def test__redis_connect__session__existing(monkeypatch):
+    RedisConnect.add(TestIndexed(uid=0, status="old", age=0))
+
+    # o registro já existe: nada é gravado, nem os índices
+    with pytest.raises(RedisConnectionAlreadyRegisteredException):
+        with RedisConnect.session() as session:
+            session.add(TestIndexed(uid=0, status="new", age=0))
+
+    # mesmo que a verificação antecipada não o encontre, a resposta do script de escrita é verificada
+    monkeypatch.setattr(RedisConnect, "_exists_many", lambda models: [False] * len(models))
+    with pytest.raises(RedisConnectionAlreadyRegisteredException):
+        with RedisConnect.session() as session:
+            session.add(TestIndexed(uid=0, status="new", age=0))
+
+    assert RedisConnect.get_by_id(TestIndexed, 0).status == "old"
+    assert [model.uid for model in RedisConnect.find(TestIndexed, status="old")._getters] == [0]
+    assert RedisConnect.find(TestIndexed, status="new").length == 0
+
+
+def test__redis_connect__session__conflict(monkeypatch):
+    prepare_many = RedisConnect._prepare_many
+
+    def concurrent(models, exists_ok, set_ids, created=None, check_exists=False):
+        # outro cliente grava o registro após a verificação da sessão
+        response = prepare_many(models, exists_ok, set_ids, created, check_exists)
+        RedisConnect._connect(TestModel).hset(RedisConnect._get_name(models[0]), "attr1", "other")
+        return response
+
+    monkeypatch.setattr(RedisConnect, "_prepare_many", concurrent)
+    with pytest.raises(RedisConnectSessionException):
+        with RedisConnect.session() as session:
+            session.add(TestModel(attr1="test", attr2=0, attr3=0))
+            session.add(TestModel(attr1="test2", attr2=0, attr3=0))
+
+    assert not RedisConnect.exists(TestModel, "test2")
+    assert RedisConnect.count_model(TestModel) == 0
+
+
+def test__redis_connect__session__partial_commit(monkeypatch):
+    class TestOtherDb(RedisModel):
+        __test__ = False
+        __db__ = 14
+        __testing__ = True
+        __settings__ = settings_test
+        __autoid__ = False
+
+        oid: int
+
+    prepare_many = RedisConnect._prepare_many
+
+    def concurrent(models, exists_ok, set_ids, created=None, check_exists=False):
+        # outro cliente grava o registro do segundo banco de dados após a verificação da sessão
+        response = prepare_many(models, exists_ok, set_ids, created, check_exists)
+        RedisConnect._connect(TestModel).hset(RedisConnect._get_name(models[1]), "attr1", "other")
+        return response
+
+    monkeypatch.setattr(RedisConnect, "_prepare_many", concurrent)
+    with pytest.raises(RedisConnectSessionPartialException, match=re.escape(RedisConnect._get_name(TestOtherDb(oid=0)))):
+        with RedisConnect.session() as session:
+            session.add(TestOtherDb(oid=0))
+            session.add(TestModel(attr1="test", attr2=0, attr3=0))
+
+    # a transação do primeiro banco de dados já havia sido executada
+    assert RedisConnect.exists(TestOtherDb, 0)
+    assert RedisConnect.count_model(TestModel) == 0
+
+
+class TestVersioned(RedisModel):
+    __test__ = False
+    __db__ = "tests"
+    __testing__ = True
+    __settings__ = settings_test
+    __version__ = "version"
+
+    vid: int
+    balance: int
+    version: int
+
+
+def test__redis_connect__version():
+    model = TestVersioned(balance=10)
+    RedisConnect.add(model)
+    assert model.version == 1
+
+    stale = RedisConnect.get_by_id(TestVersioned, 0)
+    current = RedisConnect.get_by_id(TestVersioned, 0)
+    current.balance = 5
+    RedisConnect.save(current, partial=True)
+    assert current.version == 2
+
+    # o registro mudou desde que stale foi obtido: nada é sobrescrito
+    stale.balance = 20
+    with pytest.raises(RedisConnectConflictException):
+        RedisConnect.save(stale, partial=True)
+    with pytest.raises(RedisConnectConflictException):
+        RedisConnect.add(stale, exists_ok=True)
+    assert RedisConnect.get_by_id(TestVersioned, 0).balance == 5
+
+    RedisConnect.incr(TestVersioned, 0, "balance")
+    model = RedisConnect.get_by_id(TestVersioned, 0)
+    assert (model.balance, model.version) == (6, 3)
+
+    # sessões também verificam a versão dos registros
+    with pytest.raises(RedisConnectConflictException):
+        with RedisConnect.session() as session:
+            session.add(current, exists_ok=True)
+    assert RedisConnect.get_by_id(TestVersioned, 0).version == 3
+
+
+def test__redis_connect__update():
+    RedisConnect.add(TestVersioned(balance=10))
+    calls = []
+
+    def withdraw(account):
+        if not calls:
+            # outro cliente altera o registro entre a leitura e a escrita
+            RedisConnect.incr(TestVersioned, 0, "balance", 5)
+        calls.append(account.version)
+        account.balance -= 10
+
+    model = RedisConnect.update(TestVersioned, 0, withdraw)
+    assert calls == [1, 2] # a função é aplicada novamente ao registro atualizado
+    assert (model.balance, model.version) == (5, 3)
+    assert RedisConnect.get_by_id(TestVersioned, 0).balance == 5
+
+    def always(account):
+        RedisConnect.incr(TestVersioned, 0, "balance")
+        account.balance = 0
+
+    with pytest.raises(RedisConnectConflictException):
+        RedisConnect.update(TestVersioned, 0, always, retries=2)
+
+
+def test__redis_connect__rebuild_indexes():
+    RedisConnect.add_many([TestIndexed(status="active", age=i) for i in range(3)])
+
+    handler = RedisConnect._connect(TestIndexed)
+    for name in handler.scan_iter(RedisConnect._get_meta_name(TestIndexed(instance=False), "index", "*")):
+        handler.delete(name)
+    assert RedisConnect.find(TestIndexed, status="active").length == 0
+
+    assert RedisConnect.rebuild_indexes(TestIndexed) == 3
+    assert RedisConnect.find(TestIndexed, status="active").length == 3
+
+
+class TestRanged(RedisModel):
+    __test__ = False
+    __db__ = "tests"
+    __testing__ = True
+    __settings__ = settings_test
+    __ranges__ = ["created_at", "total"]
+
+    oid: int
+    created_at: float
+    total: int
+
+
+def test__redis_connect__range():
+    RedisConnect.add_many([TestRanged(created_at=1000 + i, total=(i * 7) % 10) for i in range(10)])
+
+    newest = RedisConnect.range(TestRanged, "created_at", limit=3, desc=True)
+    assert [model.oid for model in newest._getters] == [9, 8, 7]
+
+    page = RedisConnect.range(TestRanged, "created_at", limit=2, offset=2)
+    assert [model.oid for model in page._getters] == [2, 3]
+
+    between = RedisConnect.range(TestRanged, "total", min=3, max=5)
+    assert sorted(model.total for model in between._getters) == [3, 4, 5]
+
+    assert RedisConnect.first(TestRanged, "created_at").oid == 0
+    assert RedisConnect.last(TestRanged, "total").total == 9
+
+    RedisConnect.delete(TestRanged, 9)
+    assert RedisConnect.last(TestRanged, "created_at").oid == 8
+
+
+def test__redis_connect__incr():
+    RedisConnect.add_many([TestRanged(created_at=1000, total=0), TestRanged(created_at=2000, total=5)])
+
+    # incrementos concorrentes não se perdem e o hash continua válido
+    threads = [threading.Thread(target=lambda: [RedisConnect.incr(TestRanged, 0, "total") for _ in range(25)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert RedisConnect.incr(TestRanged, 0, "total", 0) == 100
+    assert RedisConnect.incr_float(TestRanged, 0, "created_at", 0.5) == 1000.5
+
+    model = RedisConnect.get_by_id(TestRanged, 0, on_corrupt="skip")
+    assert (model.total, model.created_at) == (100, 1000.5)
+    assert RedisConnect.last(TestRanged, "total").oid == 0 # o índice de intervalo foi atualizado
+
+
+def test__redis_connect__iter():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(7)])
+
+    models = RedisConnect.iter(TestModel, batch_size=2)
+    assert not isinstance(models, (list, Getter))
+    assert sorted(model.attr2 for model in models) == list(range(7))
+
+    handler = RedisConnect._connect(TestModel)
+    handler.hset(RedisConnect._get_name(TestModel(attr1="test3", attr2=3, attr3=3)), mapping={"attr2": "30"})
+
+    assert len(list(RedisConnect.iter(TestModel, on_corrupt="skip"))) == 6
+    assert [model.attr1 for model in RedisConnect.iter(TestModel, on_corrupt="flag") if not model.__status__] == ["test3"]
+
+
+def test__redis_connect__page():
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(25)])
+
+    seen = []
+    models, cursor = RedisConnect.page(TestModel, limit=10)
+    seen.extend(model.attr2 for model in models._getters)
+    while cursor is not None:
+        models, cursor = RedisConnect.page(TestModel, cursor=cursor, limit=10)
+        seen.extend(model.attr2 for model in models._getters)
+
+    assert sorted(set(seen)) == list(range(25))
+
+
+def test__redis_connect__page__small_set(monkeypatch):
+    RedisConnect.add_many([TestModel(attr1=f"test{i}", attr2=i, attr3=i) for i in range(25)])
+
+    # conjuntos pequenos (intset/listpack) ignoram COUNT e retornam todos os IDs em uma única resposta
+    handler = RedisConnect._connect(TestModel)
+    sscan = handler.sscan
+    monkeypatch.setattr(handler, "sscan", lambda name, cursor=0, match=None, count=None: sscan(name, cursor, match, count=1000))
+
+    seen = []
+    models, cursor = RedisConnect.page(TestModel, limit=10)
+    while True:
+        assert models.length <= 10
+        seen.extend(model.attr2 for model in models._getters)
+        if cursor is None:
+            break
+        models, cursor = RedisConnect.page(TestModel, cursor=cursor, limit=10)
+
+    assert sorted(seen) == list(range(25))
+
+
+def test__redis_connect__page__reference():
+    RedisConnect.add_many([TestRanged(created_at=1000 + i, total=i) for i in range(5)])
+
+    models, cursor = RedisConnect.page(TestRanged, limit=2, reference="created_at", desc=True)
+    assert [model.oid for model in models._getters] == [4, 3]
+
+    models, cursor = RedisConnect.page(TestRanged, cursor=cursor, limit=2, reference="created_at", desc=True)
+    assert [model.oid for model in models._getters] == [2, 1]
+
+    models, cursor = RedisConnect.page(TestRanged, cursor=cursor, limit=2, reference="created_at", desc=True)
+    assert [model.oid for model in models._getters] == [0]
+    assert cursor is None
+
+
+class TestCached(RedisModel):
+    __test__ = False
+    __db__ = "tests"
+    __settings__ = settings_test
+    __testing__ = True
+    __autoid__ = False
+    __cache__ = {"max_entries": 2, "ttl": None}
+
+    cid: int
+    name: str
+
+
+def test__redis_connect__cache():
+    RedisConnect.add_many([TestCached(cid=i, name=f"test{i}") for i in range(3)])
+
+    assert RedisConnect.get_by_id(TestCached, 0).name == "test0" # miss
+    assert RedisConnect.get_by_id(TestCached, 0).name == "test0" # hit
+    assert RedisConnect.exists(TestCached, identify=0) # hit
+    stats = RedisConnect.cache_stats(TestCached)
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    RedisConnect.get_many_by_id(TestCached, [1, 2])
+    assert RedisConnect.cache_stats(TestCached)["evictions"] == 1 # max_entries = 2
+
+    # escritas invalidam o cache local
+    RedisConnect.add(TestCached(cid=2, name="updated"), exists_ok=True)
+    assert RedisConnect.get_by_id(TestCached, 2).name == "updated"
+
+    RedisConnect.delete(TestCached, 2)
+    assert RedisConnect.get_by_id(TestCached, 2) is None
+
+
+def test__redis_connect__cache__pubsub_invalidation():
+    RedisConnect.add(TestCached(cid=0, name="test0"))
+    assert RedisConnect.get_by_id(TestCached, 0).name == "test0"
+
+    # simula a escrita de outro processo, que publica a invalidação
+    invalidations = RedisConnect.cache_stats(TestCached)["invalidations"]
+    model = TestCached(cid=0, name="other")
+    name = RedisConnect._get_name(model)
+    handler = RedisConnect._connect(TestCached)
+    handler.hset(name, mapping=RedisConnect._serialize(model))
+    handler.publish(RedisConnect._get_cache_channel(settings_test), json.dumps({"db": TestCached.__db__, "names": [name]}))
+
+    deadline = time.monotonic() + 2
+    while RedisConnect.cache_stats(TestCached)["invalidations"] == invalidations and time.monotonic() < deadline:
+        time.sleep(.01)
+
+    assert RedisConnect.get_by_id(TestCached, 0).name == "other"
+
+
+def test__redis_connect__cache__stale_read(monkeypatch):
+    RedisConnect.add(TestCached(cid=0, name="test0"))
+    RedisConnect.clear_cache(TestCached)
+    name = RedisConnect._get_name(TestCached(cid=0, name="test0"))
+
+    # a invalidação chega entre a leitura do registro (ainda antigo) e a gravação no cache
+    pipeline = type(RedisConnect._connect(TestCached).pipeline())
+    execute = pipeline.execute
+    def concurrent(self, *args, **kwargs):
+        responses = execute(self, *args, **kwargs)
+        RedisConnect._invalidate(settings_test, True, TestCached.__db__, [name])
+        return responses
+
+    monkeypatch.setattr(pipeline, "execute", concurrent)
+    assert RedisConnect.get_by_id(TestCached, 0).name == "test0"
+    monkeypatch.undo()
+
+    assert RedisConnect.cache_stats(TestCached)["entries"] == 0
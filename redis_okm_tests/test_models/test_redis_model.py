@@ -41,4 +41,16 @@ def test__create_model__foreign_key():
     reference = test_fk.fk()
 
     assert reference.attr1 == "test"
-    assert reference.attr2 == 7357
\ No newline at end of file
+    assert reference.attr2 == 7357
+
+def test__create_model__slots():
+    model = TestModel(attr1="test", attr2=0, attr3=0)
+
+    # os atributos ficam nos __slots__ gerados a partir das anotações
+    assert {"attr1", "attr2", "attr3"} <= set(TestModel.__slots__)
+    assert model.__dict__ == {}
+    assert not TestModel.__instancied__
+
+    # to_dict é calculado a cada acesso
+    model.attr2 = 10
+    assert model.to_dict == {"attr1": "test", "attr2": 10, "attr3": 0.0}